@@ -0,0 +1,144 @@
+"""
+Off-loop execution of CPU-bound pricing work.
+
+Resolvers are async; each passes its service call and an estimated cost
+(cashflows x valuations, see services.request_cost) to `pricing_executor.run`.
+Cheap requests run inline (the pricing itself is microseconds). Requests at or
+above the offload threshold run in a ProcessPoolExecutor so one heavy
+portfolio does not stall other requests on the replica. Market resolution
+(`resolve`) uses the same threshold but runs in a thread, since the market
+cache and registry live in the server process.
+
+Configuration (environment variables):
+- PRICING_PROCESS_WORKERS (default: min(4, CPU count)): pool size; 0 disables
+  the pool and heavy work runs in a thread instead (keeps the loop free, shares the GIL).
+- PRICING_OFFLOAD_MIN_COST (default 20000): cost at which work is offloaded.
+
+Metrics: in-flight and queued offloaded tasks, plus a histogram of the time a
+task waited for a worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from app.metrics import (
+    CallbackMetric,
+    Histogram,
+    Observation,
+    capture_observations,
+    replay_observations,
+)
+
+T = TypeVar("T")
+
+
+def _timed_call(
+    fn: Callable[..., T], kwargs: dict[str, Any]
+) -> tuple[T, float, list[Observation]]:
+    """
+    Worker entry point: run fn(**kwargs), reporting when it started (wall clock)
+    and the histogram observations it made, for replay in the server process.
+    """
+    started = time.time()
+    with capture_observations() as observations:
+        result = fn(**kwargs)
+    return result, started, observations
+
+
+class PricingExecutor:
+    """Runs pricing calls inline or in a lazily started process pool, by cost."""
+
+    def __init__(self, workers: int, min_cost: int) -> None:
+        if workers < 0:
+            raise ValueError("workers must be >= 0")
+        self.workers = workers
+        self.min_cost = min_cost
+        self.inflight = 0
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "PricingExecutor":
+        default_workers = min(4, os.cpu_count() or 1)
+        return cls(
+            workers=int(os.environ.get("PRICING_PROCESS_WORKERS", str(default_workers))),
+            min_cost=int(os.environ.get("PRICING_OFFLOAD_MIN_COST", "20000")),
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Offloaded tasks waiting for a free worker (in flight beyond the pool size)."""
+        capacity = self.workers if self.workers > 0 else self.inflight
+        return max(0, self.inflight - capacity)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a threaded server process is unsafe.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    async def run(self, fn: Callable[..., T], cost: int, **kwargs: Any) -> T:
+        """Return fn(**kwargs): inline when cost < min_cost, else off the event loop."""
+        if cost < self.min_cost:
+            return fn(**kwargs)
+        loop = asyncio.get_running_loop()
+        submitted = time.time()
+        self.inflight += 1
+        try:
+            if self.workers > 0:
+                result, started, observations = await loop.run_in_executor(
+                    self._get_pool(), _timed_call, fn, kwargs
+                )
+            else:
+                result, started, observations = await asyncio.to_thread(_timed_call, fn, kwargs)
+        finally:
+            self.inflight -= 1
+        EXECUTOR_WAIT_SECONDS.observe(max(0.0, started - submitted))
+        replay_observations(observations)
+        return result
+
+    async def resolve(self, fn: Callable[..., T], cost: int, **kwargs: Any) -> T:
+        """
+        Return fn(**kwargs) in this process: inline when cost < min_cost, else in a
+        thread. For work that must see this process's state (market cache, registries).
+        """
+        if cost < self.min_cost:
+            return fn(**kwargs)
+        return await asyncio.to_thread(fn, **kwargs)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+
+EXECUTOR_WAIT_SECONDS = Histogram(
+    "pricing_api_executor_wait_seconds",
+    "Time offloaded pricing tasks waited before a worker started them.",
+)
+
+pricing_executor = PricingExecutor.from_env()
+
+CallbackMetric(
+    "pricing_api_executor_inflight_tasks",
+    "Offloaded pricing tasks submitted and not yet finished.",
+    lambda: pricing_executor.inflight,
+)
+CallbackMetric(
+    "pricing_api_executor_queue_depth",
+    "Offloaded pricing tasks waiting for a free worker.",
+    lambda: pricing_executor.queue_depth,
+)
@@ -0,0 +1,80 @@
+"""
+Per-stage latency histograms for the pricing API (exported on /metrics).
+
+- pricing_api_graphql_stage_seconds{stage}: GraphQL parse / validate / execute,
+  recorded by the GraphQLStageTimer schema extension. Subscriptions are not timed
+  at the execute stage: it spans the whole stream, not one request.
+- pricing_api_market_build_seconds: each market_from_input build (cache misses, uploads).
+- pricing_api_price_seconds{instrument}: single-trade price().
+- pricing_api_price_batch_seconds{instrument}: one price_batch() call per
+  instrument type in a portfolio request.
+- pricing_api_risk_seconds{measure,instrument}: each risk measure (incl. key-rate ladders).
+
+Stages timed inside offloaded workers are captured there and replayed into this
+process (see app.executor).
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+from app.metrics import Histogram
+
+GRAPHQL_STAGE_SECONDS = Histogram(
+    "pricing_api_graphql_stage_seconds",
+    "GraphQL request stage latency.",
+    labelnames=("stage",),
+)
+MARKET_BUILD_SECONDS = Histogram(
+    "pricing_api_market_build_seconds",
+    "Time to build a Market from MarketInput.",
+)
+PRICE_SECONDS = Histogram(
+    "pricing_api_price_seconds",
+    "Single-trade price() latency by instrument type.",
+    labelnames=("instrument",),
+)
+PRICE_BATCH_SECONDS = Histogram(
+    "pricing_api_price_batch_seconds",
+    "Portfolio price_batch() latency per instrument-type group.",
+    labelnames=("instrument",),
+)
+RISK_SECONDS = Histogram(
+    "pricing_api_risk_seconds",
+    "Risk measure latency by measure and instrument type.",
+    labelnames=("measure", "instrument"),
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the wall time of the block in `histogram` (also when it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+class GraphQLStageTimer(SchemaExtension):
+    """Strawberry extension timing the parse, validate and execute stages."""
+
+    def on_parse(self) -> Iterator[None]:
+        with timed(GRAPHQL_STAGE_SECONDS, stage="parse"):
+            yield
+
+    def on_validate(self) -> Iterator[None]:
+        with timed(GRAPHQL_STAGE_SECONDS, stage="validate"):
+            yield
+
+    def on_execute(self) -> Iterator[None]:
+        if self.execution_context.operation_type == OperationType.SUBSCRIPTION:
+            yield
+            return
+        with timed(GRAPHQL_STAGE_SECONDS, stage="execute"):
+            yield
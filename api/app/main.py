@@ -1,11 +1,27 @@
 """FastAPI app with Strawberry GraphQL."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from strawberry.fastapi import GraphQLRouter
 
+from app.executor import pricing_executor
+from app.metrics import CONTENT_TYPE, REGISTRY
+from app.redis_client import close_redis
 from app.schema import schema
 
-app = FastAPI(title="Pricing API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Shut down the pricing process pool (if started) and the Redis connection with the app."""
+    yield
+    pricing_executor.shutdown()
+    await close_redis()
+
+
+app = FastAPI(title="Pricing API", version="0.1.0", lifespan=lifespan)
 graphql_app = GraphQLRouter(schema)
 app.include_router(graphql_app, prefix="/graphql")
 
@@ -14,3 +30,9 @@ app.include_router(graphql_app, prefix="/graphql")
 def health() -> dict[str, str]:
     """Health check for load balancers and Docker."""
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Prometheus metrics (text exposition format)."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,101 @@
+"""
+In-process LRU cache of parsed Markets, keyed on the MarketInput fingerprint.
+
+Clients such as the live blotter send the same market snapshot with several
+requests in a row; the cache returns the already-built (immutable-style) Market
+instead of re-validating and reconstructing every curve. The fingerprint is the
+input's full content as nested tuples, so a hit always means equal content.
+
+MARKET_CACHE_MAX_ENTRIES (default 128) bounds the cache; 0 disables it.
+Hit/miss counts and the entry count are exported on /metrics.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+from pricing.market import Market
+
+from app.metrics import CallbackMetric
+from app.types import MarketInput
+
+
+def market_fingerprint(m: MarketInput) -> Hashable:
+    """Hashable content key for a MarketInput (curves, hazard curves, FX spots, in input order)."""
+    return (
+        tuple((c.name, tuple(c.pillars), tuple(c.zero_rates_cc), c.t0) for c in m.curves),
+        tuple((h.name, tuple(h.pillars), tuple(h.hazard_rates), h.t0) for h in m.hazard_curves or ()),
+        tuple((fx.pair, fx.spot) for fx in m.fx_spot or ()),
+    )
+
+
+class MarketCache:
+    """Thread-safe LRU of fingerprint -> Market with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 128) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must be >= 0")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Market] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "MarketCache":
+        return cls(max_entries=int(os.environ.get("MARKET_CACHE_MAX_ENTRIES", "128")))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_build(self, m: MarketInput, build: Callable[[MarketInput], Market]) -> Market:
+        """Return the cached Market for `m`, building (and caching) it on a miss."""
+        if self.max_entries == 0:
+            self.misses += 1
+            return build(m)
+        key = market_fingerprint(m)
+        with self._lock:
+            market = self._entries.get(key)
+            if market is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return market
+            self.misses += 1
+        # Build outside the lock; validation errors propagate and nothing is cached.
+        market = build(m)
+        with self._lock:
+            self._entries[key] = market
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return market
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+market_cache = MarketCache.from_env()
+
+CallbackMetric(
+    "pricing_api_market_cache_hits_total",
+    "Requests whose MarketInput was served from the parsed-market cache.",
+    lambda: market_cache.hits,
+    type="counter",
+)
+CallbackMetric(
+    "pricing_api_market_cache_misses_total",
+    "Requests whose MarketInput had to be parsed.",
+    lambda: market_cache.misses,
+    type="counter",
+)
+CallbackMetric(
+    "pricing_api_market_cache_entries",
+    "Parsed markets currently cached.",
+    lambda: len(market_cache),
+)
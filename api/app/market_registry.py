@@ -0,0 +1,159 @@
+"""
+Server-side registry of parsed market snapshots, keyed by a content hash.
+
+Clients upload a MarketInput once (uploadMarket) and then reference it by
+`marketId` in pricing queries, so repeated valuations against the same snapshot
+skip both the payload and the curve construction. The id is the SHA-256 of a
+canonical JSON form of the input, so uploading the same snapshot twice (from
+any client) yields the same id.
+
+The registry is in-process: each API replica has its own. Queries may send the
+full `market` alongside `marketId`; on a miss (evicted, expired, or another
+replica) it is parsed and registered under that id.
+
+Bounds (environment variables):
+- MARKET_REGISTRY_MAX_ENTRIES (default 256): LRU eviction beyond this count.
+- MARKET_REGISTRY_TTL_SECONDS (default 3600): entries expire this long after their last use.
+- MARKET_REGISTRY_MAX_BYTES (default 64 MiB): LRU eviction beyond this total size,
+  measured as the canonical JSON size of the stored inputs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from pricing.market import Market
+
+from app.metrics import CallbackMetric
+from app.types import MarketInput
+
+
+def canonical_market_json(m: MarketInput) -> str:
+    """Canonical JSON for a MarketInput: fixed key order, curves/pairs sorted by name."""
+    # Stable sorts keep the relative order of duplicate names (last one wins in Market).
+    payload: dict[str, Any] = {
+        "curves": [
+            [c.name, list(c.pillars), list(c.zero_rates_cc), c.t0]
+            for c in sorted(m.curves, key=lambda c: c.name)
+        ],
+        "hazard_curves": [
+            [h.name, list(h.pillars), list(h.hazard_rates), h.t0]
+            for h in sorted(m.hazard_curves or [], key=lambda h: h.name)
+        ],
+        "fx_spot": [[fx.pair, fx.spot] for fx in sorted(m.fx_spot or [], key=lambda fx: fx.pair)],
+    }
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def market_id_for(canonical_json: str) -> str:
+    """Content-hash id for a canonical market JSON string."""
+    return hashlib.sha256(canonical_json.encode()).hexdigest()
+
+
+@dataclass
+class _Entry:
+    market: Market
+    size: int
+    last_used: float
+
+
+class MarketRegistry:
+    """Thread-safe LRU + TTL store of parsed Markets, bounded by entry count and size."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0 or ttl_seconds <= 0 or max_bytes <= 0:
+            raise ValueError("max_entries, ttl_seconds and max_bytes must be positive")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "MarketRegistry":
+        """Build a registry bounded by the MARKET_REGISTRY_* environment variables."""
+        return cls(
+            max_entries=int(os.environ.get("MARKET_REGISTRY_MAX_ENTRIES", "256")),
+            ttl_seconds=float(os.environ.get("MARKET_REGISTRY_TTL_SECONDS", "3600")),
+            max_bytes=int(os.environ.get("MARKET_REGISTRY_MAX_BYTES", str(64 * 1024 * 1024))),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def put(self, market_id: str, market: Market, size: int) -> None:
+        """Store (or refresh) `market` under `market_id`, then evict down to the bounds."""
+        if size > self.max_bytes:
+            raise ValueError(
+                f"market snapshot is {size} bytes; registry limit is {self.max_bytes}"
+            )
+        now = self._clock()
+        with self._lock:
+            old = self._entries.pop(market_id, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[market_id] = _Entry(market=market, size=size, last_used=now)
+            self._bytes += size
+            self._evict(now)
+
+    def get(self, market_id: str) -> Market | None:
+        """Return the market for `market_id` (refreshing its LRU/TTL position), or None."""
+        now = self._clock()
+        with self._lock:
+            self._evict(now)
+            entry = self._entries.get(market_id)
+            if entry is None:
+                return None
+            entry.last_used = now
+            self._entries.move_to_end(market_id)
+            return entry.market
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least-recently-used ones beyond the bounds (lock held)."""
+        # Entries are in last-used order, so expired ones are at the front.
+        while self._entries:
+            market_id, entry = next(iter(self._entries.items()))
+            over_bounds = len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            if not over_bounds and now - entry.last_used < self.ttl_seconds:
+                break
+            del self._entries[market_id]
+            self._bytes -= entry.size
+
+
+market_registry = MarketRegistry.from_env()
+
+CallbackMetric(
+    "pricing_api_market_registry_entries",
+    "Market snapshots registered via uploadMarket.",
+    lambda: len(market_registry),
+)
+CallbackMetric(
+    "pricing_api_market_registry_bytes",
+    "Canonical JSON size of the registered market snapshots.",
+    lambda: market_registry.total_bytes,
+)
@@ -0,0 +1,134 @@
+"""
+Server-side registry of portfolios for streaming valuation (portfolioPriced).
+
+registerPortfolio stores the trades, their base market and the requested risk
+once; subscriptions then reference the portfolio by `portfolioId` and only the
+live curve changes per tick. The id is the SHA-256 of a canonical JSON form of
+the trades, the market id and the risk options, so registering the same
+portfolio twice yields the same id.
+
+The registry is in-process, like the market registry: each API replica has its
+own. Behind the load balancer, send registerPortfolio over the subscription's
+WebSocket connection so both reach the same replica. A running subscription
+holds its portfolio, so eviction only affects new subscriptions.
+
+Bounds (environment variables):
+- PORTFOLIO_REGISTRY_MAX_ENTRIES (default 64): LRU eviction beyond this count.
+- PORTFOLIO_REGISTRY_TTL_SECONDS (default 86400): entries expire this long after their last use.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from pricing.market import Market
+
+from app.metrics import CallbackMetric
+from app.types import TradeInput
+
+
+def portfolio_id_for(trades: list[TradeInput], market_id: str, options: dict[str, Any]) -> str:
+    """Content-hash id for a portfolio: trades (in order), market id and risk options."""
+    payload = {
+        "trades": [dataclasses.asdict(t) for t in trades],
+        "market_id": market_id,
+        "options": options,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass
+class RegisteredPortfolio:
+    """Trades priced together on `market` with price_portfolio(**options); `cost` as in request_cost."""
+
+    portfolio_id: str
+    trades: list[TradeInput]
+    market: Market
+    options: dict[str, Any] = field(default_factory=dict)
+    cost: int = 0
+
+
+@dataclass
+class _Entry:
+    portfolio: RegisteredPortfolio
+    last_used: float
+
+
+class PortfolioRegistry:
+    """Thread-safe LRU + TTL store of registered portfolios, bounded by entry count."""
+
+    def __init__(
+        self,
+        max_entries: int = 64,
+        ttl_seconds: float = 86400.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0 or ttl_seconds <= 0:
+            raise ValueError("max_entries and ttl_seconds must be positive")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "PortfolioRegistry":
+        """Build a registry bounded by the PORTFOLIO_REGISTRY_* environment variables."""
+        return cls(
+            max_entries=int(os.environ.get("PORTFOLIO_REGISTRY_MAX_ENTRIES", "64")),
+            ttl_seconds=float(os.environ.get("PORTFOLIO_REGISTRY_TTL_SECONDS", "86400")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, portfolio: RegisteredPortfolio) -> None:
+        """Store (or refresh) `portfolio` under its id, then evict down to the bounds."""
+        now = self._clock()
+        with self._lock:
+            self._entries.pop(portfolio.portfolio_id, None)
+            self._entries[portfolio.portfolio_id] = _Entry(portfolio=portfolio, last_used=now)
+            self._evict(now)
+
+    def get(self, portfolio_id: str) -> RegisteredPortfolio | None:
+        """Return the portfolio for `portfolio_id` (refreshing its LRU/TTL position), or None."""
+        now = self._clock()
+        with self._lock:
+            self._evict(now)
+            entry = self._entries.get(portfolio_id)
+            if entry is None:
+                return None
+            entry.last_used = now
+            self._entries.move_to_end(portfolio_id)
+            return entry.portfolio
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least-recently-used ones beyond max_entries (lock held)."""
+        while self._entries:
+            portfolio_id, entry = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_entries and now - entry.last_used < self.ttl_seconds:
+                break
+            del self._entries[portfolio_id]
+
+
+portfolio_registry = PortfolioRegistry.from_env()
+
+CallbackMetric(
+    "pricing_api_portfolio_registry_entries",
+    "Portfolios registered via registerPortfolio.",
+    lambda: len(portfolio_registry),
+)
@@ -1,27 +1,61 @@
-"""GraphQL schema: pricing and risk queries."""
+"""
+GraphQL schema: pricing and risk queries, market snapshot and portfolio
+registration, streaming portfolio valuation.
 
+Pricing resolvers are async: the market is resolved (cache/registry) in this
+process, in a thread when the request or market is heavy, then the service call
+runs through pricing_executor, which offloads heavy requests to a process pool.
+"""
+
+from collections.abc import AsyncGenerator
 from typing import Optional
 
 import strawberry
+from pricing.market import Market
 
+from app.executor import pricing_executor
+from app.instrumentation import GraphQLStageTimer
+from app.portfolio_registry import portfolio_registry
 from app.services import (
+    market_cost,
     price_cds,
     price_fx_forward,
     price_mortgage,
+    price_portfolio,
     price_swap,
     price_zero_coupon_bond,
+    register_portfolio,
+    request_cost,
+    resolve_market,
+    upload_market,
 )
+from app.streaming import portfolio_updates
 from app.types import (
     CDSInput,
     FXForwardInput,
     FixedFloatSwapInput,
+    MarketHandle,
     MarketInput,
     MortgageInput,
+    PortfolioHandle,
+    PortfolioUpdate,
     PricingResult,
+    TradeInput,
+    TradeResult,
     ZeroCouponBondInput,
 )
 
 
+async def _market(market: Optional[MarketInput], market_id: Optional[str], cost: int) -> Market:
+    """
+    resolve_market in this process (its cache and registry live here), off the event
+    loop when the request or the market to build is heavy.
+    """
+    return await pricing_executor.resolve(
+        resolve_market, cost + market_cost(market), market=market, market_id=market_id
+    )
+
+
 @strawberry.type
 class Query:
     @strawberry.field
@@ -33,100 +67,216 @@ class Query:
         return "0.1.0"
 
     @strawberry.field
-    def price_zero_coupon_bond(
+    async def price_zero_coupon_bond(
         self,
         bond: ZeroCouponBondInput,
-        market: MarketInput,
+        market: Optional[MarketInput] = None,
         calculate_pv01: bool = False,
         pv01_curve_name: Optional[str] = None,
         pv01_bump_bp: float = 1.0,
+        calculate_key_rate_pv01: bool = False,
+        market_id: Optional[str] = None,
     ) -> PricingResult:
-        """Price a zero-coupon bond. Optionally compute PV01 (parallel curve bump)."""
-        return price_zero_coupon_bond(
+        """Price a zero-coupon bond. Optionally compute PV01 (parallel curve bump) and a key-rate PV01 ladder."""
+        cost = request_cost([bond], 1 + calculate_pv01 + calculate_key_rate_pv01)
+        return await pricing_executor.run(
+            price_zero_coupon_bond,
+            cost,
             bond=bond,
-            market=market,
+            market=await _market(market, market_id, cost),
             calculate_pv01=calculate_pv01,
             pv01_curve_name=pv01_curve_name,
             pv01_bump_bp=pv01_bump_bp,
+            calculate_key_rate_pv01=calculate_key_rate_pv01,
         )
 
     @strawberry.field
-    def price_swap(
+    async def price_swap(
         self,
         swap: FixedFloatSwapInput,
-        market: MarketInput,
+        market: Optional[MarketInput] = None,
         calculate_pv01: bool = False,
         pv01_curve_name: Optional[str] = None,
         pv01_bump_bp: float = 1.0,
+        calculate_key_rate_pv01: bool = False,
+        market_id: Optional[str] = None,
     ) -> PricingResult:
-        """Price a fixed-float interest rate swap. Optionally compute PV01."""
-        return price_swap(
+        """Price a fixed-float interest rate swap. Optionally compute PV01 and a key-rate PV01 ladder."""
+        cost = request_cost([swap], 1 + calculate_pv01 + calculate_key_rate_pv01)
+        return await pricing_executor.run(
+            price_swap,
+            cost,
             swap=swap,
-            market=market,
+            market=await _market(market, market_id, cost),
             calculate_pv01=calculate_pv01,
             pv01_curve_name=pv01_curve_name,
             pv01_bump_bp=pv01_bump_bp,
+            calculate_key_rate_pv01=calculate_key_rate_pv01,
         )
 
     @strawberry.field
-    def price_fx_forward(
+    async def price_fx_forward(
         self,
         forward: FXForwardInput,
-        market: MarketInput,
+        market: Optional[MarketInput] = None,
         calculate_pv01: bool = False,
         calculate_fx_delta: bool = False,
         pv01_curve_name: Optional[str] = None,
         pv01_bump_bp: float = 1.0,
         fx_delta_pair: Optional[str] = None,
         fx_delta_bump_pct: float = 0.01,
+        calculate_key_rate_pv01: bool = False,
+        market_id: Optional[str] = None,
     ) -> PricingResult:
-        """Price an FX forward. Optionally compute PV01 and FX delta."""
-        return price_fx_forward(
+        """Price an FX forward. Optionally compute PV01, key-rate PV01 and FX delta."""
+        cost = request_cost([forward], 1 + calculate_pv01 + calculate_fx_delta + calculate_key_rate_pv01)
+        return await pricing_executor.run(
+            price_fx_forward,
+            cost,
             forward=forward,
-            market=market,
+            market=await _market(market, market_id, cost),
             calculate_pv01=calculate_pv01,
             calculate_fx_delta=calculate_fx_delta,
             pv01_curve_name=pv01_curve_name,
             pv01_bump_bp=pv01_bump_bp,
             fx_delta_pair=fx_delta_pair,
             fx_delta_bump_pct=fx_delta_bump_pct,
+            calculate_key_rate_pv01=calculate_key_rate_pv01,
         )
 
     @strawberry.field
-    def price_mortgage(
+    async def price_mortgage(
         self,
         mortgage: MortgageInput,
-        market: MarketInput,
+        market: Optional[MarketInput] = None,
         calculate_pv01: bool = False,
         pv01_curve_name: Optional[str] = None,
         pv01_bump_bp: float = 1.0,
+        calculate_key_rate_pv01: bool = False,
+        market_id: Optional[str] = None,
     ) -> PricingResult:
-        """Price a level-pay mortgage. Optionally compute PV01."""
-        return price_mortgage(
+        """Price a level-pay mortgage. Optionally compute PV01 and a key-rate PV01 ladder."""
+        cost = request_cost([mortgage], 1 + calculate_pv01 + calculate_key_rate_pv01)
+        return await pricing_executor.run(
+            price_mortgage,
+            cost,
             mortgage=mortgage,
-            market=market,
+            market=await _market(market, market_id, cost),
             calculate_pv01=calculate_pv01,
             pv01_curve_name=pv01_curve_name,
             pv01_bump_bp=pv01_bump_bp,
+            calculate_key_rate_pv01=calculate_key_rate_pv01,
         )
 
     @strawberry.field
-    def price_cds(
+    async def price_cds(
         self,
         cds: CDSInput,
-        market: MarketInput,
+        market: Optional[MarketInput] = None,
         calculate_cs01: bool = False,
         cs01_hazard_curve_name: Optional[str] = None,
         cs01_bump_bp: float = 1.0,
+        market_id: Optional[str] = None,
     ) -> PricingResult:
         """Price a single-name CDS. Optionally compute CS01 (hazard curve bump)."""
-        return price_cds(
+        cost = request_cost([cds], 1 + calculate_cs01)
+        return await pricing_executor.run(
+            price_cds,
+            cost,
             cds=cds,
-            market=market,
+            market=await _market(market, market_id, cost),
             calculate_cs01=calculate_cs01,
             cs01_hazard_curve_name=cs01_hazard_curve_name,
             cs01_bump_bp=cs01_bump_bp,
         )
 
+    @strawberry.field
+    async def price_portfolio(
+        self,
+        trades: list[TradeInput],
+        market: Optional[MarketInput] = None,
+        calculate_pv01: bool = False,
+        calculate_fx_delta: bool = False,
+        calculate_cs01: bool = False,
+        calculate_key_rate_pv01: bool = False,
+        pv01_bump_bp: float = 1.0,
+        fx_delta_bump_pct: float = 0.01,
+        cs01_bump_bp: float = 1.0,
+        market_id: Optional[str] = None,
+    ) -> list[TradeResult]:
+        """Price many trades on one market in a single request. Risk uses each trade's own curves."""
+        cost = request_cost(
+            trades,
+            1 + calculate_pv01 + calculate_fx_delta + calculate_cs01 + calculate_key_rate_pv01,
+        )
+        return await pricing_executor.run(
+            price_portfolio,
+            cost,
+            trades=trades,
+            market=await _market(market, market_id, cost),
+            calculate_pv01=calculate_pv01,
+            calculate_fx_delta=calculate_fx_delta,
+            calculate_cs01=calculate_cs01,
+            calculate_key_rate_pv01=calculate_key_rate_pv01,
+            pv01_bump_bp=pv01_bump_bp,
+            fx_delta_bump_pct=fx_delta_bump_pct,
+            cs01_bump_bp=cs01_bump_bp,
+        )
+
+
+@strawberry.type
+class Mutation:
+    @strawberry.mutation
+    def upload_market(self, market: MarketInput) -> MarketHandle:
+        """Register a market snapshot server-side; returns its content-hash `marketId`."""
+        return upload_market(market=market)
+
+    @strawberry.mutation
+    def register_portfolio(
+        self,
+        trades: list[TradeInput],
+        market: Optional[MarketInput] = None,
+        market_id: Optional[str] = None,
+        calculate_pv01: bool = False,
+        calculate_fx_delta: bool = False,
+        calculate_cs01: bool = False,
+        calculate_key_rate_pv01: bool = False,
+        pv01_bump_bp: float = 1.0,
+        fx_delta_bump_pct: float = 0.01,
+        cs01_bump_bp: float = 1.0,
+    ) -> PortfolioHandle:
+        """Register trades, their base market and risk options for the portfolioPriced subscription."""
+        return register_portfolio(
+            trades=trades,
+            market=market,
+            market_id=market_id,
+            calculate_pv01=calculate_pv01,
+            calculate_fx_delta=calculate_fx_delta,
+            calculate_cs01=calculate_cs01,
+            calculate_key_rate_pv01=calculate_key_rate_pv01,
+            pv01_bump_bp=pv01_bump_bp,
+            fx_delta_bump_pct=fx_delta_bump_pct,
+            cs01_bump_bp=cs01_bump_bp,
+        )
+
+
+@strawberry.type
+class Subscription:
+    @strawberry.subscription
+    async def portfolio_priced(
+        self, portfolio_id: str, curve_name: str, only_changed: bool = False
+    ) -> AsyncGenerator[PortfolioUpdate, None]:
+        """Reprice a registered portfolio on each tick of the live curve `curveName`."""
+        portfolio = portfolio_registry.get(portfolio_id)
+        if portfolio is None:
+            raise ValueError(
+                f"portfolioId '{portfolio_id}' not found (unknown, evicted or expired); "
+                "register it again with registerPortfolio"
+            )
+        async for update in portfolio_updates(portfolio, curve_name, only_changed):
+            yield update
+
 
-schema = strawberry.Schema(query=Query)
+schema = strawberry.Schema(
+    query=Query, mutation=Mutation, subscription=Subscription, extensions=[GraphQLStageTimer]
+)
@@ -6,26 +6,39 @@ from typing import Optional
 
 from pricing.curves import HazardRateCurve, ZeroRateCurve
 from pricing.market import Market
-from pricing.pricing import price
+from pricing.pricing import Trade, price, price_batch
 from pricing.products.bond import ZeroCouponBond
 from pricing.products.cds import CDS
 from pricing.products.fx import FXForward
 from pricing.products.mortgage import LevelPayMortgage
 from pricing.products.swap import FixedFloatSwap
-from pricing.risk import cs01_parallel
-from pricing.risk import fx_delta as risk_fx_delta
-from pricing.risk import pv01_parallel
+from pricing.risk import CS01Parallel, FXDelta, KeyRatePV01, PV01Parallel, compute_risks
 
+from app.instrumentation import (
+    MARKET_BUILD_SECONDS,
+    PRICE_BATCH_SECONDS,
+    PRICE_SECONDS,
+    RISK_SECONDS,
+    timed,
+)
+from app.market_cache import market_cache
+from app.market_registry import canonical_market_json, market_id_for, market_registry
+from app.portfolio_registry import RegisteredPortfolio, portfolio_id_for, portfolio_registry
 from app.types import (
     CDSInput,
     CurveInput,
     FXForwardInput,
     FixedFloatSwapInput,
     HazardCurveInput,
+    KeyRateBucket,
+    MarketHandle,
     MarketInput,
     MortgageInput,
+    PortfolioHandle,
     PricingResult,
     RiskMeasures,
+    TradeInput,
+    TradeResult,
     ZeroCouponBondInput,
 )
 
@@ -52,6 +65,11 @@ def _hazard_curve_from_input(h: HazardCurveInput) -> HazardRateCurve:
 
 def market_from_input(m: MarketInput) -> Market:
     """Build Market from GraphQL MarketInput."""
+    with timed(MARKET_BUILD_SECONDS):
+        return _build_market(m)
+
+
+def _build_market(m: MarketInput) -> Market:
     if not m.curves:
         raise ValueError("market.curves must not be empty")
     curves: dict[str, ZeroRateCurve | HazardRateCurve] = {}
@@ -67,6 +85,53 @@ def market_from_input(m: MarketInput) -> Market:
     return Market(curves=curves, fx_spot=fx_spot)
 
 
+def upload_market(market: MarketInput) -> MarketHandle:
+    """Parse `market` once and store it in the registry under its content hash."""
+    canonical = canonical_market_json(market)
+    market_id = market_id_for(canonical)
+    m = market_registry.get(market_id)
+    if m is None:
+        m = market_from_input(market)
+        market_registry.put(market_id, m, len(canonical))
+    return MarketHandle(
+        market_id=market_id,
+        curve_names=list(m.curves.keys()),
+        fx_pairs=list(m.fx_spot.keys()),
+    )
+
+
+def resolve_market(
+    market: Optional[MarketInput | Market], market_id: Optional[str]
+) -> Market:
+    """
+    Market for a pricing request: the registered snapshot for `market_id` when given,
+    else built from `market` (through the parsed-market cache). If the id misses
+    (evicted, expired, other replica) and `market` is also sent, it is parsed and
+    registered under that id. An already-built Market is returned as is, so
+    resolvers can resolve in the server process before offloading to a worker.
+    """
+    if isinstance(market, Market):
+        return market
+    if market_id is None:
+        if market is None:
+            raise ValueError("either market or marketId must be provided")
+        return market_cache.get_or_build(market, market_from_input)
+    m = market_registry.get(market_id)
+    if m is not None:
+        return m
+    if market is None:
+        raise ValueError(
+            f"marketId '{market_id}' not found (unknown, evicted or expired); "
+            "upload it again with uploadMarket or send market as well"
+        )
+    canonical = canonical_market_json(market)
+    if market_id_for(canonical) != market_id:
+        raise ValueError(f"market does not match marketId '{market_id}'")
+    m = market_from_input(market)
+    market_registry.put(market_id, m, len(canonical))
+    return m
+
+
 def _validate_curve_in_market(market: Market, curve_name: str, context: str) -> None:
     if curve_name not in market.curves:
         raise ValueError(
@@ -75,84 +140,88 @@ def _validate_curve_in_market(market: Market, curve_name: str, context: str) ->
         )
 
 
-def price_zero_coupon_bond(
-    bond: ZeroCouponBondInput,
-    market: MarketInput,
-    calculate_pv01: bool = False,
-    pv01_curve_name: Optional[str] = None,
-    pv01_bump_bp: float = 1.0,
-) -> PricingResult:
-    """Price a zero-coupon bond and optionally compute PV01."""
+def _validate_fx_pair_in_market(market: Market, pair: str, context: str) -> None:
+    if pair not in market.fx_spot:
+        raise ValueError(
+            f"{context}: FX pair '{pair}' not found in market. "
+            f"Available pairs: {list(market.fx_spot.keys())}"
+        )
+
+
+def _price(instrument: Trade, market: Market) -> float:
+    """price() with its latency recorded per instrument type."""
+    with timed(PRICE_SECONDS, instrument=type(instrument).__name__):
+        return price(instrument, market)
+
+
+def _risk_measures(
+    instrument: Trade,
+    market: Market,
+    npv: float,
+    pv01: Optional[PV01Parallel] = None,
+    fx_delta: Optional[FXDelta] = None,
+    cs01: Optional[CS01Parallel] = None,
+    key_rate_pv01: Optional[KeyRatePV01] = None,
+) -> Optional[RiskMeasures]:
+    """Run the requested measures reusing `npv` as the base PV; None if none requested."""
+    requested = [r for r in (pv01, fx_delta, cs01) if r is not None]
+    if not requested and key_rate_pv01 is None:
+        return None
+    instrument_type = type(instrument).__name__
+    values: dict[str, float] = {}
+    for measure in requested:
+        # One measure per call so each is timed; the base PV is still shared.
+        with timed(RISK_SECONDS, measure=type(measure).__name__, instrument=instrument_type):
+            values.update(compute_risks(instrument, market, [measure], base_pv=npv))
+    ladder = None
+    if key_rate_pv01 is not None:
+        with timed(RISK_SECONDS, measure="KeyRatePV01", instrument=instrument_type):
+            ladder = [
+                KeyRateBucket(pillar=pillar, pv01=value)
+                for pillar, value in key_rate_pv01.ladder(instrument, market, base_pv=npv)
+            ]
+    return RiskMeasures(
+        pv01=values[pv01.name] if pv01 is not None else None,
+        fx_delta=values[fx_delta.name] if fx_delta is not None else None,
+        cs01=values[cs01.name] if cs01 is not None else None,
+        key_rate_pv01=ladder,
+    )
+
+
+def _zero_coupon_bond(bond: ZeroCouponBondInput, m: Market) -> ZeroCouponBond:
+    """Validate a ZeroCouponBondInput against the market and build the instrument."""
     if bond.maturity < 0:
         raise ValueError("bond.maturity must be >= 0")
-    m = market_from_input(market)
     _validate_curve_in_market(m, bond.curve, "ZeroCouponBond")
-    instrument = ZeroCouponBond(
+    return ZeroCouponBond(
         curve=bond.curve,
         maturity=bond.maturity,
         notional=bond.notional,
     )
-    npv = price(instrument, m)
-    risk_measures = None
-    if calculate_pv01:
-        curve_name = pv01_curve_name or bond.curve
-        _validate_curve_in_market(m, curve_name, "PV01")
-        pv01 = pv01_parallel(instrument, m, curve_name, bump_bp=pv01_bump_bp)
-        risk_measures = RiskMeasures(pv01=pv01, fx_delta=None)
-    return PricingResult(npv=npv, risk_measures=risk_measures)
 
 
-def price_swap(
-    swap: FixedFloatSwapInput,
-    market: MarketInput,
-    calculate_pv01: bool = False,
-    pv01_curve_name: Optional[str] = None,
-    pv01_bump_bp: float = 1.0,
-) -> PricingResult:
-    """Price a fixed-float swap and optionally compute PV01."""
+def _swap(swap: FixedFloatSwapInput, m: Market) -> FixedFloatSwap:
+    """Validate a FixedFloatSwapInput against the market and build the instrument."""
     if not swap.pay_times:
         raise ValueError("swap.pay_times must not be empty")
-    m = market_from_input(market)
     _validate_curve_in_market(m, swap.curve, "FixedFloatSwap")
-    instrument = FixedFloatSwap(
+    return FixedFloatSwap(
         curve=swap.curve,
         notional=swap.notional,
         fixed_rate=swap.fixed_rate,
         pay_times=list(swap.pay_times),
         t0=swap.t0,
     )
-    npv = price(instrument, m)
-    risk_measures = None
-    if calculate_pv01:
-        curve_name = pv01_curve_name or swap.curve
-        _validate_curve_in_market(m, curve_name, "PV01")
-        pv01 = pv01_parallel(instrument, m, curve_name, bump_bp=pv01_bump_bp)
-        risk_measures = RiskMeasures(pv01=pv01, fx_delta=None)
-    return PricingResult(npv=npv, risk_measures=risk_measures)
 
 
-def price_fx_forward(
-    forward: FXForwardInput,
-    market: MarketInput,
-    calculate_pv01: bool = False,
-    calculate_fx_delta: bool = False,
-    pv01_curve_name: Optional[str] = None,
-    pv01_bump_bp: float = 1.0,
-    fx_delta_pair: Optional[str] = None,
-    fx_delta_bump_pct: float = 0.01,
-) -> PricingResult:
-    """Price an FX forward (CIP) and optionally compute PV01 and FX delta."""
+def _fx_forward(forward: FXForwardInput, m: Market) -> FXForward:
+    """Validate an FXForwardInput against the market and build the instrument."""
     if forward.maturity < 0:
         raise ValueError("forward.maturity must be >= 0")
-    m = market_from_input(market)
     _validate_curve_in_market(m, forward.base_curve, "FXForward base_curve")
     _validate_curve_in_market(m, forward.quote_curve, "FXForward quote_curve")
-    if forward.pair not in m.fx_spot:
-        raise ValueError(
-            f"FXForward: FX pair '{forward.pair}' not found in market. "
-            f"Available pairs: {list(m.fx_spot.keys())}"
-        )
-    instrument = FXForward(
+    _validate_fx_pair_in_market(m, forward.pair, "FXForward")
+    return FXForward(
         pair=forward.pair,
         base_curve=forward.base_curve,
         quote_curve=forward.quote_curve,
@@ -160,71 +229,29 @@ def price_fx_forward(
         notional_base=forward.notional_base,
         strike=forward.strike,
     )
-    npv = price(instrument, m)
-    pv01_val = None
-    fx_delta_val = None
-    if calculate_pv01:
-        curve_name = pv01_curve_name or forward.quote_curve
-        _validate_curve_in_market(m, curve_name, "PV01")
-        pv01_val = pv01_parallel(instrument, m, curve_name, bump_bp=pv01_bump_bp)
-    if calculate_fx_delta:
-        pair = fx_delta_pair or forward.pair
-        if pair not in m.fx_spot:
-            raise ValueError(
-                f"FX delta: pair '{pair}' not found in market. "
-                f"Available pairs: {list(m.fx_spot.keys())}"
-            )
-        fx_delta_val = risk_fx_delta(instrument, m, pair, bump_pct=fx_delta_bump_pct)
-    if pv01_val is not None or fx_delta_val is not None:
-        risk_measures = RiskMeasures(pv01=pv01_val, fx_delta=fx_delta_val)
-    else:
-        risk_measures = None
-    return PricingResult(npv=npv, risk_measures=risk_measures)
 
 
-def price_mortgage(
-    mortgage: MortgageInput,
-    market: MarketInput,
-    calculate_pv01: bool = False,
-    pv01_curve_name: Optional[str] = None,
-    pv01_bump_bp: float = 1.0,
-) -> PricingResult:
-    """Price a level-pay mortgage and optionally compute PV01."""
+def _mortgage(mortgage: MortgageInput, m: Market) -> LevelPayMortgage:
+    """Validate a MortgageInput against the market and build the instrument."""
     if mortgage.term_years <= 0 or mortgage.payments_per_year <= 0:
         raise ValueError("term_years and payments_per_year must be positive")
-    m = market_from_input(market)
     _validate_curve_in_market(m, mortgage.curve, "LevelPayMortgage")
-    instrument = LevelPayMortgage(
+    return LevelPayMortgage(
         curve=mortgage.curve,
         notional=mortgage.notional,
         annual_rate=mortgage.annual_rate,
         term_years=mortgage.term_years,
         payments_per_year=mortgage.payments_per_year,
     )
-    npv = price(instrument, m)
-    risk_measures = None
-    if calculate_pv01:
-        curve_name = pv01_curve_name or mortgage.curve
-        _validate_curve_in_market(m, curve_name, "PV01")
-        pv01 = pv01_parallel(instrument, m, curve_name, bump_bp=pv01_bump_bp)
-        risk_measures = RiskMeasures(pv01=pv01, fx_delta=None)
-    return PricingResult(npv=npv, risk_measures=risk_measures)
 
 
-def price_cds(
-    cds: CDSInput,
-    market: MarketInput,
-    calculate_cs01: bool = False,
-    cs01_hazard_curve_name: Optional[str] = None,
-    cs01_bump_bp: float = 1.0,
-) -> PricingResult:
-    """Price a single-name CDS and optionally compute CS01."""
+def _cds(cds: CDSInput, m: Market) -> CDS:
+    """Validate a CDSInput against the market and build the instrument."""
     if not cds.pay_times:
         raise ValueError("cds.pay_times must not be empty")
-    m = market_from_input(market)
     _validate_curve_in_market(m, cds.discount_curve, "CDS discount_curve")
     _validate_curve_in_market(m, cds.survival_curve, "CDS survival_curve")
-    instrument = CDS(
+    return CDS(
         discount_curve=cds.discount_curve,
         survival_curve=cds.survival_curve,
         notional=cds.notional,
@@ -234,13 +261,357 @@ def price_cds(
         t0=cds.t0,
         protection_buyer=cds.protection_buyer,
     )
-    npv = price(instrument, m)
-    risk_measures = None
+
+
+def _pv01_measures(
+    m: Market,
+    curve_name: str,
+    bump_bp: float,
+    calculate_pv01: bool,
+    calculate_key_rate_pv01: bool,
+) -> tuple[Optional[PV01Parallel], Optional[KeyRatePV01]]:
+    """Parallel and key-rate PV01 measures on `curve_name` (None when not requested)."""
+    if not (calculate_pv01 or calculate_key_rate_pv01):
+        return None, None
+    _validate_curve_in_market(m, curve_name, "PV01")
+    pv01 = PV01Parallel(curve_name=curve_name, bump_bp=bump_bp) if calculate_pv01 else None
+    key_rate_pv01 = (
+        KeyRatePV01(curve_name=curve_name, bump_bp=bump_bp) if calculate_key_rate_pv01 else None
+    )
+    return pv01, key_rate_pv01
+
+
+def price_zero_coupon_bond(
+    bond: ZeroCouponBondInput,
+    market: Optional[MarketInput | Market] = None,
+    calculate_pv01: bool = False,
+    pv01_curve_name: Optional[str] = None,
+    pv01_bump_bp: float = 1.0,
+    calculate_key_rate_pv01: bool = False,
+    market_id: Optional[str] = None,
+) -> PricingResult:
+    """Price a zero-coupon bond and optionally compute PV01 / key-rate PV01."""
+    m = resolve_market(market, market_id)
+    instrument = _zero_coupon_bond(bond, m)
+    npv = _price(instrument, m)
+    pv01, key_rate_pv01 = _pv01_measures(
+        m, pv01_curve_name or bond.curve, pv01_bump_bp, calculate_pv01, calculate_key_rate_pv01
+    )
+    risk_measures = _risk_measures(instrument, m, npv, pv01=pv01, key_rate_pv01=key_rate_pv01)
+    return PricingResult(npv=npv, risk_measures=risk_measures)
+
+
+def price_swap(
+    swap: FixedFloatSwapInput,
+    market: Optional[MarketInput | Market] = None,
+    calculate_pv01: bool = False,
+    pv01_curve_name: Optional[str] = None,
+    pv01_bump_bp: float = 1.0,
+    calculate_key_rate_pv01: bool = False,
+    market_id: Optional[str] = None,
+) -> PricingResult:
+    """Price a fixed-float swap and optionally compute PV01 / key-rate PV01."""
+    m = resolve_market(market, market_id)
+    instrument = _swap(swap, m)
+    npv = _price(instrument, m)
+    pv01, key_rate_pv01 = _pv01_measures(
+        m, pv01_curve_name or swap.curve, pv01_bump_bp, calculate_pv01, calculate_key_rate_pv01
+    )
+    risk_measures = _risk_measures(instrument, m, npv, pv01=pv01, key_rate_pv01=key_rate_pv01)
+    return PricingResult(npv=npv, risk_measures=risk_measures)
+
+
+def price_fx_forward(
+    forward: FXForwardInput,
+    market: Optional[MarketInput | Market] = None,
+    calculate_pv01: bool = False,
+    calculate_fx_delta: bool = False,
+    pv01_curve_name: Optional[str] = None,
+    pv01_bump_bp: float = 1.0,
+    fx_delta_pair: Optional[str] = None,
+    fx_delta_bump_pct: float = 0.01,
+    calculate_key_rate_pv01: bool = False,
+    market_id: Optional[str] = None,
+) -> PricingResult:
+    """Price an FX forward (CIP) and optionally compute PV01, key-rate PV01 and FX delta."""
+    m = resolve_market(market, market_id)
+    instrument = _fx_forward(forward, m)
+    npv = _price(instrument, m)
+    pv01, key_rate_pv01 = _pv01_measures(
+        m, pv01_curve_name or forward.quote_curve, pv01_bump_bp,
+        calculate_pv01, calculate_key_rate_pv01,
+    )
+    fx_delta = None
+    if calculate_fx_delta:
+        pair = fx_delta_pair or forward.pair
+        _validate_fx_pair_in_market(m, pair, "FX delta")
+        fx_delta = FXDelta(pair=pair, bump_pct=fx_delta_bump_pct)
+    risk_measures = _risk_measures(
+        instrument, m, npv, pv01=pv01, fx_delta=fx_delta, key_rate_pv01=key_rate_pv01
+    )
+    return PricingResult(npv=npv, risk_measures=risk_measures)
+
+
+def price_mortgage(
+    mortgage: MortgageInput,
+    market: Optional[MarketInput | Market] = None,
+    calculate_pv01: bool = False,
+    pv01_curve_name: Optional[str] = None,
+    pv01_bump_bp: float = 1.0,
+    calculate_key_rate_pv01: bool = False,
+    market_id: Optional[str] = None,
+) -> PricingResult:
+    """Price a level-pay mortgage and optionally compute PV01 / key-rate PV01."""
+    m = resolve_market(market, market_id)
+    instrument = _mortgage(mortgage, m)
+    npv = _price(instrument, m)
+    pv01, key_rate_pv01 = _pv01_measures(
+        m, pv01_curve_name or mortgage.curve, pv01_bump_bp,
+        calculate_pv01, calculate_key_rate_pv01,
+    )
+    risk_measures = _risk_measures(instrument, m, npv, pv01=pv01, key_rate_pv01=key_rate_pv01)
+    return PricingResult(npv=npv, risk_measures=risk_measures)
+
+
+def price_cds(
+    cds: CDSInput,
+    market: Optional[MarketInput | Market] = None,
+    calculate_cs01: bool = False,
+    cs01_hazard_curve_name: Optional[str] = None,
+    cs01_bump_bp: float = 1.0,
+    market_id: Optional[str] = None,
+) -> PricingResult:
+    """Price a single-name CDS and optionally compute CS01."""
+    m = resolve_market(market, market_id)
+    instrument = _cds(cds, m)
+    npv = _price(instrument, m)
+    cs01 = None
     if calculate_cs01:
         hazard_curve_name = cs01_hazard_curve_name or cds.survival_curve
         _validate_curve_in_market(m, hazard_curve_name, "CS01")
-        cs01_val = cs01_parallel(
-            instrument, m, hazard_curve_name, bump_bp=cs01_bump_bp
+        cs01 = CS01Parallel(hazard_curve_name=hazard_curve_name, bump_bp=cs01_bump_bp)
+    return PricingResult(npv=npv, risk_measures=_risk_measures(instrument, m, npv, cs01=cs01))
+
+
+def cashflow_count(
+    product: ZeroCouponBondInput
+    | FixedFloatSwapInput
+    | FXForwardInput
+    | MortgageInput
+    | CDSInput
+    | TradeInput,
+) -> int:
+    """Number of dated cashflows/curve lookups in a product input (cost proxy)."""
+    if isinstance(product, TradeInput):
+        return sum(
+            cashflow_count(p)
+            for p in (
+                product.zero_coupon_bond, product.swap, product.fx_forward,
+                product.mortgage, product.cds,
+            )
+            if p is not None
         )
-        risk_measures = RiskMeasures(pv01=None, fx_delta=None, cs01=cs01_val)
-    return PricingResult(npv=npv, risk_measures=risk_measures)
+    if isinstance(product, (FixedFloatSwapInput, CDSInput)):
+        return len(product.pay_times)
+    if isinstance(product, MortgageInput):
+        return max(0, int(round(product.term_years * product.payments_per_year)))
+    if isinstance(product, FXForwardInput):
+        return 2
+    return 1
+
+
+def request_cost(products: list, valuations: int = 1) -> int:
+    """Estimated work for pricing `products`: total cashflows x valuations per trade."""
+    return sum(cashflow_count(p) for p in products) * max(1, valuations)
+
+
+def market_cost(market: Optional[MarketInput]) -> int:
+    """Estimated work for resolving `market` (fingerprint, parse, build): its number of points."""
+    if market is None:
+        return 0
+    return (
+        sum(len(c.pillars) for c in market.curves)
+        + sum(len(h.pillars) for h in market.hazard_curves or ())
+        + len(market.fx_spot or ())
+    )
+
+
+# GraphQL field name of each TradeInput product -> builder.
+_TRADE_BUILDERS = {
+    "zeroCouponBond": ("zero_coupon_bond", _zero_coupon_bond),
+    "swap": ("swap", _swap),
+    "fxForward": ("fx_forward", _fx_forward),
+    "mortgage": ("mortgage", _mortgage),
+    "cds": ("cds", _cds),
+}
+
+
+def _trade_from_input(trade: TradeInput, m: Market) -> Trade:
+    """Build the instrument for the single product field set on `trade`."""
+    products = [
+        (field, build, getattr(trade, attr))
+        for field, (attr, build) in _TRADE_BUILDERS.items()
+        if getattr(trade, attr) is not None
+    ]
+    if len(products) != 1:
+        raise ValueError(
+            f"exactly one product must be set (one of {', '.join(_TRADE_BUILDERS)}); "
+            f"got {len(products)}"
+        )
+    _, build, product = products[0]
+    return build(product, m)
+
+
+def _instruments_from_inputs(trades: list[TradeInput], m: Market) -> list[Trade]:
+    """Instruments for `trades`; validation errors are prefixed with "trades[i]: "."""
+    instruments: list[Trade] = []
+    for i, trade in enumerate(trades):
+        try:
+            instruments.append(_trade_from_input(trade, m))
+        except ValueError as e:
+            raise ValueError(f"trades[{i}]: {e}") from e
+    return instruments
+
+
+def _portfolio_risk_measures(
+    instrument: Trade,
+    m: Market,
+    npv: float,
+    calculate_pv01: bool,
+    calculate_fx_delta: bool,
+    calculate_cs01: bool,
+    calculate_key_rate_pv01: bool,
+    pv01_bump_bp: float,
+    fx_delta_bump_pct: float,
+    cs01_bump_bp: float,
+) -> Optional[RiskMeasures]:
+    """
+    Risk for one portfolio trade on its natural curves: PV01 on the discount curve
+    (quote curve for FX forwards), FX delta on the forward's pair, CS01 on the CDS
+    survival curve. Measures that do not apply to the product are left null.
+    """
+    if isinstance(instrument, FXForward):
+        discount_curve = instrument.quote_curve
+    elif isinstance(instrument, CDS):
+        discount_curve = instrument.discount_curve
+    else:
+        discount_curve = instrument.curve
+    pv01, key_rate_pv01 = _pv01_measures(
+        m, discount_curve, pv01_bump_bp, calculate_pv01, calculate_key_rate_pv01
+    )
+    fx_delta = None
+    if calculate_fx_delta and isinstance(instrument, FXForward):
+        fx_delta = FXDelta(pair=instrument.pair, bump_pct=fx_delta_bump_pct)
+    cs01 = None
+    if calculate_cs01 and isinstance(instrument, CDS):
+        cs01 = CS01Parallel(hazard_curve_name=instrument.survival_curve, bump_bp=cs01_bump_bp)
+    return _risk_measures(
+        instrument, m, npv,
+        pv01=pv01, fx_delta=fx_delta, cs01=cs01, key_rate_pv01=key_rate_pv01,
+    )
+
+
+def _price_batch_by_type(instruments: list[Trade], m: Market) -> list[float]:
+    """price_batch per instrument type (timed per group); NPVs in input order."""
+    groups: dict[type, list[int]] = {}
+    for i, instrument in enumerate(instruments):
+        groups.setdefault(type(instrument), []).append(i)
+    npvs = [0.0] * len(instruments)
+    for cls, indices in groups.items():
+        with timed(PRICE_BATCH_SECONDS, instrument=cls.__name__):
+            group_npvs = price_batch([instruments[i] for i in indices], m)
+        for i, npv in zip(indices, group_npvs):
+            npvs[i] = npv
+    return npvs
+
+
+def price_portfolio(
+    trades: list[TradeInput],
+    market: Optional[MarketInput | Market] = None,
+    calculate_pv01: bool = False,
+    calculate_fx_delta: bool = False,
+    calculate_cs01: bool = False,
+    calculate_key_rate_pv01: bool = False,
+    pv01_bump_bp: float = 1.0,
+    fx_delta_bump_pct: float = 0.01,
+    cs01_bump_bp: float = 1.0,
+    market_id: Optional[str] = None,
+) -> list[TradeResult]:
+    """
+    Price a heterogeneous list of trades on one market, built once.
+
+    NPVs go through the engine's batch path (one vectorized call per product
+    type); risk reuses each trade's NPV as the base. Results are in input order.
+    Validation errors are prefixed with the offending trade (e.g. "trades[3]: ...").
+    """
+    m = resolve_market(market, market_id)
+    instruments = _instruments_from_inputs(trades, m)
+    npvs = _price_batch_by_type(instruments, m)
+    results: list[TradeResult] = []
+    for i, (trade, instrument, npv) in enumerate(zip(trades, instruments, npvs)):
+        try:
+            risk_measures = _portfolio_risk_measures(
+                instrument, m, npv,
+                calculate_pv01, calculate_fx_delta, calculate_cs01, calculate_key_rate_pv01,
+                pv01_bump_bp, fx_delta_bump_pct, cs01_bump_bp,
+            )
+        except ValueError as e:
+            raise ValueError(f"trades[{i}]: {e}") from e
+        results.append(
+            TradeResult(
+                id=trade.id,
+                product=type(instrument).__name__,
+                npv=npv,
+                risk_measures=risk_measures,
+            )
+        )
+    return results
+
+
+def register_portfolio(
+    trades: list[TradeInput],
+    market: Optional[MarketInput] = None,
+    market_id: Optional[str] = None,
+    calculate_pv01: bool = False,
+    calculate_fx_delta: bool = False,
+    calculate_cs01: bool = False,
+    calculate_key_rate_pv01: bool = False,
+    pv01_bump_bp: float = 1.0,
+    fx_delta_bump_pct: float = 0.01,
+    cs01_bump_bp: float = 1.0,
+) -> PortfolioHandle:
+    """
+    Validate `trades` on their base market and register them for streaming
+    valuation (portfolioPriced) with the given risk options.
+    """
+    if not trades:
+        raise ValueError("trades must not be empty")
+    m = resolve_market(market, market_id)
+    _instruments_from_inputs(trades, m)
+    if market_id is None:
+        market_id = market_id_for(canonical_market_json(market))
+    options = {
+        "calculate_pv01": calculate_pv01,
+        "calculate_fx_delta": calculate_fx_delta,
+        "calculate_cs01": calculate_cs01,
+        "calculate_key_rate_pv01": calculate_key_rate_pv01,
+        "pv01_bump_bp": pv01_bump_bp,
+        "fx_delta_bump_pct": fx_delta_bump_pct,
+        "cs01_bump_bp": cs01_bump_bp,
+    }
+    portfolio_id = portfolio_id_for(trades, market_id, options)
+    valuations = 1 + calculate_pv01 + calculate_fx_delta + calculate_cs01 + calculate_key_rate_pv01
+    portfolio_registry.put(
+        RegisteredPortfolio(
+            portfolio_id=portfolio_id,
+            trades=list(trades),
+            market=m,
+            options=options,
+            cost=request_cost(trades, valuations),
+        )
+    )
+    return PortfolioHandle(
+        portfolio_id=portfolio_id,
+        trade_count=len(trades),
+        curve_names=list(m.curves.keys()),
+    )
@@ -0,0 +1,161 @@
+"""
+Streaming valuation of registered portfolios on live curve ticks (portfolioPriced).
+
+The subscription reads the marketdata `curve_updates:<name>` Redis stream
+directly (binary full/delta or JSON payloads, see pricing.curve_payload): it starts
+from the latest entry, then blocks on XREAD for new ones.
+Each tick overlays the curve on the portfolio's base market (Market.with_curve)
+and reprices the whole portfolio through pricing_executor, so heavy books are
+offloaded like any pricePortfolio request. If several ticks arrived while the
+previous one was being priced, only the newest is priced.
+
+Updates carry each trade's NPV and risk with the change since the previous
+update; `only_changed` drops trades whose NPV did not move (e.g. trades on
+other curves).
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from typing import Optional, Union
+
+from pricing.curve_payload import CurveData, decode
+from pricing.curves import ZeroRateCurve
+
+from app.executor import pricing_executor
+from app.portfolio_registry import RegisteredPortfolio
+from app.redis_client import get_redis
+from app.services import price_portfolio
+from app.types import PortfolioUpdate, RiskMeasures, TradeResult, TradeTick
+
+STREAM_PREFIX = "curve_updates"
+XREAD_BLOCK_MS = 5000
+XREAD_COUNT = 100
+XREVRANGE_COUNT = 100  # recent entries replayed at start (covers the feed's full-snapshot interval)
+
+
+def _zero_rate_curve(data: CurveData) -> Optional[ZeroRateCurve]:
+    try:
+        return ZeroRateCurve(
+            name=data.name,
+            pillars=list(data.pillars),
+            zero_rates_cc=list(data.zero_rates_cc),
+            t0=data.t0,
+        )
+    except ValueError:
+        return None
+
+
+def _entry_id(msg_id: Union[bytes, str]) -> str:
+    return msg_id.decode() if isinstance(msg_id, bytes) else msg_id
+
+
+async def curve_ticks(curve_name: str) -> AsyncIterator[tuple[str, ZeroRateCurve]]:
+    """
+    (stream id, curve) for the latest stream entry, then for the newest entry of each XREAD.
+    Delta payloads (pricing.curve_payload) are applied to the entry they follow, so the start
+    replays the recent entries from the last full snapshot.
+    """
+    redis = await get_redis()
+    stream_key = f"{STREAM_PREFIX}:{curve_name}"
+    last_id: Union[bytes, str] = "$"
+    base: Optional[CurveData] = None
+    recent = await redis.xrevrange(stream_key, count=XREVRANGE_COUNT)
+    if recent:
+        last_id = recent[0][0]
+        for msg_id, fields in reversed(recent):
+            data = decode(fields.get(b"payload") or b"", base)
+            if data is not None:
+                base = data
+        curve = _zero_rate_curve(base) if base is not None else None
+        if curve is not None:
+            yield _entry_id(last_id), curve
+    while True:
+        result = await redis.xread({stream_key: last_id}, block=XREAD_BLOCK_MS, count=XREAD_COUNT)
+        newest: Optional[str] = None
+        for _stream, messages in result or ():
+            for msg_id, fields in messages:
+                last_id = msg_id
+                data = decode(fields.get(b"payload") or b"", base)
+                if data is not None:
+                    base = data
+                    newest = _entry_id(msg_id)
+        if newest is not None and base is not None:
+            curve = _zero_rate_curve(base)
+            if curve is not None:
+                yield newest, curve
+
+
+def _difference(new: Optional[float], old: Optional[float]) -> Optional[float]:
+    return new - old if new is not None and old is not None else None
+
+
+def _risk_deltas(new: Optional[RiskMeasures], old: Optional[RiskMeasures]) -> Optional[RiskMeasures]:
+    """Change in the scalar risk measures (the key-rate ladder is not differenced)."""
+    if new is None or old is None:
+        return None
+    return RiskMeasures(
+        pv01=_difference(new.pv01, old.pv01),
+        fx_delta=_difference(new.fx_delta, old.fx_delta),
+        cs01=_difference(new.cs01, old.cs01),
+    )
+
+
+def portfolio_update(
+    portfolio_id: str,
+    curve_name: str,
+    stream_id: str,
+    tick: int,
+    results: list[TradeResult],
+    previous: Optional[list[TradeResult]],
+    only_changed: bool = False,
+) -> PortfolioUpdate:
+    """PortfolioUpdate for `results`, with deltas against `previous` (None on the first tick)."""
+    trades = []
+    for i, r in enumerate(results):
+        old = previous[i] if previous is not None else None
+        npv_delta = r.npv - old.npv if old is not None else None
+        if only_changed and npv_delta == 0.0:
+            continue
+        trades.append(
+            TradeTick(
+                index=i,
+                id=r.id,
+                product=r.product,
+                npv=r.npv,
+                npv_delta=npv_delta,
+                risk_measures=r.risk_measures,
+                risk_deltas=_risk_deltas(r.risk_measures, old.risk_measures if old else None),
+            )
+        )
+    total = sum(r.npv for r in results)
+    return PortfolioUpdate(
+        portfolio_id=portfolio_id,
+        curve_name=curve_name,
+        stream_id=stream_id,
+        tick=tick,
+        total_npv=total,
+        total_npv_delta=total - sum(r.npv for r in previous) if previous is not None else None,
+        trades=trades,
+    )
+
+
+async def portfolio_updates(
+    portfolio: RegisteredPortfolio, curve_name: str, only_changed: bool = False
+) -> AsyncIterator[PortfolioUpdate]:
+    """Reprice `portfolio` on every tick of `curve_name` and yield the updates."""
+    previous: Optional[list[TradeResult]] = None
+    tick = 0
+    async for stream_id, curve in curve_ticks(curve_name):
+        results = await pricing_executor.run(
+            price_portfolio,
+            portfolio.cost,
+            trades=portfolio.trades,
+            market=portfolio.market.with_curve(curve_name, curve),
+            **portfolio.options,
+        )
+        tick += 1
+        yield portfolio_update(
+            portfolio.portfolio_id, curve_name, stream_id, tick, results, previous, only_changed
+        )
+        previous = results
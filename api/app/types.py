@@ -104,16 +104,37 @@ class CDSInput:
     protection_buyer: bool = True
 
 
+@strawberry.input
+class TradeInput:
+    """One trade in a portfolio request: set exactly one product field. `id` is echoed back."""
+
+    id: Optional[str] = None
+    zero_coupon_bond: Optional[ZeroCouponBondInput] = None
+    swap: Optional[FixedFloatSwapInput] = None
+    fx_forward: Optional[FXForwardInput] = None
+    mortgage: Optional[MortgageInput] = None
+    cds: Optional[CDSInput] = None
+
+
 # --- Output types (response payloads) ---
 
 
+@strawberry.type
+class KeyRateBucket:
+    """One key-rate PV01 bucket: PV change for a bump at a single curve pillar."""
+
+    pillar: float
+    pv01: float
+
+
 @strawberry.type
 class RiskMeasures:
-    """Risk measures: PV01 (parallel curve bump), FX delta (spot bump), CS01 (hazard bump)."""
+    """Risk measures: PV01 (parallel curve bump), FX delta (spot bump), CS01 (hazard bump), key-rate PV01 ladder."""
 
     pv01: Optional[float] = None
     fx_delta: Optional[float] = None
     cs01: Optional[float] = None
+    key_rate_pv01: Optional[list[KeyRateBucket]] = None
 
 
 @strawberry.type
@@ -124,6 +145,60 @@ class PricingResult:
     risk_measures: Optional[RiskMeasures] = None
 
 
+@strawberry.type
+class TradeResult:
+    """Per-trade portfolio result (same order as the input trades)."""
+
+    id: Optional[str]
+    product: str
+    npv: float
+    risk_measures: Optional[RiskMeasures] = None
+
+
+@strawberry.type
+class MarketHandle:
+    """A registered market snapshot: pass `marketId` to pricing queries instead of `market`."""
+
+    market_id: str
+    curve_names: list[str]
+    fx_pairs: list[str]
+
+
+@strawberry.type
+class PortfolioHandle:
+    """A registered portfolio: pass `portfolioId` to the portfolioPriced subscription."""
+
+    portfolio_id: str
+    trade_count: int
+    curve_names: list[str]
+
+
+@strawberry.type
+class TradeTick:
+    """One trade in a portfolio update: values on this tick and changes since the previous one."""
+
+    index: int
+    id: Optional[str]
+    product: str
+    npv: float
+    npv_delta: Optional[float] = None
+    risk_measures: Optional[RiskMeasures] = None
+    risk_deltas: Optional[RiskMeasures] = None
+
+
+@strawberry.type
+class PortfolioUpdate:
+    """Portfolio revalued on one curve tick (deltas are null on the first update)."""
+
+    portfolio_id: str
+    curve_name: str
+    stream_id: str
+    tick: int
+    total_npv: float
+    total_npv_delta: Optional[float]
+    trades: list[TradeTick]
+
+
 @strawberry.type
 class ValidationError:
     """Structured validation error."""
@@ -0,0 +1,6 @@
+"""Load-test harness for the GraphQL pricing API (run with `python -m loadtest`)."""
+
+from loadtest.runner import LoadReport, ScenarioStats, percentile, run_load
+from loadtest.scenarios import DEFAULT_MIX, Scenario
+
+__all__ = ["DEFAULT_MIX", "LoadReport", "Scenario", "ScenarioStats", "percentile", "run_load"]
@@ -0,0 +1,63 @@
+"""
+CLI: python -m loadtest [--url URL] [--concurrency N] [--duration S | --requests N]
+
+Without --url the FastAPI app is driven in-process through httpx's ASGI
+transport (no network, one process). With --url it targets a running server:
+uvicorn on :8000, or traefik in front of the api-backend replicas in
+docker-compose (also http://localhost:8000).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+
+import httpx
+
+from loadtest.runner import LoadReport, run_load
+from loadtest.scenarios import DEFAULT_MIX
+
+
+async def _run(args: argparse.Namespace) -> LoadReport:
+    scenarios = DEFAULT_MIX
+    if args.scenarios:
+        wanted = set(args.scenarios.split(","))
+        scenarios = [s for s in DEFAULT_MIX if s.name in wanted or s.field in wanted]
+        if not scenarios:
+            sys.exit(f"no scenario matches {sorted(wanted)}; have {[s.name for s in DEFAULT_MIX]}")
+    limits = httpx.Limits(max_connections=args.concurrency)
+    kwargs = dict(duration=args.duration, max_requests=args.requests, concurrency=args.concurrency, seed=args.seed)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+            return await run_load(client, scenarios, **kwargs)
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+            return await run_load(client, scenarios, **kwargs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="GraphQL pricing API load test.")
+    parser.add_argument("--url", help="target server (default: the app in-process)")
+    parser.add_argument("--concurrency", type=int, default=10, help="virtual users (default 10)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds (default 30)")
+    parser.add_argument("--requests", type=int, help="stop after this many requests instead of --duration")
+    parser.add_argument("--scenarios", help="comma-separated scenario or field names (default: full mix)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+    if args.requests is not None:
+        args.duration = None
+
+    report = asyncio.run(_run(args))
+    print(json.dumps(report.summary(), indent=2) if args.json else report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Closed-loop load generator: `concurrency` virtual users each send one request,
+wait for the response, then send the next (scenario picked by weight), until
+the duration or request budget runs out. Latency is measured client-side per
+request; a request fails on a transport error, a non-200 status, or GraphQL
+`errors` in the body.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+import httpx
+
+from loadtest.scenarios import MARKET, UPLOAD_MARKET, Scenario
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in [0, 100]) of `values`; 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class ScenarioStats:
+    """Latencies (seconds) of successful requests and the failure count for one scenario."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    last_error: str | None = None
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + self.errors
+
+
+@dataclass
+class LoadReport:
+    elapsed_seconds: float
+    concurrency: int
+    stats: dict[str, ScenarioStats]
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """{scenario: {requests, errors, rps, p50_ms, p99_ms, max_ms}} plus a "total" row."""
+        rows: dict[str, dict[str, float]] = {}
+        everything = ScenarioStats()
+        for name, s in self.stats.items():
+            rows[name] = self._row(s)
+            everything.latencies.extend(s.latencies)
+            everything.errors += s.errors
+        rows["total"] = self._row(everything)
+        return rows
+
+    def _row(self, s: ScenarioStats) -> dict[str, float]:
+        elapsed = self.elapsed_seconds or float("inf")
+        return {
+            "requests": s.requests,
+            "errors": s.errors,
+            "rps": len(s.latencies) / elapsed,
+            "p50_ms": percentile(s.latencies, 50) * 1e3,
+            "p99_ms": percentile(s.latencies, 99) * 1e3,
+            "max_ms": max(s.latencies, default=0.0) * 1e3,
+        }
+
+    def format(self) -> str:
+        lines = [
+            f"{self.concurrency} users, {self.elapsed_seconds:.1f}s",
+            f"{'scenario':<24}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}",
+        ]
+        for name, row in self.summary().items():
+            lines.append(
+                f"{name:<24}{row['requests']:>9.0f}{row['errors']:>8.0f}{row['rps']:>9.1f}"
+                f"{row['p50_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}"
+            )
+        for name, s in self.stats.items():
+            if s.last_error:
+                lines.append(f"last error in {name}: {s.last_error}")
+        return "\n".join(lines)
+
+
+async def upload_market(client: httpx.AsyncClient) -> str:
+    """Register the load-test market and return its marketId."""
+    response = await client.post("/graphql", json={"query": UPLOAD_MARKET, "variables": {"market": MARKET}})
+    response.raise_for_status()
+    body = response.json()
+    if body.get("errors"):
+        raise RuntimeError(f"uploadMarket failed: {body['errors']}")
+    return body["data"]["uploadMarket"]["marketId"]
+
+
+async def _send(client: httpx.AsyncClient, scenario: Scenario, market_id: str | None, stats: ScenarioStats) -> None:
+    started = time.perf_counter()
+    try:
+        response = await client.post("/graphql", json=scenario.payload(market_id))
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            error = f"HTTP {response.status_code}"
+        else:
+            errors = response.json().get("errors")
+            error = errors[0].get("message", str(errors[0])) if errors else None
+    except httpx.HTTPError as e:
+        elapsed, error = time.perf_counter() - started, f"{type(e).__name__}: {e}"
+    if error is None:
+        stats.latencies.append(elapsed)
+    else:
+        stats.errors += 1
+        stats.last_error = error
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    scenarios: Sequence[Scenario],
+    concurrency: int = 10,
+    duration: float | None = 30.0,
+    max_requests: int | None = None,
+    seed: int = 0,
+) -> LoadReport:
+    """Drive `scenarios` through `client` until `duration` seconds or `max_requests` requests."""
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    if duration is None and max_requests is None:
+        raise ValueError("set a duration or max_requests")
+    market_id = await upload_market(client) if any(s.by_market_id for s in scenarios) else None
+    rng = random.Random(seed)
+    weights = [s.weight for s in scenarios]
+    stats = {s.name: ScenarioStats() for s in scenarios}
+    started = time.perf_counter()
+    deadline = started + duration if duration is not None else math.inf
+    budget = [max_requests if max_requests is not None else math.inf]
+
+    async def user() -> None:
+        while time.perf_counter() < deadline and budget[0] > 0:
+            budget[0] -= 1
+            scenario = rng.choices(scenarios, weights)[0]
+            await _send(client, scenario, market_id, stats[scenario.name])
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return LoadReport(time.perf_counter() - started, concurrency, stats)
@@ -0,0 +1,132 @@
+"""
+Query mix for the load test: the payload shapes of tests/test_graphql_pricing.py,
+with a realistic market (discount, EUR and hazard curves) sent as GraphQL variables.
+
+Each Scenario is one request template; `weight` sets how often it is picked.
+Scenarios marked `by_market_id` reference the market uploaded in setup via
+`marketId` and also send the full market, so a replica that has not seen the
+upload (behind traefik) registers it instead of failing.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+MARKET: dict[str, Any] = {
+    "curves": [
+        {
+            "name": "USD_DISC",
+            "pillars": [0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 20.0, 30.0],
+            "zeroRatesCc": [0.046, 0.045, 0.043, 0.040, 0.039, 0.038, 0.0375, 0.037, 0.0365, 0.036],
+        },
+        {
+            "name": "EUR_DISC",
+            "pillars": [0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 20.0, 30.0],
+            "zeroRatesCc": [0.036, 0.035, 0.034, 0.032, 0.031, 0.030, 0.0295, 0.029, 0.0285, 0.028],
+        },
+    ],
+    "hazardCurves": [
+        {"name": "CORP_HAZ", "pillars": [1.0, 3.0, 5.0, 7.0, 10.0], "hazardRates": [0.010, 0.012, 0.014, 0.015, 0.016]}
+    ],
+    "fxSpot": [{"pair": "EURUSD", "spot": 1.08}],
+}
+
+_SEMI_10Y = [0.5 * (i + 1) for i in range(20)]
+_QUARTERLY_5Y = [0.25 * (i + 1) for i in range(20)]
+
+ZERO_COUPON_BOND = {"curve": "USD_DISC", "maturity": 2.0, "notional": 1_000_000}
+SWAP = {"curve": "USD_DISC", "notional": 10_000_000, "fixedRate": 0.04, "payTimes": _SEMI_10Y}
+FX_FORWARD = {
+    "pair": "EURUSD", "baseCurve": "EUR_DISC", "quoteCurve": "USD_DISC",
+    "maturity": 1.0, "notionalBase": 5_000_000, "strike": 1.085,
+}
+MORTGAGE = {"curve": "USD_DISC", "notional": 500_000, "annualRate": 0.06, "termYears": 30.0, "paymentsPerYear": 12}
+CDS = {
+    "discountCurve": "USD_DISC", "survivalCurve": "CORP_HAZ",
+    "notional": 10_000_000, "premiumRate": 0.01, "payTimes": _QUARTERLY_5Y,
+}
+
+
+def portfolio_trades(n: int) -> list[dict[str, Any]]:
+    """n TradeInputs cycling through the five products."""
+    products = [
+        ("zeroCouponBond", ZERO_COUPON_BOND),
+        ("swap", SWAP),
+        ("fxForward", FX_FORWARD),
+        ("mortgage", MORTGAGE),
+        ("cds", CDS),
+    ]
+    return [
+        {"id": f"t{i}", products[i % len(products)][0]: products[i % len(products)][1]}
+        for i in range(n)
+    ]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One GraphQL request template; `name` labels it in the report."""
+
+    name: str
+    field: str
+    query: str
+    variables: dict[str, Any] = field(default_factory=dict)
+    weight: float = 1.0
+    by_market_id: bool = False
+
+    def payload(self, market_id: str | None = None) -> dict[str, Any]:
+        variables = dict(self.variables)
+        if self.by_market_id:
+            variables["marketId"] = market_id
+        return {"query": self.query, "variables": variables}
+
+
+def _query(field_name: str, arg: str, arg_type: str, flags: str, selection: str) -> str:
+    return (
+        f"query($market: MarketInput, $marketId: String, ${arg}: {arg_type}!) {{\n"
+        f"  {field_name}({arg}: ${arg}, market: $market, marketId: $marketId{flags}) {{ {selection} }}\n"
+        "}"
+    )
+
+
+_RISK = "npv riskMeasures { pv01 fxDelta cs01 keyRatePv01 { pillar pv01 } }"
+
+UPLOAD_MARKET = "mutation($market: MarketInput!) { uploadMarket(market: $market) { marketId } }"
+
+DEFAULT_MIX: list[Scenario] = [
+    Scenario(
+        "priceZeroCouponBond", "priceZeroCouponBond",
+        _query("priceZeroCouponBond", "bond", "ZeroCouponBondInput", ", calculatePv01: true", _RISK),
+        {"bond": ZERO_COUPON_BOND, "market": MARKET}, weight=3,
+    ),
+    Scenario(
+        "priceSwap", "priceSwap",
+        _query("priceSwap", "swap", "FixedFloatSwapInput", ", calculatePv01: true, calculateKeyRatePv01: true", _RISK),
+        {"swap": SWAP, "market": MARKET}, weight=3,
+    ),
+    Scenario(
+        "priceFxForward", "priceFxForward",
+        _query("priceFxForward", "forward", "FXForwardInput", ", calculatePv01: true, calculateFxDelta: true", _RISK),
+        {"forward": FX_FORWARD, "market": MARKET}, weight=2,
+    ),
+    Scenario(
+        "priceMortgage", "priceMortgage",
+        _query("priceMortgage", "mortgage", "MortgageInput", ", calculatePv01: true", _RISK),
+        {"mortgage": MORTGAGE, "market": MARKET}, weight=1,
+    ),
+    Scenario(
+        "priceCds", "priceCds",
+        _query("priceCds", "cds", "CDSInput", ", calculateCs01: true", _RISK),
+        {"cds": CDS, "market": MARKET}, weight=1,
+    ),
+    Scenario(
+        "priceSwap[marketId]", "priceSwap",
+        _query("priceSwap", "swap", "FixedFloatSwapInput", ", calculatePv01: true", _RISK),
+        {"swap": SWAP, "market": MARKET}, weight=2, by_market_id=True,
+    ),
+    Scenario(
+        "pricePortfolio[50]", "pricePortfolio",
+        _query("pricePortfolio", "trades", "[TradeInput!]", ", calculatePv01: true, calculateFxDelta: true, calculateCs01: true", "id " + _RISK),
+        {"trades": portfolio_trades(50), "market": MARKET}, weight=0.5,
+    ),
+]
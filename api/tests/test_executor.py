@@ -0,0 +1,86 @@
+"""Tests for off-loop pricing execution (process pool / thread) and its cost model."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.executor import EXECUTOR_WAIT_SECONDS, PricingExecutor
+from app.services import market_cost, price_portfolio, price_swap, request_cost, resolve_market
+from app.types import (
+    CurveInput,
+    FixedFloatSwapInput,
+    MarketInput,
+    MortgageInput,
+    TradeInput,
+    ZeroCouponBondInput,
+)
+
+_MARKET = MarketInput(
+    curves=[CurveInput(name="USD", pillars=[0.5, 1.0, 2.0, 5.0], zero_rates_cc=[0.045, 0.043, 0.04, 0.038])]
+)
+_SWAP = FixedFloatSwapInput(curve="USD", notional=1e7, fixed_rate=0.04, pay_times=[0.5 * i for i in range(1, 11)])
+
+
+def test_request_cost_counts_cashflows_and_valuations():
+    mortgage = MortgageInput(curve="USD", notional=1e5, annual_rate=0.05, term_years=30, payments_per_year=12)
+    bond = ZeroCouponBondInput(curve="USD", maturity=2.0, notional=1e6)
+    assert request_cost([_SWAP]) == 10
+    assert request_cost([mortgage], 2) == 720
+    trades = [TradeInput(swap=_SWAP), TradeInput(zero_coupon_bond=bond), TradeInput(mortgage=mortgage)]
+    assert request_cost(trades, 3) == (10 + 1 + 360) * 3
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_offloaded_result_matches_inline(workers):
+    """Heavy requests give the same result in a worker process / thread as inline."""
+    market = resolve_market(_MARKET, None)
+    kwargs = dict(swap=_SWAP, market=market, calculate_pv01=True)
+    inline = price_swap(**kwargs)
+    executor = PricingExecutor(workers=workers, min_cost=1)
+    before = EXECUTOR_WAIT_SECONDS.count()
+    try:
+        result = asyncio.run(executor.run(price_swap, request_cost([_SWAP], 2), **kwargs))
+    finally:
+        executor.shutdown()
+    assert result.npv == inline.npv
+    assert result.risk_measures.pv01 == inline.risk_measures.pv01
+    assert EXECUTOR_WAIT_SECONDS.count() == before + 1
+    assert executor.inflight == 0
+
+
+def test_offloaded_validation_errors_propagate():
+    market = resolve_market(_MARKET, None)
+    executor = PricingExecutor(workers=1, min_cost=0)
+    try:
+        with pytest.raises(ValueError, match=r"trades\[0\]"):
+            asyncio.run(
+                executor.run(
+                    price_portfolio, 1,
+                    trades=[TradeInput(zero_coupon_bond=ZeroCouponBondInput(curve="EUR", maturity=1.0, notional=1.0))],
+                    market=market,
+                )
+            )
+    finally:
+        executor.shutdown()
+
+
+def test_market_resolution_runs_off_loop_above_min_cost():
+    """resolve() keeps the market in this process: inline when cheap, in a thread when heavy."""
+    executor = PricingExecutor(workers=0, min_cost=10)
+    loop_thread = []
+
+    def resolve(**kwargs):
+        loop_thread.append(threading.current_thread() is threading.main_thread())
+        return resolve_market(**kwargs)
+
+    async def run():
+        cheap = await executor.resolve(resolve, 0, market=_MARKET, market_id=None)
+        heavy = await executor.resolve(resolve, market_cost(_MARKET) * 10, market=_MARKET, market_id=None)
+        return cheap, heavy
+
+    cheap, heavy = asyncio.run(run())
+    assert market_cost(_MARKET) == 4 and market_cost(None) == 0
+    assert loop_thread == [True, False]
+    assert heavy is cheap  # same process-local market cache
+    executor.shutdown()
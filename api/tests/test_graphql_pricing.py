@@ -233,6 +233,121 @@ def test_price_fx_forward_missing_quote_curve_returns_error():
     assert any("quote" in e["message"].lower() or "usd_disc" in e["message"].lower() for e in data["errors"])
 
 
+def test_price_zero_coupon_bond_key_rate_pv01_ladder():
+    """Key-rate PV01 ladder: one bucket per pillar, summing to the parallel PV01."""
+    query = """
+    query {
+      priceZeroCouponBond(
+        bond: { curve: "USD_DISC", maturity: 3.0, notional: 1000000 }
+        market: {
+          curves: [{
+            name: "USD_DISC"
+            pillars: [0.5, 1.0, 2.0, 5.0, 10.0]
+            zeroRatesCc: [0.045, 0.043, 0.040, 0.038, 0.037]
+          }]
+        }
+        calculatePv01: true
+        calculateKeyRatePv01: true
+      ) {
+        npv
+        riskMeasures {
+          pv01
+          keyRatePv01 { pillar pv01 }
+        }
+      }
+    }
+    """
+    response = client.post("/graphql", json={"query": query})
+    assert response.status_code == 200
+    data = response.json()
+    assert "errors" not in data
+    risk = data["data"]["priceZeroCouponBond"]["riskMeasures"]
+    ladder = risk["keyRatePv01"]
+    assert [b["pillar"] for b in ladder] == [0.5, 1.0, 2.0, 5.0, 10.0]
+    # 3Y sits between the 2Y and 5Y pillars only.
+    assert [b["pv01"] == 0.0 for b in ladder] == [True, True, False, False, True]
+    assert abs(sum(b["pv01"] for b in ladder) - risk["pv01"]) < 1e-6
+
+
+_PORTFOLIO_MARKET = """
+        market: {
+          curves: [
+            { name: "EUR_DISC", pillars: [0.5, 1.0, 2.0, 5.0, 10.0], zeroRatesCc: [0.040, 0.038, 0.036, 0.034, 0.033] }
+            { name: "USD_DISC", pillars: [0.5, 1.0, 2.0, 5.0, 10.0], zeroRatesCc: [0.045, 0.043, 0.040, 0.038, 0.037] }
+          ]
+          hazardCurves: [{ name: "CORP_HAZ", pillars: [0.5, 1.0, 2.0, 5.0, 10.0], hazardRates: [0.01, 0.01, 0.01, 0.01, 0.01] }]
+          fxSpot: [{ pair: "EURUSD", spot: 1.08 }]
+        }
+"""
+
+
+def test_price_portfolio_matches_single_fields():
+    """pricePortfolio returns per-trade results (input order) matching the single-trade fields."""
+    query = """
+    query {
+      pricePortfolio(
+        %s
+        trades: [
+          { id: "zcb", zeroCouponBond: { curve: "USD_DISC", maturity: 2.0, notional: 1000000 } }
+          { id: "fx", fxForward: { pair: "EURUSD", baseCurve: "EUR_DISC", quoteCurve: "USD_DISC", maturity: 1.0, notionalBase: 5000000, strike: 1.085 } }
+          { id: "cds", cds: { discountCurve: "USD_DISC", survivalCurve: "CORP_HAZ", notional: 10000000, premiumRate: 0.01, payTimes: [0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0] } }
+          { id: "zcb2", zeroCouponBond: { curve: "EUR_DISC", maturity: 5.0, notional: 500000 } }
+        ]
+        calculatePv01: true
+        calculateFxDelta: true
+        calculateCs01: true
+      ) {
+        id
+        product
+        npv
+        riskMeasures { pv01 fxDelta cs01 }
+      }
+    }
+    """ % _PORTFOLIO_MARKET
+    response = client.post("/graphql", json={"query": query})
+    assert response.status_code == 200
+    data = response.json()
+    assert "errors" not in data
+    results = data["data"]["pricePortfolio"]
+    assert [r["id"] for r in results] == ["zcb", "fx", "cds", "zcb2"]
+    assert [r["product"] for r in results] == ["ZeroCouponBond", "FXForward", "CDS", "ZeroCouponBond"]
+    zcb, fx, cds, _ = results
+    assert abs(zcb["npv"] - 923_116.35) < 1.0
+    assert abs(zcb["riskMeasures"]["pv01"] - (-184.60)) < 1.0
+    assert zcb["riskMeasures"]["fxDelta"] is None and zcb["riskMeasures"]["cs01"] is None
+    assert abs(fx["npv"] - 1_980.59) < 10.0
+    assert abs(fx["riskMeasures"]["fxDelta"] - 4_813_564.70) < 10_000.0
+    assert abs(cds["npv"] - (-171_924.01)) < 500.0
+    assert cds["riskMeasures"]["cs01"] is not None
+
+
+def test_price_portfolio_reports_offending_trade():
+    """Validation errors name the trade index; trades must set exactly one product."""
+    query = """
+    query {
+      pricePortfolio(
+        %s
+        trades: [
+          { zeroCouponBond: { curve: "USD_DISC", maturity: 2.0, notional: 1000000 } }
+          { zeroCouponBond: { curve: "MISSING", maturity: 2.0, notional: 1000000 } }
+        ]
+      ) { npv }
+    }
+    """ % _PORTFOLIO_MARKET
+    data = client.post("/graphql", json={"query": query}).json()
+    assert "errors" in data
+    assert any("trades[1]" in e["message"] and "MISSING" in e["message"] for e in data["errors"])
+
+    query = """
+    query {
+      pricePortfolio(%s trades: [{ id: "empty" }]) { npv }
+    }
+    """ % _PORTFOLIO_MARKET
+    data = client.post("/graphql", json={"query": query}).json()
+    assert "errors" in data
+    assert any("trades[0]" in e["message"] and "exactly one product" in e["message"] for e in data["errors"])
+
+
 def test_hello_and_version():
     """Legacy hello and version queries still work."""
     response = client.post(
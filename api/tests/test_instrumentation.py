@@ -0,0 +1,103 @@
+"""Tests for per-stage latency histograms and their exposure on /metrics."""
+
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from strawberry.types.graphql import OperationType
+
+from app.executor import PricingExecutor
+from app.instrumentation import GRAPHQL_STAGE_SECONDS, GraphQLStageTimer, PRICE_BATCH_SECONDS, PRICE_SECONDS, RISK_SECONDS
+from app.main import app
+from app.metrics import Histogram, MetricsRegistry, capture_observations, replay_observations
+from app.services import price_swap, resolve_market
+from app.types import CurveInput, FixedFloatSwapInput, MarketInput
+
+
+client = TestClient(app)
+
+_MARKET = """
+{ curves: [{ name: "USD_DISC", pillars: [0.5, 1.0, 2.0, 5.0], zeroRatesCc: [0.045, 0.043, 0.040, 0.038] }] }
+"""
+
+
+def test_histogram_text_format():
+    registry = MetricsRegistry()
+    h = Histogram("t_seconds", "test", labelnames=("kind",), buckets=(0.1, 1.0), registry=registry)
+    h.observe(0.05, kind="a")
+    h.observe(0.5, kind="a")
+    lines = registry.render().splitlines()
+    assert "# TYPE t_seconds histogram" in lines
+    assert 't_seconds_bucket{kind="a",le="0.1"} 1.0' in lines
+    assert 't_seconds_bucket{kind="a",le="1.0"} 2.0' in lines
+    assert 't_seconds_bucket{kind="a",le="+Inf"} 2.0' in lines
+    assert 't_seconds_count{kind="a"} 2.0' in lines
+
+
+def test_captured_observations_are_replayed():
+    registry = MetricsRegistry()
+    h = Histogram("c_seconds", "test", registry=registry)
+    with capture_observations() as observations:
+        h.observe(0.2)
+    assert h.count() == 0 and len(observations) == 1
+    replay_observations(observations, registry)
+    assert h.count() == 1
+
+
+def test_request_records_stage_price_and_risk_histograms():
+    before = (
+        GRAPHQL_STAGE_SECONDS.count(stage="parse"),
+        PRICE_SECONDS.count(instrument="ZeroCouponBond"),
+        RISK_SECONDS.count(measure="PV01Parallel", instrument="ZeroCouponBond"),
+        RISK_SECONDS.count(measure="KeyRatePV01", instrument="ZeroCouponBond"),
+        PRICE_BATCH_SECONDS.count(instrument="ZeroCouponBond"),
+    )
+    query = """
+    query {
+      priceZeroCouponBond(
+        bond: { curve: "USD_DISC", maturity: 2.0, notional: 1000000 }
+        market: %s
+        calculatePv01: true
+        calculateKeyRatePv01: true
+      ) { npv }
+      pricePortfolio(
+        market: %s
+        trades: [{ zeroCouponBond: { curve: "USD_DISC", maturity: 1.0, notional: 1 } }]
+      ) { npv }
+    }
+    """ % (_MARKET, _MARKET)
+    assert "errors" not in client.post("/graphql", json={"query": query}).json()
+    after = (
+        GRAPHQL_STAGE_SECONDS.count(stage="parse"),
+        PRICE_SECONDS.count(instrument="ZeroCouponBond"),
+        RISK_SECONDS.count(measure="PV01Parallel", instrument="ZeroCouponBond"),
+        RISK_SECONDS.count(measure="KeyRatePV01", instrument="ZeroCouponBond"),
+        PRICE_BATCH_SECONDS.count(instrument="ZeroCouponBond"),
+    )
+    assert [a - b for a, b in zip(after, before)] == [1, 1, 1, 1, 1]
+    text = client.get("/metrics").text
+    assert 'pricing_api_risk_seconds_count{measure="PV01Parallel",instrument="ZeroCouponBond"}' in text
+
+
+def test_subscription_execute_stage_is_not_timed():
+    timer = GraphQLStageTimer()
+    before = GRAPHQL_STAGE_SECONDS.count(stage="execute")
+    for operation_type in (OperationType.SUBSCRIPTION, OperationType.QUERY):
+        timer.execution_context = SimpleNamespace(operation_type=operation_type)
+        for _ in timer.on_execute():
+            pass
+    assert GRAPHQL_STAGE_SECONDS.count(stage="execute") == before + 1
+
+
+def test_offloaded_work_is_timed_in_server_registry():
+    market = resolve_market(
+        MarketInput(curves=[CurveInput(name="USD", pillars=[1.0, 5.0], zero_rates_cc=[0.04, 0.04])]), None
+    )
+    swap = FixedFloatSwapInput(curve="USD", notional=1e6, fixed_rate=0.04, pay_times=[1.0, 2.0])
+    before = PRICE_SECONDS.count(instrument="FixedFloatSwap")
+    executor = PricingExecutor(workers=1, min_cost=0)
+    try:
+        asyncio.run(executor.run(price_swap, 1, swap=swap, market=market))
+    finally:
+        executor.shutdown()
+    assert PRICE_SECONDS.count(instrument="FixedFloatSwap") == before + 1
@@ -0,0 +1,39 @@
+"""Tests for the load-test harness (in-process against the app)."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app
+from loadtest import DEFAULT_MIX, percentile, run_load
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_run_load_in_process_covers_mix_without_errors():
+    """A short run over the default mix succeeds and reports every scenario plus a total."""
+
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await run_load(client, DEFAULT_MIX, concurrency=4, duration=None, max_requests=40)
+
+    report = asyncio.run(go())
+    summary = report.summary()
+    assert summary["total"]["requests"] == 40
+    assert summary["total"]["errors"] == 0
+    assert set(summary) == {s.name for s in DEFAULT_MIX} | {"total"}
+    assert summary["total"]["p99_ms"] >= summary["total"]["p50_ms"] > 0
+
+
+def test_run_load_requires_a_stop_condition():
+    with pytest.raises(ValueError, match="duration or max_requests"):
+        asyncio.run(run_load(httpx.AsyncClient(), DEFAULT_MIX, duration=None))
@@ -0,0 +1,57 @@
+"""Tests for the parsed-market cache and the /metrics endpoint."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.market_cache import MarketCache, market_cache
+from app.services import market_from_input
+from app.types import CurveInput, MarketInput
+
+
+client = TestClient(app)
+
+
+def _market(rate: float) -> MarketInput:
+    return MarketInput(curves=[CurveInput(name="USD", pillars=[1.0, 2.0], zero_rates_cc=[rate, rate])])
+
+
+def test_cache_reuses_market_for_equal_input_and_evicts_lru():
+    cache = MarketCache(max_entries=2)
+    a = cache.get_or_build(_market(0.04), market_from_input)
+    assert cache.get_or_build(_market(0.04), market_from_input) is a
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.get_or_build(_market(0.05), market_from_input)
+    cache.get_or_build(_market(0.04), market_from_input)  # refresh 0.04
+    cache.get_or_build(_market(0.06), market_from_input)  # evicts 0.05
+    assert len(cache) == 2
+    assert cache.get_or_build(_market(0.04), market_from_input) is a
+    cache.get_or_build(_market(0.05), market_from_input)
+    assert (cache.hits, cache.misses) == (3, 4)
+
+
+def test_disabled_cache_always_builds():
+    cache = MarketCache(max_entries=0)
+    a = cache.get_or_build(_market(0.04), market_from_input)
+    assert cache.get_or_build(_market(0.04), market_from_input) is not a
+    assert (cache.hits, cache.misses, len(cache)) == (0, 2, 0)
+
+
+def test_metrics_endpoint_reports_cache_hits():
+    market_cache.clear()
+    query = """
+    query {
+      priceZeroCouponBond(
+        bond: { curve: "USD_DISC", maturity: 2.0, notional: 1000000 }
+        market: { curves: [{ name: "USD_DISC", pillars: [1.0, 2.0], zeroRatesCc: [0.04, 0.04] }] }
+      ) { npv }
+    }
+    """
+    for _ in range(3):
+        assert "errors" not in client.post("/graphql", json={"query": query}).json()
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert "# TYPE pricing_api_market_cache_hits_total counter" in lines
+    assert "pricing_api_market_cache_hits_total 2.0" in lines
+    assert "pricing_api_market_cache_misses_total 1.0" in lines
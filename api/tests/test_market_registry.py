@@ -0,0 +1,120 @@
+"""Tests for the market snapshot registry and the uploadMarket / marketId flow."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.market_registry import MarketRegistry, canonical_market_json, market_id_for, market_registry
+from app.types import CurveInput, FxSpotInput, MarketInput
+from pricing.market import Market
+
+
+client = TestClient(app)
+
+_MARKET = """
+{
+  curves: [{
+    name: "USD_DISC"
+    pillars: [0.5, 1.0, 2.0, 5.0, 10.0]
+    zeroRatesCc: [0.045, 0.043, 0.040, 0.038, 0.037]
+  }]
+}
+"""
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_market_id_is_content_hash_independent_of_curve_order():
+    usd = CurveInput(name="USD", pillars=[1.0], zero_rates_cc=[0.04])
+    eur = CurveInput(name="EUR", pillars=[1.0], zero_rates_cc=[0.03])
+    a = MarketInput(curves=[usd, eur], fx_spot=[FxSpotInput(pair="EURUSD", spot=1.1)])
+    b = MarketInput(curves=[eur, usd], fx_spot=[FxSpotInput(pair="EURUSD", spot=1.1)])
+    c = MarketInput(curves=[eur, usd], fx_spot=[FxSpotInput(pair="EURUSD", spot=1.2)])
+    assert market_id_for(canonical_market_json(a)) == market_id_for(canonical_market_json(b))
+    assert market_id_for(canonical_market_json(a)) != market_id_for(canonical_market_json(c))
+
+
+def test_registry_lru_eviction_by_count_and_bytes():
+    registry = MarketRegistry(max_entries=2, max_bytes=100)
+    registry.put("a", Market(), 10)
+    registry.put("b", Market(), 10)
+    assert registry.get("a") is not None  # a is now most recent
+    registry.put("c", Market(), 10)
+    assert registry.get("b") is None
+    assert registry.get("a") is not None and registry.get("c") is not None
+    registry.put("d", Market(), 95)
+    assert len(registry) == 1 and registry.total_bytes == 95
+    with pytest.raises(ValueError):
+        registry.put("e", Market(), 101)
+
+
+def test_registry_ttl_is_refreshed_on_use():
+    clock = _Clock()
+    registry = MarketRegistry(ttl_seconds=10.0, clock=clock)
+    registry.put("a", Market(), 1)
+    registry.put("b", Market(), 1)
+    clock.now = 8.0
+    assert registry.get("a") is not None
+    clock.now = 12.0
+    assert registry.get("b") is None
+    assert registry.get("a") is not None
+    clock.now = 30.0
+    assert registry.get("a") is None
+    assert registry.total_bytes == 0
+
+
+def test_upload_market_then_price_by_market_id():
+    market_registry.clear()
+    upload = client.post(
+        "/graphql",
+        json={"query": "mutation { uploadMarket(market: %s) { marketId curveNames fxPairs } }" % _MARKET},
+    ).json()
+    assert "errors" not in upload
+    handle = upload["data"]["uploadMarket"]
+    assert handle["curveNames"] == ["USD_DISC"] and handle["fxPairs"] == []
+    query = """
+    query($marketId: String) {
+      priceZeroCouponBond(
+        bond: { curve: "USD_DISC", maturity: 2.0, notional: 1000000 }
+        marketId: $marketId
+        calculatePv01: true
+      ) { npv riskMeasures { pv01 } }
+    }
+    """
+    data = client.post("/graphql", json={"query": query, "variables": {"marketId": handle["marketId"]}}).json()
+    assert "errors" not in data
+    assert abs(data["data"]["priceZeroCouponBond"]["npv"] - 923_116.35) < 1.0
+
+
+def test_unknown_market_id_errors_unless_market_is_sent():
+    market_registry.clear()
+    query = """
+    query($marketId: String) {
+      priceZeroCouponBond(
+        bond: { curve: "USD_DISC", maturity: 2.0, notional: 1000000 }
+        marketId: $marketId
+        %s
+      ) { npv }
+    }
+    """
+    data = client.post("/graphql", json={"query": query % "", "variables": {"marketId": "nope"}}).json()
+    assert "errors" in data
+    assert any("not found" in e["message"] for e in data["errors"])
+
+    upload = client.post(
+        "/graphql", json={"query": "mutation { uploadMarket(market: %s) { marketId } }" % _MARKET}
+    ).json()
+    market_id = upload["data"]["uploadMarket"]["marketId"]
+    market_registry.clear()
+    with_market = query % ("market: " + _MARKET)
+    data = client.post("/graphql", json={"query": with_market, "variables": {"marketId": market_id}}).json()
+    assert "errors" not in data
+    assert len(market_registry) == 1
+    data = client.post("/graphql", json={"query": with_market, "variables": {"marketId": "0" * 64}}).json()
+    assert any("does not match" in e["message"] for e in data["errors"])
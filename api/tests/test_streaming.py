@@ -0,0 +1,234 @@
+"""Tests for registerPortfolio and the portfolioPriced subscription (Redis stream faked)."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from pricing.curve_payload import CurveData, encode_delta, encode_full
+
+from app import streaming
+from app.main import app
+from app.schema import schema
+from app.services import price_portfolio
+from app.types import CurveInput, FxSpotInput, MarketInput, TradeInput, ZeroCouponBondInput
+
+
+client = TestClient(app)
+
+_PILLARS = [0.5, 1.0, 2.0, 5.0, 10.0]
+_USD_RATES = [0.045, 0.043, 0.040, 0.038, 0.037]
+
+_REGISTER = """
+mutation Register($trades: [TradeInput!]!) {
+  registerPortfolio(
+    trades: $trades
+    market: {
+      curves: [
+        {name: "USD_DISC", pillars: [0.5, 1.0, 2.0, 5.0, 10.0], zeroRatesCc: [0.045, 0.043, 0.040, 0.038, 0.037]}
+        {name: "EUR_DISC", pillars: [1.0, 5.0], zeroRatesCc: [0.03, 0.031]}
+      ]
+      fxSpot: [{pair: "EURUSD", spot: 1.08}]
+    }
+    calculatePv01: true
+  ) {
+    portfolioId
+    tradeCount
+    curveNames
+  }
+}
+"""
+
+_TRADES = [
+    {"id": "zcb", "zeroCouponBond": {"curve": "USD_DISC", "maturity": 2.0, "notional": 1000000}},
+    {"id": "eur", "zeroCouponBond": {"curve": "EUR_DISC", "maturity": 3.0, "notional": 1000000}},
+]
+
+_SUBSCRIPTION = """
+subscription Priced($portfolioId: String!, $onlyChanged: Boolean!) {
+  portfolioPriced(portfolioId: $portfolioId, curveName: "USD_DISC", onlyChanged: $onlyChanged) {
+    streamId
+    tick
+    totalNpv
+    totalNpvDelta
+    trades { index id npv npvDelta riskMeasures { pv01 } riskDeltas { pv01 } }
+  }
+}
+"""
+
+
+def _payload(rates: list[float]) -> dict[bytes, bytes]:
+    """Legacy JSON stream entry."""
+    return {b"payload": json.dumps({"name": "USD_DISC", "pillars": _PILLARS, "zero_rates_cc": rates, "t0": 0.0}).encode()}
+
+
+def _curve(rates: list[float], seq: int) -> CurveData:
+    return CurveData(name="USD_DISC", pillars=tuple(_PILLARS), zero_rates_cc=tuple(rates), seq=seq)
+
+
+class _FakeRedis:
+    """Stream with one existing entry; each XREAD returns the next queued batch, then blocks."""
+
+    def __init__(self, latest: list, batches: list[list]) -> None:
+        self.latest = latest
+        self.batches = list(batches)
+        self.read_from: list[str] = []
+
+    async def xrevrange(self, key: str, count: int = 1) -> list:
+        return list(reversed(self.latest))[:count]
+
+    async def xread(self, streams: dict, block: int = 0, count: int = 1) -> list:
+        (key, last_id), = streams.items()
+        self.read_from.append(last_id)
+        if not self.batches:
+            await asyncio.sleep(3600)
+        return [(key, self.batches.pop(0))]
+
+
+def _register() -> str:
+    response = client.post("/graphql", json={"query": _REGISTER, "variables": {"trades": _TRADES}})
+    data = response.json()
+    assert "errors" not in data, data
+    handle = data["data"]["registerPortfolio"]
+    assert handle["tradeCount"] == 2
+    assert set(handle["curveNames"]) == {"USD_DISC", "EUR_DISC"}
+    return handle["portfolioId"]
+
+
+async def _collect(portfolio_id: str, n: int, only_changed: bool = False) -> list:
+    stream = await schema.subscribe(
+        _SUBSCRIPTION, variable_values={"portfolioId": portfolio_id, "onlyChanged": only_changed}
+    )
+    updates = []
+    async for result in stream:
+        assert result.errors is None, result.errors
+        updates.append(result.data["portfolioPriced"])
+        if len(updates) == n:
+            break
+    await stream.aclose()
+    return updates
+
+
+def _market(usd_rates: list[float]) -> MarketInput:
+    return MarketInput(
+        curves=[
+            CurveInput(name="USD_DISC", pillars=_PILLARS, zero_rates_cc=usd_rates),
+            CurveInput(name="EUR_DISC", pillars=[1.0, 5.0], zero_rates_cc=[0.03, 0.031]),
+        ],
+        fx_spot=[FxSpotInput(pair="EURUSD", spot=1.08)],
+    )
+
+
+def test_register_portfolio_id_is_content_hash():
+    assert _register() == _register()
+    response = client.post(
+        "/graphql", json={"query": _REGISTER, "variables": {"trades": _TRADES[:1]}}
+    )
+    assert response.json()["data"]["registerPortfolio"]["portfolioId"] != _register()
+
+
+def test_register_portfolio_reports_offending_trade():
+    trades = _TRADES + [{"zeroCouponBond": {"curve": "GBP_DISC", "maturity": 1.0, "notional": 1.0}}]
+    response = client.post("/graphql", json={"query": _REGISTER, "variables": {"trades": trades}})
+    data = response.json()
+    assert data["data"] is None
+    assert data["errors"][0]["message"].startswith("trades[2]:")
+
+
+def test_portfolio_priced_streams_latest_tick_and_deltas(monkeypatch):
+    """First update prices the latest entry; a backlog of ticks is priced once, at the newest."""
+    bumped = [r + 0.0001 for r in _USD_RATES]
+    stale = [r + 0.0005 for r in _USD_RATES]
+    fake = _FakeRedis(
+        latest=[("1-0", _payload(_USD_RATES))],
+        batches=[[("2-0", _payload(stale)), ("3-0", _payload(bumped))]],
+    )
+
+    async def get_fake_redis():
+        return fake
+
+    monkeypatch.setattr(streaming, "get_redis", get_fake_redis)
+    portfolio_id = _register()
+    first, second = asyncio.run(_collect(portfolio_id, 2))
+    assert fake.read_from == ["1-0"]
+
+    expected = [
+        price_portfolio(
+            [TradeInput(id="zcb", zero_coupon_bond=ZeroCouponBondInput(curve="USD_DISC", maturity=2.0, notional=1e6)),
+             TradeInput(id="eur", zero_coupon_bond=ZeroCouponBondInput(curve="EUR_DISC", maturity=3.0, notional=1e6))],
+            _market(rates),
+            calculate_pv01=True,
+        )
+        for rates in (_USD_RATES, bumped)
+    ]
+    assert (first["streamId"], first["tick"], second["streamId"], second["tick"]) == ("1-0", 1, "3-0", 2)
+    assert first["totalNpvDelta"] is None
+    assert all(t["npvDelta"] is None and t["riskDeltas"] is None for t in first["trades"])
+    for update, results in zip((first, second), expected):
+        assert [t["npv"] for t in update["trades"]] == pytest.approx([r.npv for r in results], abs=1e-9)
+    zcb, eur = second["trades"]
+    assert zcb["npvDelta"] == pytest.approx(expected[1][0].npv - expected[0][0].npv, abs=1e-9)
+    assert zcb["npvDelta"] < 0
+    assert zcb["riskDeltas"]["pv01"] == pytest.approx(
+        expected[1][0].risk_measures.pv01 - expected[0][0].risk_measures.pv01, abs=1e-9
+    )
+    assert eur["npvDelta"] == 0.0
+    assert second["totalNpvDelta"] == pytest.approx(zcb["npvDelta"], abs=1e-9)
+
+
+def test_portfolio_priced_only_changed(monkeypatch):
+    fake = _FakeRedis(
+        latest=[("1-0", _payload(_USD_RATES))],
+        batches=[[("2-0", {b"payload": b"not json"})], [("3-0", _payload([r + 0.0002 for r in _USD_RATES]))]],
+    )
+
+    async def get_fake_redis():
+        return fake
+
+    monkeypatch.setattr(streaming, "get_redis", get_fake_redis)
+    first, second = asyncio.run(_collect(_register(), 2, only_changed=True))
+    assert [t["id"] for t in first["trades"]] == ["zcb", "eur"]
+    assert second["streamId"] == "3-0"
+    assert [t["id"] for t in second["trades"]] == ["zcb"]
+    assert fake.read_from == ["1-0", "2-0"]
+
+
+def test_portfolio_priced_decodes_binary_full_and_delta_payloads(monkeypatch):
+    """Start replays deltas from the last full snapshot; later deltas apply to the previous curve."""
+    moved = [r + 0.0001 if i == 2 else r for i, r in enumerate(_USD_RATES)]
+    moved_again = [r + 0.0003 if i == 4 else r for i, r in enumerate(moved)]
+    fake = _FakeRedis(
+        latest=[
+            ("0-0", {b"payload": encode_delta(_curve(_USD_RATES, 0), _curve(_USD_RATES, 1))}),  # no base yet: skipped
+            ("1-0", {b"payload": encode_full(_curve(_USD_RATES, 1))}),
+            ("2-0", {b"payload": encode_delta(_curve(_USD_RATES, 1), _curve(moved, 2))}),
+        ],
+        batches=[[
+            ("3-0", {b"payload": encode_delta(_curve(moved, 2), _curve(moved_again, 3))}),
+            ("5-0", {b"payload": encode_delta(_curve(moved_again, 4), _curve(moved, 5))}),  # follows a missed entry
+        ]],
+    )
+
+    async def get_fake_redis():
+        return fake
+
+    monkeypatch.setattr(streaming, "get_redis", get_fake_redis)
+    first, second = asyncio.run(_collect(_register(), 2))
+    assert (first["streamId"], second["streamId"]) == ("2-0", "3-0")
+    assert fake.read_from == ["2-0"]
+    trades = [TradeInput(id="zcb", zero_coupon_bond=ZeroCouponBondInput(curve="USD_DISC", maturity=2.0, notional=1e6))]
+    for update, rates in ((first, moved), (second, moved_again)):
+        (expected,) = price_portfolio(trades, _market(rates))
+        assert update["trades"][0]["npv"] == pytest.approx(expected.npv, abs=1e-9)
+
+
+def test_portfolio_priced_unknown_id_is_an_error():
+    async def first_result():
+        stream = await schema.subscribe(
+            _SUBSCRIPTION, variable_values={"portfolioId": "missing", "onlyChanged": False}
+        )
+        async for result in stream:
+            return result
+
+    result = asyncio.run(first_result())
+    assert result.errors and "not found" in result.errors[0].message
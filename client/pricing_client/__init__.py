@@ -1,6 +1,7 @@
 """Python client for the Pricing GraphQL API."""
 
 from pricing_client.client import PricingClient
+from pricing_client.incremental import IncrementalPortfolio
 from pricing_client.marketdata import MarketdataClient
 from pricing_client.types import (
     CDSInput,
@@ -13,16 +14,22 @@ from pricing_client.types import (
     HazardCurveInput,
     MarketInput,
     MortgageInput,
+    PortfolioTradeTick,
+    PortfolioUpdate,
     PricingResult,
+    TradeInput,
+    TradeResult,
     ZeroCouponBondInput,
     curve_snapshot_to_curve_input,
+    trade_input,
 )
 
 try:
-    from pricing_client.blotter import LiveBlotter, stream_live_blotter
+    from pricing_client.blotter import LiveBlotter, stream_live_blotter, stream_portfolio_blotter
 except ImportError:
     LiveBlotter = None  # type: ignore[misc, assignment]
     stream_live_blotter = None  # type: ignore[misc, assignment]
+    stream_portfolio_blotter = None  # type: ignore[misc, assignment]
 
 __all__ = [
     "CDSInput",
@@ -33,13 +40,20 @@ __all__ = [
     "FixedFloatSwapInput",
     "FxSpotInput",
     "HazardCurveInput",
+    "IncrementalPortfolio",
     "LiveBlotter",
     "MarketInput",
     "MarketdataClient",
     "MortgageInput",
+    "PortfolioTradeTick",
+    "PortfolioUpdate",
     "PricingClient",
     "PricingResult",
+    "TradeInput",
+    "TradeResult",
     "ZeroCouponBondInput",
     "curve_snapshot_to_curve_input",
     "stream_live_blotter",
+    "stream_portfolio_blotter",
+    "trade_input",
 ]
@@ -14,6 +14,7 @@ try:
 except ImportError:
     pd = None  # type: ignore[assignment]
 
+from pricing_client.incremental import IncrementalPortfolio
 from pricing_client.marketdata import MarketdataClient
 from pricing_client.types import (
     CurveInput,
@@ -21,6 +22,7 @@ from pricing_client.types import (
     HazardCurveInput,
     MarketInput,
     curve_snapshot_to_curve_input,
+    trade_input,
 )
 
 if TYPE_CHECKING:
@@ -107,25 +109,56 @@ async def stream_live_blotter(
     live_curve_name: str = "USD_DISC",
     marketdata_url: str = "ws://marketdata:8001/graphql",
     max_updates: int | None = None,
+    incremental: bool = False,
+    full_revalue_bp: float = 5.0,
+    full_revalue_every: int = 20,
+    conflate: bool = True,
 ) -> None:
     """
     Subscribe to live curve updates, price all products each tick, and update the blotter.
     products: list of (label, product_input, price_fn) where price_fn(client, market) -> PricingResult.
+    Products whose price_fn is None are priced together in one pricePortfolio request per
+    tick (PV01 on the discount curve, FX delta for forwards, CS01 for CDS).
+    With incremental=True those products are valued by an IncrementalPortfolio instead:
+    key-rate updates between full revaluations (see pricing_client.incremental).
+    With conflate=True (default) ticks that arrive while a tick is being priced are
+    collapsed by the marketdata service, so the blotter always prices the latest curve.
     """
     hazard_curves = hazard_curves or []
     fx_spot = fx_spot or []
     md_client = MarketdataClient(marketdata_url)
+    batched = [
+        (i, trade_input(product_input, id=label))
+        for i, (label, product_input, price_fn) in enumerate(products)
+        if price_fn is None
+    ]
+    book = None
+    if incremental and batched:
+        book = IncrementalPortfolio(
+            client, [t for _, t in batched], live_curve_name,
+            full_revalue_bp=full_revalue_bp, full_revalue_every=full_revalue_every,
+            calculate_pv01=True, calculate_fx_delta=True, calculate_cs01=True,
+        )
     count = 0
-    async for update in md_client.subscribe_curve_updates(live_curve_name):
+    async for update in md_client.subscribe_curve_updates(live_curve_name, conflate=conflate):
         live_curve = curve_snapshot_to_curve_input(update.curve)
         market = MarketInput(
             curves=[live_curve] + list(static_curves),
             hazard_curves=hazard_curves if hazard_curves else None,
             fx_spot=fx_spot if fx_spot else None,
         )
+        portfolio: dict[int, Any] = {}
+        if book is not None:
+            portfolio = {i: r for (i, _), r in zip(batched, book.update(market))}
+        elif batched:
+            portfolio_results = client.price_portfolio(
+                [t for _, t in batched], market,
+                calculate_pv01=True, calculate_fx_delta=True, calculate_cs01=True,
+            )
+            portfolio = {i: r for (i, _), r in zip(batched, portfolio_results)}
         rows = []
-        for label, _product_input, price_fn in products:
-            result: "PricingResult" = price_fn(client, market)
+        for i, (label, _product_input, price_fn) in enumerate(products):
+            result = portfolio[i] if price_fn is None else price_fn(client, market)
             rows.append({
                 "Product": label,
                 "NPV": result.npv,
@@ -135,7 +168,47 @@ async def stream_live_blotter(
             })
         changed = [i for i, d in enumerate(update.rate_deltas_bp) if d is not None]
         status_text = f"Tick #{count + 1} | changed: {changed}"
+        if update.conflated_ticks:
+            status_text += f" | conflated: {update.conflated_ticks}"
+        if book is not None:
+            status_text += " | full revalue" if book.last_update_full else " | incremental"
         blotter.update(rows, status_text=status_text)
         count += 1
         if max_updates is not None and count >= max_updates:
             break
+
+
+async def stream_portfolio_blotter(
+    client: "PricingClient",
+    blotter: LiveBlotter,
+    products: list[tuple[str, Any]],
+    *,
+    market: MarketInput,
+    live_curve_name: str = "USD_DISC",
+    max_updates: int | None = None,
+) -> None:
+    """
+    Server-side variant of stream_live_blotter: the API reprices the portfolio on each
+    live curve tick (portfolioPriced subscription) and pushes only the trades whose NPV
+    moved, so the notebook sends no pricing requests per tick.
+    products: list of (label, product_input); market: base market including the live curve.
+    """
+    trades = [trade_input(product_input, id=label) for label, product_input in products]
+    rows = [
+        {"Product": label, "NPV": None, "PV01": None, "FX_delta": None, "CS01": None}
+        for label, _ in products
+    ]
+    count = 0
+    async for update in client.subscribe_portfolio_priced(
+        trades, live_curve_name, market=market,
+        calculate_pv01=True, calculate_fx_delta=True, calculate_cs01=True,
+        only_changed=True,
+    ):
+        for t in update.trades:
+            rows[t.index].update({"NPV": t.npv, "PV01": t.pv01, "FX_delta": t.fx_delta, "CS01": t.cs01})
+        delta = f"{update.total_npv_delta:+,.2f}" if update.total_npv_delta is not None else "-"
+        status_text = f"Tick #{update.tick} | server-side | changed trades: {len(update.trades)} | total NPV {delta}"
+        blotter.update([dict(r) for r in rows], status_text=status_text)
+        count += 1
+        if max_updates is not None and count >= max_updates:
+            break
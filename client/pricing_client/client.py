@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import sys
+from collections.abc import AsyncIterator
 from typing import Any
 
 from sgqlc.endpoint.http import HTTPEndpoint
 
+from pricing_client.incremental import IncrementalPortfolio
 from pricing_client.marketdata import MarketdataClient
+from pricing_client.ws import graphql_ws
 from pricing_client.types import (
     CDSInput,
     CurveInput,
@@ -16,9 +19,14 @@ from pricing_client.types import (
     HazardCurveInput,
     MarketInput,
     MortgageInput,
+    PortfolioTradeTick,
+    PortfolioUpdate,
     PricingResult,
+    TradeInput,
+    TradeResult,
     ZeroCouponBondInput,
     curve_snapshot_to_curve_input,
+    trade_input,
 )
 
 
@@ -111,6 +119,24 @@ def _cds_to_vars(c: CDSInput) -> dict[str, Any]:
     }
 
 
+def _trade_to_vars(t: TradeInput) -> dict[str, Any]:
+    """Serialize TradeInput to GraphQL variables (camelCase; unset products omitted)."""
+    result: dict[str, Any] = {}
+    if t.id is not None:
+        result["id"] = t.id
+    if t.zero_coupon_bond is not None:
+        result["zeroCouponBond"] = _bond_to_vars(t.zero_coupon_bond)
+    if t.swap is not None:
+        result["swap"] = _swap_to_vars(t.swap)
+    if t.fx_forward is not None:
+        result["fxForward"] = _fx_forward_to_vars(t.fx_forward)
+    if t.mortgage is not None:
+        result["mortgage"] = _mortgage_to_vars(t.mortgage)
+    if t.cds is not None:
+        result["cds"] = _cds_to_vars(t.cds)
+    return result
+
+
 def _is_jupyter() -> bool:
     """True if running inside Jupyter (IPython kernel)."""
     if "IPython" not in sys.modules:
@@ -176,6 +202,88 @@ def _tick_display_rows(
             sys.stdout.flush()
 
 
+REGISTER_PORTFOLIO_MUTATION = """
+mutation RegisterPortfolio(
+    $trades: [TradeInput!]!,
+    $market: MarketInput,
+    $marketId: String,
+    $calculatePv01: Boolean,
+    $calculateFxDelta: Boolean,
+    $calculateCs01: Boolean,
+    $pv01BumpBp: Float,
+    $fxDeltaBumpPct: Float,
+    $cs01BumpBp: Float
+) {
+    registerPortfolio(
+        trades: $trades,
+        market: $market,
+        marketId: $marketId,
+        calculatePv01: $calculatePv01,
+        calculateFxDelta: $calculateFxDelta,
+        calculateCs01: $calculateCs01,
+        pv01BumpBp: $pv01BumpBp,
+        fxDeltaBumpPct: $fxDeltaBumpPct,
+        cs01BumpBp: $cs01BumpBp
+    ) {
+        portfolioId
+    }
+}
+"""
+
+PORTFOLIO_PRICED_SUBSCRIPTION = """
+subscription PortfolioPriced($portfolioId: String!, $curveName: String!, $onlyChanged: Boolean) {
+    portfolioPriced(portfolioId: $portfolioId, curveName: $curveName, onlyChanged: $onlyChanged) {
+        portfolioId
+        curveName
+        streamId
+        tick
+        totalNpv
+        totalNpvDelta
+        trades {
+            index
+            id
+            product
+            npv
+            npvDelta
+            riskMeasures { pv01 fxDelta cs01 }
+            riskDeltas { pv01 fxDelta cs01 }
+        }
+    }
+}
+"""
+
+
+def _parse_portfolio_update(raw: dict) -> PortfolioUpdate:
+    trades = []
+    for t in raw["trades"]:
+        risk = t.get("riskMeasures") or {}
+        deltas = t.get("riskDeltas") or {}
+        trades.append(
+            PortfolioTradeTick(
+                index=t["index"],
+                id=t.get("id"),
+                product=t["product"],
+                npv=t["npv"],
+                npv_delta=t.get("npvDelta"),
+                pv01=risk.get("pv01"),
+                fx_delta=risk.get("fxDelta"),
+                cs01=risk.get("cs01"),
+                pv01_delta=deltas.get("pv01"),
+                fx_delta_delta=deltas.get("fxDelta"),
+                cs01_delta=deltas.get("cs01"),
+            )
+        )
+    return PortfolioUpdate(
+        portfolio_id=raw["portfolioId"],
+        curve_name=raw["curveName"],
+        stream_id=raw["streamId"],
+        tick=raw["tick"],
+        total_npv=raw["totalNpv"],
+        total_npv_delta=raw.get("totalNpvDelta"),
+        trades=trades,
+    )
+
+
 class PricingClient:
     """
     Client for the Pricing GraphQL API.
@@ -462,6 +570,153 @@ class PricingClient:
         pv01 = risk.get("pv01") if risk else None
         return PricingResult(npv=npv, pv01=pv01)
 
+    def upload_market(self, market: MarketInput) -> str:
+        """Register a market snapshot server-side and return its content-hash market id."""
+        query = """
+            mutation UploadMarket($market: MarketInput!) {
+                uploadMarket(market: $market) {
+                    marketId
+                }
+            }
+        """
+        data = self._request(query, {"market": _market_to_vars(market)})
+        return data["uploadMarket"]["marketId"]
+
+    def price_portfolio(
+        self,
+        trades: list[TradeInput],
+        market: MarketInput | None = None,
+        calculate_pv01: bool = False,
+        calculate_fx_delta: bool = False,
+        calculate_cs01: bool = False,
+        pv01_bump_bp: float = 1.0,
+        fx_delta_bump_pct: float = 0.01,
+        cs01_bump_bp: float = 1.0,
+        market_id: str | None = None,
+        calculate_key_rate_pv01: bool = False,
+    ) -> list[TradeResult]:
+        """
+        Price many trades on one market in a single request (one round trip).
+        Risk uses each trade's own curves; results are in input order.
+        Pass market_id (from upload_market) to skip sending the market; sending both
+        lets the server re-register the snapshot if the id has been evicted.
+        calculate_key_rate_pv01 adds a (pillar, pv01) ladder on each trade's PV01 curve.
+        """
+        query = """
+            query PricePortfolio(
+                $market: MarketInput,
+                $marketId: String,
+                $trades: [TradeInput!]!,
+                $calculatePv01: Boolean,
+                $calculateFxDelta: Boolean,
+                $calculateCs01: Boolean,
+                $calculateKeyRatePv01: Boolean,
+                $pv01BumpBp: Float,
+                $fxDeltaBumpPct: Float,
+                $cs01BumpBp: Float
+            ) {
+                pricePortfolio(
+                    market: $market,
+                    marketId: $marketId,
+                    trades: $trades,
+                    calculatePv01: $calculatePv01,
+                    calculateFxDelta: $calculateFxDelta,
+                    calculateCs01: $calculateCs01,
+                    calculateKeyRatePv01: $calculateKeyRatePv01,
+                    pv01BumpBp: $pv01BumpBp,
+                    fxDeltaBumpPct: $fxDeltaBumpPct,
+                    cs01BumpBp: $cs01BumpBp
+                ) {
+                    id
+                    product
+                    npv
+                    riskMeasures {
+                        pv01
+                        fxDelta
+                        cs01
+                        keyRatePv01 { pillar pv01 }
+                    }
+                }
+            }
+        """
+        variables: dict[str, Any] = {
+            "trades": [_trade_to_vars(t) for t in trades],
+            "calculatePv01": calculate_pv01,
+            "calculateFxDelta": calculate_fx_delta,
+            "calculateCs01": calculate_cs01,
+            "calculateKeyRatePv01": calculate_key_rate_pv01,
+            "pv01BumpBp": pv01_bump_bp,
+            "fxDeltaBumpPct": fx_delta_bump_pct,
+            "cs01BumpBp": cs01_bump_bp,
+        }
+        if market is not None:
+            variables["market"] = _market_to_vars(market)
+        if market_id is not None:
+            variables["marketId"] = market_id
+        data = self._request(query, variables)
+        results = []
+        for raw in data["pricePortfolio"]:
+            risk = raw.get("riskMeasures") or {}
+            ladder = risk.get("keyRatePv01")
+            results.append(
+                TradeResult(
+                    id=raw.get("id"),
+                    product=raw["product"],
+                    npv=raw["npv"],
+                    pv01=risk.get("pv01"),
+                    fx_delta=risk.get("fxDelta"),
+                    cs01=risk.get("cs01"),
+                    key_rate_pv01=(
+                        [(b["pillar"], b["pv01"]) for b in ladder] if ladder is not None else None
+                    ),
+                )
+            )
+        return results
+
+    async def subscribe_portfolio_priced(
+        self,
+        trades: list[TradeInput],
+        curve_name: str,
+        market: MarketInput | None = None,
+        market_id: str | None = None,
+        calculate_pv01: bool = False,
+        calculate_fx_delta: bool = False,
+        calculate_cs01: bool = False,
+        pv01_bump_bp: float = 1.0,
+        fx_delta_bump_pct: float = 0.01,
+        cs01_bump_bp: float = 1.0,
+        only_changed: bool = False,
+    ) -> AsyncIterator[PortfolioUpdate]:
+        """
+        Server-side streaming valuation: register `trades` on their base market, then
+        yield a PortfolioUpdate each time the API reprices them on a tick of `curve_name`.
+        Registration and subscription share one WebSocket connection (same API replica);
+        no pricing request is sent per tick. only_changed omits trades whose NPV did not move.
+        """
+        variables: dict[str, Any] = {
+            "trades": [_trade_to_vars(t) for t in trades],
+            "calculatePv01": calculate_pv01,
+            "calculateFxDelta": calculate_fx_delta,
+            "calculateCs01": calculate_cs01,
+            "pv01BumpBp": pv01_bump_bp,
+            "fxDeltaBumpPct": fx_delta_bump_pct,
+            "cs01BumpBp": cs01_bump_bp,
+        }
+        if market is not None:
+            variables["market"] = _market_to_vars(market)
+        if market_id is not None:
+            variables["marketId"] = market_id
+        async with graphql_ws(self._url) as session:
+            data = await session.execute(REGISTER_PORTFOLIO_MUTATION, variables)
+            portfolio_id = data["registerPortfolio"]["portfolioId"]
+            async for event in session.subscribe(
+                PORTFOLIO_PRICED_SUBSCRIPTION,
+                {"portfolioId": portfolio_id, "curveName": curve_name, "onlyChanged": only_changed},
+            ):
+                raw = event.get("portfolioPriced")
+                if raw is not None:
+                    yield _parse_portfolio_update(raw)
+
     async def stream_realtime_pricing(
         self,
         bond: ZeroCouponBondInput,
@@ -469,12 +724,20 @@ class PricingClient:
         marketdata_url: str = "ws://marketdata:8001/graphql",
         max_updates: int | None = None,
         display: bool = True,
+        incremental: bool = False,
     ) -> None:
         """
         Stream real-time NPV/PV01 as curve updates arrive. Display ticks in place.
         Runs until cancelled (Ctrl+C) or max_updates if set.
+        incremental=True updates the NPV from its key-rate ladder between full
+        revaluations (IncrementalPortfolio); PV01 is refreshed on full revaluations.
         """
         md_client = MarketdataClient(marketdata_url)
+        book = (
+            IncrementalPortfolio(self, [trade_input(bond)], curve_name, calculate_pv01=True)
+            if incremental
+            else None
+        )
         use_jupyter = _is_jupyter()
         header = f"ZCB | {bond.curve} | {bond.maturity}Y | {bond.notional:,.0f} notional"
         sep = "-" * min(60, len(header))
@@ -485,7 +748,10 @@ class PricingClient:
             async for update in md_client.subscribe_curve_updates(curve_name):
                 curve_input = curve_snapshot_to_curve_input(update.curve)
                 market = MarketInput(curves=[curve_input])
-                result = self.price_zero_coupon_bond(bond, market, calculate_pv01=True)
+                if book is not None:
+                    (result,) = book.update(market)
+                else:
+                    result = self.price_zero_coupon_bond(bond, market, calculate_pv01=True)
                 count += 1
                 pv01_val = result.pv01 if result.pv01 is not None else 0.0
                 changed = [i for i, d in enumerate(update.rate_deltas_bp) if d is not None]
@@ -558,7 +824,10 @@ class PricingClient:
                 c = update.curve
                 curve_input = curve_snapshot_to_curve_input(c)
                 market = MarketInput(curves=[curve_input])
-                result = self.price_zero_coupon_bond(bond, market, calculate_pv01=True)
+                if book is not None:
+                    (result,) = book.update(market)
+                else:
+                    result = self.price_zero_coupon_bond(bond, market, calculate_pv01=True)
                 count += 1
                 rates_pct = " ".join(f"{r*100:.2f}%" for r in c.zero_rates_cc)
                 changed = [i for i, d in enumerate(update.rate_deltas_bp) if d is not None]
@@ -0,0 +1,133 @@
+"""
+Incremental portfolio valuation on live curve ticks.
+
+A full valuation (one pricePortfolio request) returns each trade's NPV and its
+key-rate PV01 ladder on its discount curve. On later ticks of the live curve,
+trades whose only dependence on that curve is their discount curve are updated
+locally as NPV = NPV_full + sum_k KR01_k * move_k (bp since the full valuation);
+trades that do not reference the live curve keep their NPV. Only trades that use
+the live curve in some other role (FX base curve, CDS survival curve) or came
+back without a ladder are sent to the server on each tick.
+
+A full revaluation is requested on the first tick, when the pillars change, when
+any pillar has moved more than `full_revalue_bp` since the last one, and every
+`full_revalue_every` ticks. Those bounds keep the first-order error small; risk
+measures are refreshed on full revaluations only.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Optional
+
+from pricing_client.types import CurveInput, MarketInput, TradeInput, TradeResult
+
+if TYPE_CHECKING:
+    from pricing_client.client import PricingClient
+
+LINEAR, STATIC, REPRICE = "linear", "static", "reprice"
+
+
+def _curve_roles(trade: TradeInput) -> tuple[Optional[str], list[str]]:
+    """(curve the key-rate ladder is on, other curves the trade references)."""
+    if trade.zero_coupon_bond is not None:
+        return trade.zero_coupon_bond.curve, []
+    if trade.swap is not None:
+        return trade.swap.curve, []
+    if trade.mortgage is not None:
+        return trade.mortgage.curve, []
+    if trade.fx_forward is not None:
+        return trade.fx_forward.quote_curve, [trade.fx_forward.base_curve]
+    if trade.cds is not None:
+        return trade.cds.discount_curve, [trade.cds.survival_curve]
+    return None, []
+
+
+def _mode(trade: TradeInput, live_curve: str) -> str:
+    ladder_curve, others = _curve_roles(trade)
+    if live_curve in others:
+        return REPRICE
+    if ladder_curve == live_curve:
+        return LINEAR
+    return STATIC if ladder_curve is not None else REPRICE
+
+
+class IncrementalPortfolio:
+    """
+    NPVs of a fixed list of trades, kept current across ticks of one live curve.
+    Call update(market) on each tick, with the live curve inside `market`.
+    `risk` is forwarded to price_portfolio (calculate_pv01, calculate_fx_delta, ...).
+    """
+
+    def __init__(
+        self,
+        client: "PricingClient",
+        trades: list[TradeInput],
+        live_curve_name: str,
+        full_revalue_bp: float = 5.0,
+        full_revalue_every: int = 20,
+        **risk: Any,
+    ) -> None:
+        if full_revalue_bp <= 0 or full_revalue_every < 1:
+            raise ValueError("full_revalue_bp must be positive and full_revalue_every >= 1")
+        self._client = client
+        self.trades = list(trades)
+        self.live_curve_name = live_curve_name
+        self.full_revalue_bp = full_revalue_bp
+        self.full_revalue_every = full_revalue_every
+        self._risk = risk
+        self._modes = [_mode(t, live_curve_name) for t in self.trades]
+        self._base: list[TradeResult] = []
+        self._anchor: Optional[CurveInput] = None
+        self._since_full = 0
+        self.last_update_full = False
+
+    def _live_curve(self, market: MarketInput) -> CurveInput:
+        for curve in market.curves:
+            if curve.name == self.live_curve_name:
+                return curve
+        raise ValueError(f"market has no curve '{self.live_curve_name}'")
+
+    def _needs_full(self, live: CurveInput) -> bool:
+        anchor = self._anchor
+        if anchor is None or self._since_full >= self.full_revalue_every:
+            return True
+        if list(live.pillars) != list(anchor.pillars) or live.t0 != anchor.t0:
+            return True
+        return any(
+            abs(new - old) * 1e4 > self.full_revalue_bp
+            for new, old in zip(live.zero_rates_cc, anchor.zero_rates_cc)
+        )
+
+    def update(self, market: MarketInput) -> list[TradeResult]:
+        """Results for `market`, in trade order (incremental where possible)."""
+        live = self._live_curve(market)
+        if self._needs_full(live):
+            self._base = self._client.price_portfolio(
+                self.trades, market, calculate_key_rate_pv01=True, **self._risk
+            )
+            self._modes = [
+                REPRICE if mode == LINEAR and r.key_rate_pv01 is None else mode
+                for mode, r in zip(self._modes, self._base)
+            ]
+            self._anchor = replace(live, pillars=list(live.pillars), zero_rates_cc=list(live.zero_rates_cc))
+            self._since_full = 0
+            self.last_update_full = True
+            return list(self._base)
+
+        self._since_full += 1
+        self.last_update_full = False
+        moves_bp = [
+            (new - old) * 1e4 for new, old in zip(live.zero_rates_cc, self._anchor.zero_rates_cc)
+        ]
+        results = list(self._base)
+        for i, (mode, base) in enumerate(zip(self._modes, self._base)):
+            if mode == LINEAR:
+                change = sum(pv01 * move for (_, pv01), move in zip(base.key_rate_pv01, moves_bp))
+                results[i] = replace(base, npv=base.npv + change)
+        reprice = [i for i, mode in enumerate(self._modes) if mode == REPRICE]
+        if reprice:
+            fresh = self._client.price_portfolio([self.trades[i] for i in reprice], market, **self._risk)
+            for i, r in zip(reprice, fresh):
+                results[i] = r
+        return results
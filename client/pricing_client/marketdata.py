@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 
-import json
 from collections.abc import AsyncIterator
+
 from pricing_client.types import CurveSnapshot, CurveUpdate
+from pricing_client.ws import graphql_ws, ws_url
 
 SUB_QUERY = """
-subscription CurveUpdated($name: String!) {
-  curveUpdated(name: $name) {
+subscription CurveUpdated($name: String!, $conflate: Boolean) {
+  curveUpdated(name: $name, conflate: $conflate) {
     curve { name pillars t0 zeroRatesCc }
     rateDeltasCc
     rateDeltasBp
+    conflatedTicks
   }
 }
 """
@@ -32,6 +34,7 @@ def _parse_update(raw: dict) -> CurveUpdate:
         curve=_parse_curve(curve_raw),
         rate_deltas_cc=raw.get("rateDeltasCc") or [],
         rate_deltas_bp=raw.get("rateDeltasBp") or [],
+        conflated_ticks=raw.get("conflatedTicks") or 0,
     )
 
 
@@ -42,49 +45,18 @@ class MarketdataClient:
     """
 
     def __init__(self, url: str = "ws://marketdata:8001/graphql", close_timeout: float = 2.0) -> None:
-        self._url = url.rstrip("/").replace("http://", "ws://").replace("https://", "wss://")
+        self._url = ws_url(url)
         self._close_timeout = close_timeout
 
-    async def subscribe_curve_updates(self, name: str) -> AsyncIterator[CurveUpdate]:
+    async def subscribe_curve_updates(self, name: str, conflate: bool = False) -> AsyncIterator[CurveUpdate]:
         """
         Subscribe to curve updates by name. Yields CurveUpdate for each event.
+        With conflate=True the server collapses ticks that queued up while the consumer was
+        busy into one update (latest curve, cumulative deltas, conflated_ticks skipped).
         WebSocket is closed when the iterator is exhausted or cancelled.
         """
-        import websockets
-
-        async with websockets.connect(
-            self._url,
-            subprotocols=["graphql-transport-ws"],
-            close_timeout=self._close_timeout,
-        ) as ws:
-            await ws.send(json.dumps({"type": "connection_init", "payload": {}}))
-            msg = json.loads(await ws.recv())
-            if msg.get("type") != "connection_ack":
-                raise RuntimeError(f"Unexpected marketdata response: {msg}")
-
-            sub_id = "1"
-            await ws.send(
-                json.dumps(
-                    {
-                        "id": sub_id,
-                        "type": "subscribe",
-                        "payload": {"query": SUB_QUERY, "variables": {"name": name}},
-                    }
-                )
-            )
-            try:
-                while True:
-                    raw = await ws.recv()
-                    msg = json.loads(raw)
-                    if msg.get("type") == "next":
-                        data = msg.get("payload", {}).get("data", {})
-                        cu = data.get("curveUpdated")
-                        if cu is not None:
-                            yield _parse_update(cu)
-                    elif msg.get("type") in ("complete", "error"):
-                        break
-            finally:
-                try:
-                    await ws.send(json.dumps({"id": sub_id, "type": "complete"}))
-                except Exception:
-                    pass
+        async with graphql_ws(self._url, self._close_timeout) as session:
+            async for data in session.subscribe(SUB_QUERY, {"name": name, "conflate": conflate}):
+                cu = data.get("curveUpdated")
+                if cu is not None:
+                    yield _parse_update(cu)
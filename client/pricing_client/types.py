@@ -98,6 +98,18 @@ class CDSInput:
     protection_buyer: bool = True
 
 
+@dataclass
+class TradeInput:
+    """One trade in a portfolio request: set exactly one product field. `id` is echoed back."""
+
+    id: Optional[str] = None
+    zero_coupon_bond: Optional[ZeroCouponBondInput] = None
+    swap: Optional[FixedFloatSwapInput] = None
+    fx_forward: Optional[FXForwardInput] = None
+    mortgage: Optional[MortgageInput] = None
+    cds: Optional[CDSInput] = None
+
+
 @dataclass
 class PricingResult:
     """Pricing result: NPV and optional risk measures (flattened for ergonomics)."""
@@ -108,6 +120,49 @@ class PricingResult:
     cs01: Optional[float] = None
 
 
+@dataclass
+class TradeResult:
+    """Per-trade portfolio result (input order), risk flattened like PricingResult."""
+
+    id: Optional[str]
+    product: str
+    npv: float
+    pv01: Optional[float] = None
+    fx_delta: Optional[float] = None
+    cs01: Optional[float] = None
+    key_rate_pv01: Optional[list[tuple[float, float]]] = None  # (pillar, pv01) on the PV01 curve
+
+
+@dataclass
+class PortfolioTradeTick:
+    """One trade in a server-side portfolio update; deltas are changes since the previous update."""
+
+    index: int
+    id: Optional[str]
+    product: str
+    npv: float
+    npv_delta: Optional[float] = None
+    pv01: Optional[float] = None
+    fx_delta: Optional[float] = None
+    cs01: Optional[float] = None
+    pv01_delta: Optional[float] = None
+    fx_delta_delta: Optional[float] = None
+    cs01_delta: Optional[float] = None
+
+
+@dataclass
+class PortfolioUpdate:
+    """Portfolio revalued by the API on one live curve tick (portfolioPriced subscription)."""
+
+    portfolio_id: str
+    curve_name: str
+    stream_id: str
+    tick: int
+    total_npv: float
+    total_npv_delta: Optional[float]
+    trades: list[PortfolioTradeTick]
+
+
 @dataclass
 class CurveSnapshot:
     """Curve snapshot from marketdata subscription (nested curve in CurveUpdate)."""
@@ -125,6 +180,7 @@ class CurveUpdate:
     curve: CurveSnapshot
     rate_deltas_cc: list[float | None]
     rate_deltas_bp: list[float | None]
+    conflated_ticks: int = 0  # feed ticks folded into this update (conflate mode)
 
 
 def curve_snapshot_to_curve_input(snapshot: CurveSnapshot) -> CurveInput:
@@ -135,3 +191,18 @@ def curve_snapshot_to_curve_input(snapshot: CurveSnapshot) -> CurveInput:
         zero_rates_cc=snapshot.zero_rates_cc,
         t0=snapshot.t0,
     )
+
+
+def trade_input(product: object, id: Optional[str] = None) -> TradeInput:
+    """Wrap a single product input (ZeroCouponBondInput, CDSInput, ...) in a TradeInput."""
+    fields = {
+        ZeroCouponBondInput: "zero_coupon_bond",
+        FixedFloatSwapInput: "swap",
+        FXForwardInput: "fx_forward",
+        MortgageInput: "mortgage",
+        CDSInput: "cds",
+    }
+    field = fields.get(type(product))
+    if field is None:
+        raise TypeError(f"Unsupported product input type: {type(product).__name__}")
+    return TradeInput(id=id, **{field: product})
@@ -0,0 +1,90 @@
+"""Minimal GraphQL-over-WebSocket (graphql-transport-ws) session shared by the streaming clients."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+
+def ws_url(url: str) -> str:
+    """WebSocket URL for a GraphQL endpoint given as http(s):// or ws(s)://."""
+    return url.rstrip("/").replace("http://", "ws://").replace("https://", "wss://")
+
+
+class GraphQLWebSocket:
+    """One acknowledged connection; operations are sent with increasing ids."""
+
+    def __init__(self, ws: Any) -> None:
+        self._ws = ws
+        self._next_id = 0
+
+    def _op_id(self) -> str:
+        self._next_id += 1
+        return str(self._next_id)
+
+    async def _start(self, query: str, variables: dict[str, Any]) -> str:
+        op_id = self._op_id()
+        await self._ws.send(
+            json.dumps(
+                {"id": op_id, "type": "subscribe", "payload": {"query": query, "variables": variables}}
+            )
+        )
+        return op_id
+
+    async def execute(self, query: str, variables: dict[str, Any] | None = None) -> dict:
+        """Run a single-result operation (query or mutation) on this connection; returns data."""
+        op_id = await self._start(query, variables or {})
+        data: dict = {}
+        while True:
+            msg = json.loads(await self._ws.recv())
+            if msg.get("id") != op_id:
+                continue
+            if msg.get("type") == "next":
+                payload = msg.get("payload", {})
+                if payload.get("errors"):
+                    raise RuntimeError(f"GraphQL errors: {payload['errors']}")
+                data = payload.get("data") or {}
+            elif msg.get("type") == "error":
+                raise RuntimeError(f"GraphQL errors: {msg.get('payload')}")
+            elif msg.get("type") == "complete":
+                return data
+
+    async def subscribe(self, query: str, variables: dict[str, Any] | None = None) -> AsyncIterator[dict]:
+        """Yield the data of each event until the server completes or the iterator is closed."""
+        op_id = await self._start(query, variables or {})
+        try:
+            while True:
+                msg = json.loads(await self._ws.recv())
+                if msg.get("id") not in (None, op_id):
+                    continue
+                if msg.get("type") == "next":
+                    payload = msg.get("payload", {})
+                    if payload.get("errors"):
+                        raise RuntimeError(f"GraphQL errors: {payload['errors']}")
+                    yield payload.get("data") or {}
+                elif msg.get("type") in ("complete", "error"):
+                    break
+        finally:
+            try:
+                await self._ws.send(json.dumps({"id": op_id, "type": "complete"}))
+            except Exception:
+                pass
+
+
+@asynccontextmanager
+async def graphql_ws(url: str, close_timeout: float = 2.0) -> AsyncIterator[GraphQLWebSocket]:
+    """Open and acknowledge a graphql-transport-ws connection; closed on exit."""
+    import websockets
+
+    async with websockets.connect(
+        ws_url(url),
+        subprotocols=["graphql-transport-ws"],
+        close_timeout=close_timeout,
+    ) as ws:
+        await ws.send(json.dumps({"type": "connection_init", "payload": {}}))
+        msg = json.loads(await ws.recv())
+        if msg.get("type") != "connection_ack":
+            raise RuntimeError(f"Unexpected GraphQL WebSocket response: {msg}")
+        yield GraphQLWebSocket(ws)
@@ -0,0 +1,199 @@
+"""
+Shared per-curve stream readers fanning out to in-process subscribers.
+
+One reader task per curve name XREADs `curve_updates:<name>` and decodes each
+entry once (delta payloads against the previous entry, see pricing.curve_payload),
+then pushes the Curve to every subscriber of that curve. The task
+starts with the first subscriber and stops with the last, so N subscribers
+cost one Redis read per tick instead of N.
+
+Each subscriber has a bounded queue with one of two policies:
+- drop (default): up to CURVE_SUBSCRIBER_QUEUE_SIZE (default 100) pending
+  snapshots; when full, the oldest is dropped.
+- conflate: only the latest pending snapshot is kept.
+
+Either way a slow subscriber never holds memory beyond its bound or slows the
+reader, and `get()` reports how many snapshots were skipped since the last one
+it returned, so deltas can be computed against the last delivered snapshot.
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import Optional
+
+from pricing.curve_payload import CurveData, decode
+
+from app.redis_client import get_redis
+from app.store import curve_from_data
+from app.types import Curve
+
+STREAM_PREFIX = "curve_updates"
+XREAD_BLOCK_MS = 5000
+XREAD_BATCH = 1000
+XREVRANGE_COUNT = 100  # recent entries replayed at start (covers the feed's full-snapshot interval)
+READ_RETRY_SECONDS = 1.0
+DEFAULT_QUEUE_SIZE = int(os.environ.get("CURVE_SUBSCRIBER_QUEUE_SIZE", "100"))
+
+logger = logging.getLogger(__name__)
+
+
+class CurveSubscriber:
+    """Bounded queue of curve snapshots for one subscription (oldest dropped when full)."""
+
+    def __init__(self, name: str, conflate: bool = False, maxsize: int = DEFAULT_QUEUE_SIZE) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.name = name
+        self.conflate = conflate
+        self._pending: deque[Curve] = deque(maxlen=1 if conflate else maxsize)
+        self._skipped = 0
+        self._ready = asyncio.Event()
+        self.dropped = 0  # total snapshots never delivered
+
+    def push(self, curve: Curve) -> None:
+        """Queue a snapshot (called by the reader); evicts the oldest pending one when full."""
+        if len(self._pending) == self._pending.maxlen:
+            self._skipped += 1
+            self.dropped += 1
+        self._pending.append(curve)
+        self._ready.set()
+
+    async def get(self) -> tuple[Curve, int]:
+        """Next snapshot and the number skipped since the previous one returned."""
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        curve = self._pending.popleft()
+        skipped, self._skipped = self._skipped, 0
+        return curve, skipped
+
+
+class CurveFanout:
+    """Registry of per-curve reader tasks and their subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[CurveSubscriber]] = {}
+        self._readers: dict[str, asyncio.Task] = {}
+        self._ready: dict[str, asyncio.Event] = {}
+
+    def subscriber_count(self, name: Optional[str] = None) -> int:
+        if name is not None:
+            return len(self._subscribers.get(name, ()))
+        return sum(len(s) for s in self._subscribers.values())
+
+    async def subscribe(
+        self, name: str, conflate: bool = False, maxsize: int = DEFAULT_QUEUE_SIZE
+    ) -> CurveSubscriber:
+        """
+        Register a subscriber for `name`, starting the curve's reader if needed (or
+        restarting it if it has died). Returns once the reader has its stream
+        position, so every later entry reaches it.
+        """
+        subscriber = CurveSubscriber(name, conflate=conflate, maxsize=maxsize)
+        self._subscribers.setdefault(name, set()).add(subscriber)
+        reader = self._readers.get(name)
+        if reader is not None and reader.done():
+            del self._readers[name]
+            reader = None
+        if reader is None:
+            ready = self._ready[name] = asyncio.Event()
+            self._readers[name] = asyncio.create_task(self._read(name, ready))
+        try:
+            await self._ready[name].wait()
+        except BaseException:
+            self.unsubscribe(subscriber)
+            raise
+        return subscriber
+
+    def unsubscribe(self, subscriber: CurveSubscriber) -> None:
+        """Remove a subscriber; the curve's reader stops with its last subscriber."""
+        subscribers = self._subscribers.get(subscriber.name)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[subscriber.name]
+            self._ready.pop(subscriber.name, None)
+            reader = self._readers.pop(subscriber.name, None)
+            if reader is not None:
+                reader.cancel()
+
+    async def close(self) -> None:
+        """Stop all readers (app shutdown)."""
+        readers = list(self._readers.values())
+        self._readers.clear()
+        self._subscribers.clear()
+        self._ready.clear()
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+    async def _read(self, name: str, ready: asyncio.Event) -> None:
+        """
+        XREAD new entries of the curve's stream and push parsed snapshots to its subscribers.
+        The start replays the recent entries (not pushed) so that the first deltas have
+        the entry they follow as their base, then sets `ready`. If Redis is unavailable
+        the reader starts from new entries ("$"). Errors are logged: a failed read is
+        retried after READ_RETRY_SECONDS, an entry that fails to decode or deliver is
+        skipped, so the reader only ends when cancelled.
+        """
+        stream_key = f"{STREAM_PREFIX}:{name}"
+        last_id = "$"
+        base: Optional[CurveData] = None
+        try:
+            redis = await get_redis()
+            recent = await redis.xrevrange(stream_key, count=XREVRANGE_COUNT)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("replaying %s failed; reading new entries only", stream_key)
+            recent = []
+        finally:
+            ready.set()
+        if recent:
+            last_id = recent[0][0]
+            for msg_id, fields in reversed(recent):
+                try:
+                    data = decode(fields.get(b"payload") or b"", base)
+                except Exception:
+                    logger.exception("skipping %s entry %r", stream_key, msg_id)
+                    continue
+                if data is not None:
+                    base = data
+        while True:
+            try:
+                redis = await get_redis()
+                result = await redis.xread(
+                    {stream_key: last_id},
+                    block=XREAD_BLOCK_MS,
+                    count=XREAD_BATCH,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Keep subscribers attached across Redis hiccups; retry the same position.
+                logger.exception("reading %s failed; retrying", stream_key)
+                await asyncio.sleep(READ_RETRY_SECONDS)
+                continue
+            for _stream, messages in result or ():
+                for msg_id, fields in messages:
+                    last_id = msg_id
+                    try:
+                        base = self._deliver(name, fields.get(b"payload"), base)
+                    except Exception:
+                        logger.exception("skipping %s entry %r", stream_key, msg_id)
+
+    def _deliver(self, name: str, payload: Optional[bytes], base: Optional[CurveData]) -> Optional[CurveData]:
+        """Decode one entry and push it to the curve's subscribers; returns the new delta base."""
+        data = decode(payload, base) if payload is not None else None
+        if data is None:
+            return base
+        parsed = curve_from_data(data)
+        for subscriber in tuple(self._subscribers.get(name, ())):
+            subscriber.push(parsed)
+        return data
+
+
+curve_fanout = CurveFanout()
@@ -1,7 +1,9 @@
 """Simulated real-time feed: periodically publish curve updates to Redis stream."""
 
 import asyncio
+import os
 import random
+import time
 
 from app.redis_client import get_redis
 from app.store import curve_to_payload, get_curve, set_curve
@@ -12,6 +14,8 @@ FEED_INTERVAL_SEC = 0.5  # Demo: faster ticks for real-time feel
 # Random delta (bp) range per rate to simulate real-time market moves
 RATE_DELTA_BP_MIN = -1.0
 RATE_DELTA_BP_MAX = 1.0
+# Every Nth entry is a full snapshot; the ones in between carry only changed pillars (1 = always full)
+FULL_SNAPSHOT_EVERY = max(1, int(os.environ.get("CURVE_FULL_SNAPSHOT_EVERY", "20")))
 
 
 async def run_feed() -> None:
@@ -19,9 +23,14 @@ async def run_feed() -> None:
     redis = await get_redis()
     # Seed stream so subscription XREAD does not wait on empty stream
     curve = get_curve("USD_DISC")
+    published = curve
+    since_full = 0
+    # Entry sequence numbers (pricing.curve_payload); seeded from the clock so a
+    # restarted feed never continues a sequence readers already hold
+    seq = time.time_ns()
     if curve is not None:
         stream_key = f"{STREAM_PREFIX}:{curve.name}"
-        await redis.xadd(stream_key, {"payload": curve_to_payload(curve)}, maxlen=1000)
+        await redis.xadd(stream_key, {"payload": curve_to_payload(curve, seq)}, maxlen=1000)
     while True:
         try:
             curve = get_curve("USD_DISC")
@@ -44,8 +53,14 @@ async def run_feed() -> None:
             )
             set_curve(curve.name, updated)
             stream_key = f"{STREAM_PREFIX}:{curve.name}"
-            payload = curve_to_payload(updated)
+            since_full += 1
+            full = since_full >= FULL_SNAPSHOT_EVERY or published is None
+            payload = curve_to_payload(updated, seq + 1, previous=None if full else published)
             await redis.xadd(stream_key, {"payload": payload}, maxlen=1000)
+            seq += 1
+            published = updated
+            if full:
+                since_full = 0
         except asyncio.CancelledError:
             break
         except Exception:
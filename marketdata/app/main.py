@@ -6,6 +6,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from strawberry.fastapi import GraphQLRouter
 
+from app.fanout import curve_fanout
 from app.feed import run_feed
 from app.redis_client import close_redis, get_redis
 from app.schema import schema
@@ -13,7 +14,7 @@ from app.schema import schema
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start simulated feed task and close Redis on shutdown."""
+    """Start simulated feed task; stop stream readers and close Redis on shutdown."""
     redis = await get_redis()
     feed_task = asyncio.create_task(run_feed())
     try:
@@ -24,6 +25,7 @@ async def lifespan(app: FastAPI):
             await feed_task
         except asyncio.CancelledError:
             pass
+        await curve_fanout.close()
         await close_redis()
 
 
@@ -12,7 +12,8 @@ async def get_redis() -> "redis.asyncio.Redis":
     if _redis is None:
         import redis.asyncio as redis
         url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
-        _redis = redis.from_url(url, decode_responses=True)
+        # Raw bytes: stream payloads are binary (pricing.curve_payload)
+        _redis = redis.from_url(url, decode_responses=False)
     return _redis
 
 
@@ -1,17 +1,13 @@
 """GraphQL schema: curve query and subscription."""
 
-import asyncio
 from typing import Optional
 
 import strawberry
 
-from app.redis_client import get_redis
-from app.store import curve_from_payload, get_curve
+from app.fanout import curve_fanout
+from app.store import get_curve
 from app.types import Curve, CurveUpdate
 
-STREAM_PREFIX = "curve_updates"
-XREAD_BLOCK_MS = 5000
-
 
 @strawberry.type
 class Query:
@@ -49,45 +45,41 @@ def _deltas_null_unchanged(deltas_cc: list[float]) -> tuple[list[float | None],
 @strawberry.type
 class Subscription:
     @strawberry.subscription
-    async def curve_updated(self, name: str) -> Optional[CurveUpdate]:
-        """Subscribe to curve updates by name. Yields current curve + deltas; then streams from Redis with deltas."""
-        curve = get_curve(name)
-        prev_rates: list[float] = []
-        if curve is not None:
-            # First event: full curve, deltas all null (no previous data)
-            n = len(curve.zero_rates_cc)
-            prev_rates = list(curve.zero_rates_cc)
-            yield CurveUpdate(
-                curve=curve,
-                rate_deltas_cc=[None] * n,
-                rate_deltas_bp=[None] * n,
-            )
-        redis = await get_redis()
-        stream_key = f"{STREAM_PREFIX}:{name}"
-        last_id = "$"
-        while True:
-            try:
-                result = await redis.xread(
-                    {stream_key: last_id},
-                    block=XREAD_BLOCK_MS,
-                    count=1,
+    async def curve_updated(self, name: str, conflate: bool = False) -> Optional[CurveUpdate]:
+        """
+        Subscribe to curve updates by name. Yields current curve + deltas; then streams updates
+        from the curve's shared stream reader (app.fanout) with deltas since the last event.
+        Each subscriber has a bounded queue: a slow one skips the oldest pending snapshots,
+        or with conflate=True only ever receives the latest. Skipped snapshots are folded into
+        the deltas and counted in conflatedTicks, so a slow consumer never falls behind.
+        """
+        # Subscribe before the first event so ticks published while the client handles it are queued
+        subscriber = await curve_fanout.subscribe(name, conflate=conflate)
+        try:
+            curve = get_curve(name)
+            prev_rates: list[float] = []
+            if curve is not None:
+                # First event: full curve, deltas all null (no previous data)
+                n = len(curve.zero_rates_cc)
+                prev_rates = list(curve.zero_rates_cc)
+                yield CurveUpdate(
+                    curve=curve,
+                    rate_deltas_cc=[None] * n,
+                    rate_deltas_bp=[None] * n,
+                )
+            while True:
+                parsed, skipped = await subscriber.get()
+                deltas = _rate_deltas(prev_rates, list(parsed.zero_rates_cc))
+                prev_rates = list(parsed.zero_rates_cc)
+                deltas_cc, deltas_bp = _deltas_null_unchanged(deltas)
+                yield CurveUpdate(
+                    curve=parsed,
+                    rate_deltas_cc=deltas_cc,
+                    rate_deltas_bp=deltas_bp,
+                    conflated_ticks=skipped,
                 )
-                if not result:
-                    continue
-                for stream, messages in result:
-                    for msg_id, fields in messages:
-                        last_id = msg_id
-                        payload = fields.get("payload")
-                        if payload is None:
-                            continue
-                        parsed = curve_from_payload(payload)
-                        if parsed is not None:
-                            deltas = _rate_deltas(prev_rates, list(parsed.zero_rates_cc))
-                            prev_rates = list(parsed.zero_rates_cc)
-                            deltas_cc, deltas_bp = _deltas_null_unchanged(deltas)
-                            yield CurveUpdate(curve=parsed, rate_deltas_cc=deltas_cc, rate_deltas_bp=deltas_bp)
-            except (Exception, asyncio.CancelledError):
-                break
+        finally:
+            curve_fanout.unsubscribe(subscriber)
 
 
 schema = strawberry.Schema(query=Query, subscription=Subscription)
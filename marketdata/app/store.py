@@ -1,10 +1,14 @@
 """In-memory curve store with sample data and Curve serialization for Redis."""
 
-import json
-from typing import Any
+import os
+
+from pricing.curve_payload import CurveData, decode, encode_delta, encode_full, encode_json
 
 from app.types import Curve
 
+# "binary" (compact, with delta payloads) or "json" (legacy snapshots)
+PAYLOAD_FORMAT = os.environ.get("CURVE_PAYLOAD_FORMAT", "binary")
+
 # Sample USD curve (same pillars/rates as api README and pricing demo)
 _SAMPLE_USD = Curve(
     name="USD_DISC",
@@ -28,25 +32,49 @@ def set_curve(name: str, curve: Curve) -> None:
     _curves[name] = curve
 
 
-def curve_to_payload(curve: Curve) -> str:
-    """Serialize Curve to JSON string for Redis stream payload."""
-    return json.dumps({
-        "name": curve.name,
-        "pillars": curve.pillars,
-        "zero_rates_cc": curve.zero_rates_cc,
-        "t0": curve.t0,
-    })
-
-
-def curve_from_payload(payload: str) -> Curve | None:
-    """Deserialize JSON string from Redis to Curve; return None if invalid."""
-    try:
-        d: dict[str, Any] = json.loads(payload)
-        return Curve(
-            name=d["name"],
-            pillars=d["pillars"],
-            zero_rates_cc=d["zero_rates_cc"],
-            t0=d.get("t0", 0.0),
-        )
-    except (json.JSONDecodeError, KeyError, TypeError):
-        return None
+def curve_data(curve: Curve, seq: int | None = None) -> CurveData:
+    """Wire form of a Curve (pricing.curve_payload), as stream entry number `seq`."""
+    return CurveData(
+        name=curve.name,
+        pillars=tuple(curve.pillars),
+        zero_rates_cc=tuple(curve.zero_rates_cc),
+        t0=curve.t0,
+        seq=seq,
+    )
+
+
+def curve_to_payload(curve: Curve, seq: int, previous: Curve | None = None) -> bytes | str:
+    """
+    Serialize Curve for a Redis stream entry with sequence number `seq` (see
+    pricing.curve_payload). Binary by default; with `previous` (the curve
+    published as entry seq - 1) a delta-only payload when the pillars are
+    unchanged. CURVE_PAYLOAD_FORMAT=json writes the legacy JSON snapshot instead.
+    """
+    data = curve_data(curve, seq)
+    if PAYLOAD_FORMAT == "json":
+        return encode_json(data)
+    if previous is not None:
+        delta = encode_delta(curve_data(previous, seq - 1), data)
+        if delta is not None:
+            return delta
+    return encode_full(data)
+
+
+def curve_from_payload(payload: bytes | str, base: CurveData | None = None) -> Curve | None:
+    """
+    Deserialize a Redis stream payload (binary full/delta or JSON) to Curve.
+    Delta payloads are applied to `base`, the wire form of the entry they follow;
+    returns None if invalid or not applicable.
+    """
+    data = decode(payload, base)
+    return curve_from_data(data) if data is not None else None
+
+
+def curve_from_data(data: CurveData) -> Curve:
+    """Curve from its wire form."""
+    return Curve(
+        name=data.name,
+        pillars=list(data.pillars),
+        zero_rates_cc=list(data.zero_rates_cc),
+        t0=data.t0,
+    )
@@ -22,3 +22,4 @@ class CurveUpdate:
     curve: Curve
     rate_deltas_cc: list[Optional[float]]  # change per pillar (decimal); null for unchanged tenors
     rate_deltas_bp: list[Optional[float]]  # same deltas in bp; null for unchanged tenors
+    conflated_ticks: int = 0  # stream entries folded into this update beyond the latest (conflate mode)
@@ -0,0 +1 @@
+"""Marketdata tests."""
@@ -0,0 +1,168 @@
+"""Tests for the per-curve stream readers and subscriber queues (Redis stream faked)."""
+
+import asyncio
+
+import pytest
+from pricing.curve_payload import CurveData, encode_delta, encode_full
+
+from app import fanout
+from app.fanout import CurveFanout, CurveSubscriber
+from app.types import Curve
+
+_PILLARS = (0.5, 1.0, 2.0, 5.0, 10.0)
+_RATES = (0.045, 0.043, 0.040, 0.038, 0.037)
+
+
+def _curve(level: float) -> Curve:
+    return Curve(name="USD_DISC", pillars=list(_PILLARS), zero_rates_cc=[level] * len(_PILLARS))
+
+
+def _data(rates: tuple[float, ...], seq: int) -> CurveData:
+    return CurveData(name="USD_DISC", pillars=_PILLARS, zero_rates_cc=rates, seq=seq)
+
+
+class _FakeRedis:
+    """Stream with existing entries; each XREAD returns the next queued batch, then blocks."""
+
+    def __init__(self, latest: list, batches: list[list]) -> None:
+        self.latest = latest
+        self.batches = list(batches)
+        self.reads = 0
+
+    async def xrevrange(self, key: str, count: int = 1) -> list:
+        return list(reversed(self.latest))[:count]
+
+    async def xread(self, streams: dict, block: int = 0, count: int = 1) -> list:
+        (key, _last_id), = streams.items()
+        self.reads += 1
+        if not self.batches:
+            await asyncio.sleep(3600)
+        return [(key, self.batches.pop(0))]
+
+
+def _use(monkeypatch, fake: _FakeRedis) -> None:
+    async def get_fake_redis():
+        return fake
+
+    monkeypatch.setattr(fanout, "get_redis", get_fake_redis)
+
+
+def test_subscriber_queue_is_bounded_and_drops_oldest():
+    async def run():
+        subscriber = CurveSubscriber("USD_DISC", maxsize=3)
+        for level in (0.01, 0.02, 0.03, 0.04, 0.05):
+            subscriber.push(_curve(level))
+        return [await subscriber.get() for _ in range(3)], subscriber.dropped
+
+    received, dropped = asyncio.run(run())
+    assert [(c.zero_rates_cc[0], skipped) for c, skipped in received] == [(0.03, 2), (0.04, 0), (0.05, 0)]
+    assert dropped == 2
+    with pytest.raises(ValueError, match="maxsize"):
+        CurveSubscriber("USD_DISC", maxsize=0)
+
+
+def test_conflating_subscriber_keeps_only_the_latest():
+    async def run():
+        subscriber = CurveSubscriber("USD_DISC", conflate=True)
+        for level in (0.01, 0.02, 0.03):
+            subscriber.push(_curve(level))
+        first = await subscriber.get()
+        subscriber.push(_curve(0.04))
+        return first, await subscriber.get()
+
+    (first, first_skipped), (second, second_skipped) = asyncio.run(run())
+    assert (first.zero_rates_cc[0], first_skipped) == (0.03, 2)
+    assert (second.zero_rates_cc[0], second_skipped) == (0.04, 0)
+
+
+def test_get_waits_for_the_next_push():
+    async def run():
+        subscriber = CurveSubscriber("USD_DISC")
+        pending = asyncio.create_task(subscriber.get())
+        await asyncio.sleep(0)
+        assert not pending.done()
+        subscriber.push(_curve(0.01))
+        return await pending
+
+    curve, skipped = asyncio.run(run())
+    assert (curve.zero_rates_cc[0], skipped) == (0.01, 0)
+
+
+def test_one_reader_per_curve_stops_with_last_subscriber(monkeypatch):
+    """Subscribers share one reader, which replays recent entries as the delta base."""
+    moved = (0.046,) + _RATES[1:]
+    fake = _FakeRedis(
+        latest=[("1-0", {b"payload": encode_full(_data(_RATES, 1))})],
+        batches=[[("2-0", {b"payload": encode_delta(_data(_RATES, 1), _data(moved, 2))})]],
+    )
+    _use(monkeypatch, fake)
+
+    async def run():
+        curves = CurveFanout()
+        a = await curves.subscribe("USD_DISC")
+        b = await curves.subscribe("USD_DISC", conflate=True)
+        assert curves.subscriber_count("USD_DISC") == 2 and len(curves._readers) == 1
+        received = [await a.get(), await b.get()]
+        reader = curves._readers["USD_DISC"]
+        curves.unsubscribe(a)
+        assert not reader.cancelled() and curves.subscriber_count() == 1
+        curves.unsubscribe(b)
+        with pytest.raises(asyncio.CancelledError):
+            await reader
+        assert curves.subscriber_count() == 0 and not curves._readers
+        return received
+
+    received = asyncio.run(run())
+    assert [(c.zero_rates_cc, skipped) for c, skipped in received] == [(list(moved), 0)] * 2
+    assert fake.reads == 2  # one batch for both subscribers, then the blocking read
+
+
+def test_reader_skips_an_entry_that_fails_and_keeps_streaming(monkeypatch):
+    """An entry whose decode raises is skipped; later entries still reach subscribers."""
+    moved = (0.046,) + _RATES[1:]
+    fake = _FakeRedis(
+        latest=[("1-0", {b"payload": encode_full(_data(_RATES, 1))})],
+        batches=[[("2-0", {b"payload": b"boom"}), ("3-0", {b"payload": encode_full(_data(moved, 3))})]],
+    )
+    _use(monkeypatch, fake)
+    decode = fanout.decode
+
+    def failing_decode(payload, base=None):
+        if payload == b"boom":
+            raise RuntimeError("bad entry")
+        return decode(payload, base)
+
+    monkeypatch.setattr(fanout, "decode", failing_decode)
+
+    async def run():
+        curves = CurveFanout()
+        subscriber = await curves.subscribe("USD_DISC")
+        received = await subscriber.get()
+        assert not curves._readers["USD_DISC"].done()
+        await curves.close()
+        return received
+
+    curve, skipped = asyncio.run(run())
+    assert (curve.zero_rates_cc, skipped) == (list(moved), 0)
+
+
+def test_subscribe_restarts_a_dead_reader(monkeypatch):
+    moved = (0.046,) + _RATES[1:]
+    fake = _FakeRedis(latest=[("1-0", {b"payload": encode_full(_data(_RATES, 1))})], batches=[])
+    _use(monkeypatch, fake)
+
+    async def run():
+        curves = CurveFanout()
+        first = await curves.subscribe("USD_DISC")
+        dead = curves._readers["USD_DISC"]
+        dead.cancel()
+        await asyncio.gather(dead, return_exceptions=True)
+        fake.batches.append([("2-0", {b"payload": encode_full(_data(moved, 2))})])
+        second = await curves.subscribe("USD_DISC")
+        assert curves._readers["USD_DISC"] is not dead
+        received = await asyncio.gather(first.get(), second.get())
+        await curves.close()
+        return received
+
+    received = asyncio.run(run())
+    assert [(c.zero_rates_cc, skipped) for c, skipped in received] == [(list(moved), 0)] * 2
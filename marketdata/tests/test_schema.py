@@ -0,0 +1,129 @@
+"""Tests for the curveUpdated subscription (Redis stream faked)."""
+
+import asyncio
+
+import pytest
+from pricing.curve_payload import CurveData, encode_delta, encode_full
+
+from app import fanout, schema as schema_module
+from app.fanout import CurveFanout
+from app.schema import schema
+from app.store import get_curve
+
+_SUBSCRIPTION = """
+subscription Updated($conflate: Boolean!) {
+  curveUpdated(name: "USD_DISC", conflate: $conflate) {
+    curve { zeroRatesCc }
+    rateDeltasCc
+    rateDeltasBp
+    conflatedTicks
+  }
+}
+"""
+
+
+def _data(rates: list[float], seq: int) -> CurveData:
+    curve = get_curve("USD_DISC")
+    return CurveData(name=curve.name, pillars=tuple(curve.pillars), zero_rates_cc=tuple(rates), t0=curve.t0, seq=seq)
+
+
+class _FakeRedis:
+    """Stream with existing entries; each XREAD waits for the next queued batch."""
+
+    def __init__(self, latest: list, batches: list[list]) -> None:
+        self.latest = latest
+        self.batches = list(batches)
+
+    async def xrevrange(self, key: str, count: int = 1) -> list:
+        return list(reversed(self.latest))[:count]
+
+    async def xread(self, streams: dict, block: int = 0, count: int = 1) -> list:
+        (key, _last_id), = streams.items()
+        while not self.batches:
+            await asyncio.sleep(0.01)
+        return [(key, self.batches.pop(0))]
+
+
+def _use(monkeypatch, fake: _FakeRedis) -> CurveFanout:
+    """Point a fresh CurveFanout at `fake` for the subscription."""
+    async def get_fake_redis():
+        return fake
+
+    monkeypatch.setattr(fanout, "get_redis", get_fake_redis)
+    curves = CurveFanout()
+    monkeypatch.setattr(schema_module, "curve_fanout", curves)
+    return curves
+
+
+def test_subscriber_is_registered_before_the_first_event(monkeypatch):
+    """Ticks published while the client handles the first event are queued, not lost."""
+    rates = list(get_curve("USD_DISC").zero_rates_cc)
+    moved = [rates[0] + 0.0001] + rates[1:]
+    fake = _FakeRedis(latest=[("1-0", {b"payload": encode_full(_data(rates, 1))})], batches=[])
+    curves = _use(monkeypatch, fake)
+
+    async def run():
+        stream = await schema.subscribe(_SUBSCRIPTION, variable_values={"conflate": False})
+        first = await stream.__anext__()
+        assert curves.subscriber_count("USD_DISC") == 1
+        fake.batches.append([("2-0", {b"payload": encode_full(_data(moved, 2))})])
+        second = await stream.__anext__()
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.data["curveUpdated"]["rateDeltasCc"] == [None] * len(rates)
+    assert second.data["curveUpdated"]["curve"]["zeroRatesCc"] == moved
+    assert curves.subscriber_count() == 0
+
+
+def _batch_stream(monkeypatch) -> tuple[list[float], list[list[float]]]:
+    """Stream seeded with the store curve and one XREAD batch of three delta ticks."""
+    rates = list(get_curve("USD_DISC").zero_rates_cc)
+    ticks = [
+        [rates[0] + 0.0001] + rates[1:],
+        [rates[0] + 0.0001, rates[1] + 0.0002] + rates[2:],
+        [rates[0] + 0.0002, rates[1] + 0.0002] + rates[2:],
+    ]
+    entries = []
+    for seq, (previous, tick) in enumerate(zip([rates] + ticks, ticks), start=2):
+        payload = encode_delta(_data(previous, seq - 1), _data(tick, seq))
+        entries.append((f"{seq}-0", {b"payload": payload}))
+    fake = _FakeRedis(latest=[("1-0", {b"payload": encode_full(_data(rates, 1))})], batches=[entries])
+    _use(monkeypatch, fake)
+    return rates, ticks
+
+
+async def _collect(conflate: bool, n: int) -> list[dict]:
+    stream = await schema.subscribe(_SUBSCRIPTION, variable_values={"conflate": conflate})
+    updates = []
+    async for result in stream:
+        assert result.errors is None, result.errors
+        updates.append(result.data["curveUpdated"])
+        if len(updates) == n:
+            break
+    await stream.aclose()
+    return updates
+
+
+def test_conflate_delivers_latest_of_a_batch_with_cumulative_deltas(monkeypatch):
+    rates, ticks = _batch_stream(monkeypatch)
+    first, update = asyncio.run(_collect(conflate=True, n=2))
+    assert first["conflatedTicks"] == 0
+    assert update["curve"]["zeroRatesCc"] == ticks[-1]
+    assert update["conflatedTicks"] == 2
+    assert update["rateDeltasCc"][:2] == pytest.approx([0.0002, 0.0002])
+    assert update["rateDeltasBp"][:2] == pytest.approx([2.0, 2.0])
+    assert update["rateDeltasCc"][2:] == [None] * (len(rates) - 2)
+
+
+def test_without_conflate_every_tick_of_a_batch_is_delivered(monkeypatch):
+    rates, ticks = _batch_stream(monkeypatch)
+    updates = asyncio.run(_collect(conflate=False, n=4))[1:]
+    assert [u["curve"]["zeroRatesCc"] for u in updates] == ticks
+    assert [u["conflatedTicks"] for u in updates] == [0, 0, 0]
+    assert [u["rateDeltasBp"][:2] for u in updates] == [
+        [pytest.approx(1.0), None],
+        [None, pytest.approx(2.0)],
+        [pytest.approx(1.0), None],
+    ]
@@ -0,0 +1,262 @@
+"""
+Book benchmark: NPV and risk throughput on synthetic mixed books.
+
+Generates reproducible books of 1k / 100k / 1M trades (ZeroCouponBond,
+FixedFloatSwap, FXForward, LevelPayMortgage, CDS in equal parts) and times:
+
+- npv:      price_batch over the whole book
+- pv01:     PV01Parallel on the USD curve, every trade
+- cs01:     CS01Parallel on the hazard curve, CDS trades
+- fx_delta: FXDelta on EURUSD, FX forwards
+
+Throughput is trades per second (best of --repeat). Peak memory is measured in
+a separate pass under tracemalloc, which slows Python down, so it does not
+affect the timings. Results can be stored as a baseline and later runs checked
+against it; throughput baselines are machine-specific, so compare on the
+machine that produced them.
+
+Run from pricing-library/:
+
+    poetry run python benchmarks/bench_book.py                      # 1k, 100k
+    poetry run python benchmarks/bench_book.py --sizes 1k,100k,1m   # 1M takes minutes
+    poetry run python benchmarks/bench_book.py --save-baseline
+    poetry run python benchmarks/bench_book.py --check              # exit 1 on regression
+
+--check refuses a baseline recorded on a different host, machine or Python version
+(see --save-baseline) rather than failing or passing on hardware differences.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from pricing.curves import HazardRateCurve, ZeroRateCurve
+from pricing.market import Market
+from pricing.pricing import Trade, price_batch
+from pricing.products.bond import ZeroCouponBond
+from pricing.products.cds import CDS
+from pricing.products.fx import FXForward
+from pricing.products.mortgage import LevelPayMortgage
+from pricing.products.swap import FixedFloatSwap
+from pricing.risk import CS01Parallel, FXDelta, PV01Parallel
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SIZES = "1k,100k"
+BASELINE_PATH = Path(__file__).with_name("baseline_book.json")
+
+MeasureFn = Callable[[Sequence[Trade], Market], list[float]]
+
+
+def make_market() -> Market:
+    pillars = [0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0]
+    usd = ZeroRateCurve(
+        name="USD", pillars=pillars, zero_rates_cc=[0.045 - 0.0005 * i for i in range(len(pillars))]
+    )
+    eur = ZeroRateCurve(
+        name="EUR", pillars=pillars, zero_rates_cc=[0.035 - 0.0004 * i for i in range(len(pillars))]
+    )
+    hazard = HazardRateCurve(
+        name="HAZ", pillars=[1.0, 3.0, 5.0, 7.0, 10.0], hazard_rates=[0.010, 0.012, 0.014, 0.015, 0.016]
+    )
+    return Market(curves={"USD": usd, "EUR": eur, "HAZ": hazard}, fx_spot={"EURUSD": 1.08})
+
+
+def _schedule(rng: random.Random, per_year: int, max_years: int) -> list[float]:
+    years = rng.randint(1, max_years)
+    return [(i + 1) / per_year for i in range(years * per_year)]
+
+
+def make_book(n: int, seed: int = 0) -> list[Trade]:
+    """n trades cycling through the five product types, with seeded random terms."""
+    rng = random.Random(seed)
+    book: list[Trade] = []
+    for i in range(n):
+        kind = i % 5
+        notional = rng.choice((-1, 1)) * rng.uniform(1e5, 1e7)
+        if kind == 0:
+            book.append(ZeroCouponBond(curve="USD", maturity=rng.uniform(0.1, 30.0), notional=notional))
+        elif kind == 1:
+            book.append(
+                FixedFloatSwap(
+                    curve="USD", notional=notional, fixed_rate=rng.uniform(0.02, 0.05),
+                    pay_times=_schedule(rng, 2, 30),
+                )
+            )
+        elif kind == 2:
+            book.append(
+                FXForward(
+                    pair="EURUSD", base_curve="EUR", quote_curve="USD", maturity=rng.uniform(0.1, 5.0),
+                    notional_base=notional, strike=rng.uniform(1.0, 1.2),
+                )
+            )
+        elif kind == 3:
+            book.append(
+                LevelPayMortgage(
+                    curve="USD", notional=abs(notional), annual_rate=rng.uniform(0.03, 0.08),
+                    term_years=float(rng.choice((10, 15, 20, 30))), payments_per_year=12,
+                )
+            )
+        else:
+            book.append(
+                CDS(
+                    discount_curve="USD", survival_curve="HAZ", notional=notional,
+                    premium_rate=rng.uniform(0.002, 0.02), pay_times=_schedule(rng, 4, 10),
+                )
+            )
+    return book
+
+
+def _per_trade(measure) -> MeasureFn:
+    return lambda trades, market: [measure.compute(t, market) for t in trades]
+
+
+# name -> (trade filter, evaluation over the filtered trades)
+MEASURES: dict[str, tuple[Callable[[Trade], bool], MeasureFn]] = {
+    "npv": (lambda t: True, price_batch),
+    "pv01": (lambda t: True, _per_trade(PV01Parallel(curve_name="USD"))),
+    "cs01": (lambda t: isinstance(t, CDS), _per_trade(CS01Parallel(hazard_curve_name="HAZ"))),
+    "fx_delta": (lambda t: isinstance(t, FXForward), _per_trade(FXDelta(pair="EURUSD"))),
+}
+
+
+def _best_seconds(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_mib(fn: Callable[[], object]) -> float:
+    """Peak traced allocation while fn runs, in MiB (inputs allocated beforehand are excluded)."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def run(sizes: Sequence[str], repeat: int, memory: bool, seed: int) -> dict[str, dict[str, dict[str, float]]]:
+    """{size: {"book": {...}, measure: {trades, seconds, trades_per_sec[, peak_mib]}}}."""
+    market = make_market()
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for size in sizes:
+        n = SIZES[size]
+        start = time.perf_counter()
+        book = make_book(n, seed)
+        row: dict[str, dict[str, float]] = {"book": {"trades": n, "seconds": time.perf_counter() - start}}
+        if memory:
+            row["book"]["peak_mib"] = _peak_mib(lambda: make_book(n, seed))
+        row["book"]["trades_per_sec"] = n / row["book"]["seconds"]
+        _print_row(size, "book", row["book"])
+        for name, (selected, evaluate) in MEASURES.items():
+            trades = [t for t in book if selected(t)]
+            seconds = _best_seconds(lambda: evaluate(trades, market), repeat)
+            entry = {"trades": len(trades), "seconds": seconds, "trades_per_sec": len(trades) / seconds}
+            if memory:
+                entry["peak_mib"] = _peak_mib(lambda: evaluate(trades, market))
+            row[name] = entry
+            _print_row(size, name, entry)
+        results[size] = row
+    return results
+
+
+def _print_row(size: str, name: str, entry: dict[str, float]) -> None:
+    peak = f"{entry['peak_mib']:>10.1f}" if "peak_mib" in entry else f"{'-':>10}"
+    print(
+        f"{size:<6}{name:<10}{entry['trades']:>9}{entry['seconds']:>10.3f}"
+        f"{entry['trades_per_sec']:>14,.0f}{peak}",
+        flush=True,
+    )
+
+
+def check(
+    results: dict[str, dict[str, dict[str, float]]],
+    baseline: dict[str, dict[str, dict[str, float]]],
+    tolerance: float,
+) -> list[str]:
+    """Regressions: throughput below, or peak memory above, baseline by more than `tolerance`."""
+    problems: list[str] = []
+    for size, row in results.items():
+        for name, entry in row.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None or name == "book":
+                continue
+            if entry["trades_per_sec"] < base["trades_per_sec"] * (1 - tolerance):
+                problems.append(
+                    f"{size}/{name}: {entry['trades_per_sec']:,.0f} trades/s "
+                    f"vs baseline {base['trades_per_sec']:,.0f}"
+                )
+            if "peak_mib" in entry and "peak_mib" in base:
+                if entry["peak_mib"] > base["peak_mib"] * (1 + tolerance):
+                    problems.append(
+                        f"{size}/{name}: peak {entry['peak_mib']:.1f} MiB vs baseline {base['peak_mib']:.1f} MiB"
+                    )
+    return problems
+
+
+def _environment() -> dict[str, str]:
+    """Where a run happened; --check only compares runs from the same environment."""
+    return {"node": platform.node(), "machine": platform.machine(), "python": platform.python_version()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated, from {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 if slower than the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes {unknown}; choose from {list(SIZES)}")
+
+    if args.check:
+        if not args.baseline.exists():
+            sys.exit(f"no baseline at {args.baseline}; run with --save-baseline first")
+        baseline = json.loads(args.baseline.read_text())
+        here = _environment()
+        recorded = {key: baseline.get(key) for key in here}
+        if recorded != here:
+            sys.exit(
+                f"baseline was recorded on {recorded}, this run is {here}; "
+                "run with --save-baseline on this machine first"
+            )
+
+    print(f"{'size':<6}{'measure':<10}{'trades':>9}{'seconds':>10}{'trades/s':>14}{'peak MiB':>10}")
+    results = run(sizes, args.repeat, memory=not args.no_memory, seed=args.seed)
+
+    if args.save_baseline:
+        stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        stored.setdefault("results", {}).update(results)
+        stored.update(_environment())
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+    if args.check:
+        problems = check(results, baseline["results"], args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+        print("no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
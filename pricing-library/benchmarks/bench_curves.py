@@ -0,0 +1,99 @@
+"""
+Curve lookup benchmark: linear pillar scan vs binary search.
+
+Times `zero_rate_cc` and `hazard_rate` on curves with 5, 50 and 500 pillars,
+against a reference copy of the original O(n) scan, to show where the
+binary-search lookup starts to pay off.
+
+Run from pricing-library/:
+
+    poetry run python benchmarks/bench_curves.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+from pricing.curves import HazardRateCurve, ZeroRateCurve
+
+PILLAR_COUNTS = (5, 50, 500)
+N_TIMES = 1_000
+
+
+def _linear_zero_rate(curve: ZeroRateCurve, t: float) -> float:
+    """Reference: the original linear-scan interpolation."""
+    pillars, rates = curve.pillars, curve.zero_rates_cc
+    if t <= pillars[0]:
+        return rates[0]
+    if t >= pillars[-1]:
+        return rates[-1]
+    for i in range(len(pillars) - 1):
+        if pillars[i] <= t <= pillars[i + 1]:
+            t0, t1 = pillars[i], pillars[i + 1]
+            r0, r1 = rates[i], rates[i + 1]
+            return r0 + (r1 - r0) * (t - t0) / (t1 - t0)
+    return rates[-1]
+
+
+def _linear_hazard_rate(curve: HazardRateCurve, t: float) -> float:
+    """Reference: the original linear-scan hazard lookup."""
+    pillars, rates = curve.pillars, curve.hazard_rates
+    if t <= pillars[0]:
+        return rates[0]
+    if t >= pillars[-1]:
+        return rates[-1]
+    for i in range(len(pillars) - 1):
+        if pillars[i] <= t <= pillars[i + 1]:
+            return rates[i]
+    return rates[-1]
+
+
+def _curves(n_pillars: int, horizon: float = 30.0) -> tuple[ZeroRateCurve, HazardRateCurve]:
+    pillars = [horizon * (i + 1) / n_pillars for i in range(n_pillars)]
+    zero = ZeroRateCurve(
+        name="BENCH",
+        pillars=pillars,
+        zero_rates_cc=[0.03 + 0.01 * i / n_pillars for i in range(n_pillars)],
+    )
+    hazard = HazardRateCurve(
+        name="BENCH_HAZ",
+        pillars=pillars,
+        hazard_rates=[0.01 + 0.005 * i / n_pillars for i in range(n_pillars)],
+    )
+    return zero, hazard
+
+
+def _per_call_ns(fn, times: list[float], repeat: int) -> float:
+    """Best-of-`repeat` cost per lookup in nanoseconds."""
+    best = min(
+        timeit.repeat(lambda: [fn(t) for t in times], number=1, repeat=repeat)
+    )
+    return best / len(times) * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    times = [rng.uniform(0.0, 30.0) for _ in range(N_TIMES)]
+
+    print(f"{'curve':<16}{'pillars':>8}{'linear ns':>12}{'bisect ns':>12}{'speedup':>9}")
+    for n in PILLAR_COUNTS:
+        zero, hazard = _curves(n)
+        rows = [
+            ("zero_rate_cc", lambda t, c=zero: _linear_zero_rate(c, t), zero.zero_rate_cc),
+            ("hazard_rate", lambda t, c=hazard: _linear_hazard_rate(c, t), hazard.hazard_rate),
+        ]
+        for label, linear, bisected in rows:
+            lin = _per_call_ns(linear, times, args.repeat)
+            bis = _per_call_ns(bisected, times, args.repeat)
+            print(f"{label:<16}{n:>8}{lin:>12.0f}{bis:>12.0f}{lin / bis:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Mortgage pool benchmark: heterogeneous loans, one distinct rate per loan.
+
+Times MortgagePricer.npv_pool and pool_cashflows on pools of 10k / 100k
+monthly loans with continuous random rates (every loan its own shape) and
+10/15/20/30-year terms, with no prepayment, a constant CPR and a PSA ramp.
+--reference also times a copy of the original scalar amortization (one loop per
+loan and period) on the npv_pool side, to show the column-wise speedup.
+
+Run from pricing-library/:
+
+    poetry run python benchmarks/bench_mortgage_pool.py
+    poetry run python benchmarks/bench_mortgage_pool.py --sizes 10k --reference
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from array import array
+from collections.abc import Callable
+
+from pricing.amortization import _annuity, payment_times, pool_cashflows
+from pricing.curves import ZeroRateCurve, discount_factors
+from pricing.market import Market
+from pricing.pricers import MortgagePricer
+from pricing.products.mortgage import MortgagePool, Prepayment
+
+SIZES = {"10k": 10_000, "100k": 100_000}
+DEFAULT_SIZES = "10k,100k"
+PREPAYMENTS: dict[str, Prepayment | None] = {
+    "none": None,
+    "cpr6": Prepayment(cpr=0.06),
+    "psa150": Prepayment(psa=150),
+}
+
+
+def make_market() -> Market:
+    pillars = [0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0]
+    usd = ZeroRateCurve(
+        name="USD", pillars=pillars, zero_rates_cc=[0.045 - 0.0005 * i for i in range(len(pillars))]
+    )
+    return Market(curves={"USD": usd})
+
+
+def make_pool(n: int, prepayment: Prepayment | None, seed: int = 0) -> MortgagePool:
+    """n monthly loans with distinct random rates in [3%, 8%) and 10-30 year terms."""
+    rng = random.Random(seed)
+    return MortgagePool(
+        curve="USD",
+        notionals=array("d", (rng.uniform(1e5, 1e6) for _ in range(n))),
+        annual_rates=array("d", (rng.uniform(0.03, 0.08) for _ in range(n))),
+        periods=array("q", (12 * rng.choice((10, 15, 20, 30)) for _ in range(n))),
+        payments_per_year=array("q", [12] * n),
+        prepayment=prepayment,
+    )
+
+
+def _scalar_npv_pool(pool: MortgagePool, market: Market) -> list[float]:
+    """Reference: amortize each loan on its own, one Python step per period."""
+    dfs = discount_factors(market.curve(pool.curve), payment_times(max(pool.periods), 12))
+    npvs = []
+    for notional, rate, periods in zip(pool.notionals, pool.annual_rates, pool.periods):
+        r, bal, pv = rate / 12, 1.0, 0.0
+        for k in range(periods):
+            interest = bal * r
+            principal = bal * (_annuity(r, periods - k) - r) if k < periods - 1 else bal
+            smm = pool.prepayment.smm(k + 1, 12) if pool.prepayment is not None else 0.0
+            early = (bal - principal) * smm if k < periods - 1 else 0.0
+            bal -= principal + early
+            pv += (interest + principal + early) * dfs[k]
+        npvs.append(notional * pv)
+    return npvs
+
+
+def _seconds(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated, from {list(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reference", action="store_true", help="also time the scalar per-loan loop (slow)")
+    args = parser.parse_args()
+
+    market = make_market()
+    header = f"{'size':<8}{'prepayment':<12}{'npv_pool s':>12}{'cashflows s':>13}"
+    print(header + (f"{'scalar s':>11}{'speedup':>9}" if args.reference else ""))
+    for size in args.sizes.split(","):
+        for label, prepayment in PREPAYMENTS.items():
+            pool = make_pool(SIZES[size], prepayment, args.seed)
+            npv = _seconds(lambda: MortgagePricer.npv_pool(pool, market), args.repeat)
+            flows = _seconds(lambda: pool_cashflows(pool), args.repeat)
+            row = f"{size:<8}{label:<12}{npv:>12.2f}{flows:>13.2f}"
+            if args.reference:
+                scalar = _seconds(lambda: _scalar_npv_pool(pool, market), 1)
+                row += f"{scalar:>11.2f}{scalar / npv:>8.1f}x"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,33 @@
 """Pricing library: curves, market, products, pricing engine, and risk."""
 
-from pricing.curves import HazardRateCurve, ZeroRateCurve
-from pricing.engine import PricingEngine, create_default_engine
-from pricing.interfaces import Curve, Instrument, Pricer, RiskMeasure
+from pricing.amortization import MortgageCashflows, loan_cashflows, pool_cashflows
+from pricing.curves import HazardRateCurve, ZeroRateCurve, discount_factors
+from pricing.engine import DispatchStats, PricingEngine, create_default_engine
+from pricing.hooks import (
+    CallCounter,
+    HookCall,
+    HookRegistry,
+    PricingHook,
+    ProfilingHook,
+    TimingHook,
+)
+from pricing.interfaces import BatchCurve, Curve, Instrument, Pricer, RiskMeasure
+from pricing.incremental import IncrementalBook, IncrementalStats
 from pricing.market import Market
 from pricing.pricers import BasePricer
-from pricing.pricing import price, Trade
+from pricing.pricing import add_hook, price, price_batch, remove_hook, Trade
 from pricing.products.bond import ZeroCouponBond
-from pricing.products.cds import CDS
+from pricing.products.cds import CDS, CDSBlock
 from pricing.products.fx import FXForward
-from pricing.products.mortgage import LevelPayMortgage
-from pricing.products.swap import FixedFloatSwap
+from pricing.products.mortgage import LevelPayMortgage, MortgagePool, Prepayment
+from pricing.products.swap import FixedFloatSwap, SwapBlock
+from pricing.replines import RECONCILE_RTOL, RepLine, npv_rep_lines, reconcile_rep_lines, rep_lines
 from pricing.risk import (
     CS01Parallel,
     FXDelta,
+    KeyRatePV01,
     PV01Parallel,
+    compute_risks,
     cs01_parallel,
     fx_delta,
     pv01_parallel,
@@ -22,25 +35,53 @@ from pricing.risk import (
 
 __all__ = [
     "Curve",
+    "BatchCurve",
     "Instrument",
     "Pricer",
     "RiskMeasure",
     "ZeroRateCurve",
     "HazardRateCurve",
+    "discount_factors",
     "PricingEngine",
+    "DispatchStats",
     "create_default_engine",
+    "HookCall",
+    "HookRegistry",
+    "PricingHook",
+    "CallCounter",
+    "TimingHook",
+    "ProfilingHook",
     "Market",
     "BasePricer",
     "price",
+    "price_batch",
+    "add_hook",
+    "remove_hook",
     "Trade",
     "ZeroCouponBond",
     "CDS",
+    "CDSBlock",
     "FixedFloatSwap",
+    "SwapBlock",
     "FXForward",
     "LevelPayMortgage",
+    "MortgagePool",
+    "Prepayment",
+    "MortgageCashflows",
+    "loan_cashflows",
+    "pool_cashflows",
+    "RepLine",
+    "rep_lines",
+    "npv_rep_lines",
+    "reconcile_rep_lines",
+    "RECONCILE_RTOL",
+    "IncrementalBook",
+    "IncrementalStats",
     "PV01Parallel",
     "FXDelta",
     "CS01Parallel",
+    "KeyRatePV01",
+    "compute_risks",
     "pv01_parallel",
     "fx_delta",
     "cs01_parallel",
@@ -0,0 +1,240 @@
+"""
+Mortgage amortization: scheduled and prepaid cashflows for single loans and pools.
+
+A level-pay loan's cashflows are proportional to its notional, so loans are
+amortized per unit of notional. Per period k, on the opening balance B:
+
+    interest            = B * r
+    scheduled principal = B * annuity(r, periods left) - interest
+    prepaid principal   = (B - scheduled principal) * SMM(k)
+
+and the last period pays the whole remaining balance. Re-amortizing the
+scheduled payment keeps the balance at Q(k) * S(k), where S(k) = (G - g^k) / (G - 1)
+(g = 1 + r, G = g^periods) is the balance with no prepayment and Q(k) the
+fraction surviving prepayment, which depends only on the period and frequency.
+The cash paid in period k is Q(k-1) * (level payment + SMM(k) * S(k)).
+
+Pools are therefore amortized column-wise: loans of one term share one loop
+over periods that advances g^k - 1 for all of them at once (map over arrays,
+no per-loan Python loop) and shares Q(k) and SMM(k). With no prepayment the payment is the constant level
+payment (level_payment), so pricing needs no per-period loop.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from operator import add, mul
+
+from pricing.products.mortgage import LevelPayMortgage, MortgagePool, Prepayment
+
+
+@dataclass(frozen=True)
+class MortgageCashflows:
+    """Per-period cashflow arrays (index k = payment k + 1, paid at times[k])."""
+
+    times: array
+    interest: array
+    scheduled_principal: array
+    prepaid_principal: array
+    balance: array  # closing balance after the payment
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def total(self) -> array:
+        """Total cash received per period."""
+        return array(
+            "d",
+            (
+                i + s + p
+                for i, s, p in zip(self.interest, self.scheduled_principal, self.prepaid_principal)
+            ),
+        )
+
+
+def _annuity(r: float, periods_left: int) -> float:
+    """Level payment per unit of balance over `periods_left` periods at periodic rate r."""
+    if r == 0:
+        return 1.0 / periods_left
+    return r / -math.expm1(-periods_left * math.log1p(r))
+
+
+def level_payment(annual_rate: float, periods: int, payments_per_year: int) -> float:
+    """Constant payment per unit of notional of a loan with no prepayment."""
+    return _annuity(annual_rate / payments_per_year, periods)
+
+
+def _prepayment_factors(
+    periods: int, payments_per_year: int, prepayment: Prepayment | None
+) -> tuple[array, array]:
+    """
+    SMM per period (index k = payment k + 1) and the fraction of the balance
+    surviving prepayment after k payments (index k, 1.0 at k = 0).
+    """
+    if prepayment is None:
+        smm = array("d", bytes(8 * periods))
+    else:
+        smm = array("d", (prepayment.smm(k, payments_per_year) for k in range(1, periods + 1)))
+    survival = array("d", [1.0])
+    for s in smm:
+        survival.append(survival[-1] * (1.0 - s))
+    return smm, survival
+
+
+def _term_schedule(
+    annual_rates: Sequence[float],
+    notionals: Sequence[float],
+    periods: int,
+    payments_per_year: int,
+    prepayment: Prepayment | None,
+) -> tuple[array, array, array, array]:
+    """
+    Summed (interest, scheduled principal, prepaid principal, closing balance)
+    arrays of loans sharing one term, amortized together period by period.
+    """
+    smm, survival = _prepayment_factors(periods, payments_per_year, prepayment)
+    # With E = G - 1 and p(k) = g^k - 1, S(k) = 1 - p(k) / E: track p(k) for all
+    # nonzero-rate loans; zero-rate loans pay down linearly.
+    rates, weights, rate_weights = [], [], []
+    zero_rate = 0.0
+    for rate, notional in zip(annual_rates, notionals):
+        r = rate / payments_per_year
+        if r == 0:
+            zero_rate += notional
+            continue
+        weight = notional / math.expm1(periods * math.log1p(r))
+        rates.append(r)
+        weights.append(weight)
+        rate_weights.append(r * weight)
+    growth = [1.0 + r for r in rates]
+    columns = tuple(array("d", bytes(8 * periods)) for _ in range(4))
+    interest, scheduled, prepaid, balance = columns
+    level = sum(notionals) - zero_rate
+    rate_level = sum(rate / payments_per_year * n for rate, n in zip(annual_rates, notionals))
+    powers = [0.0] * len(rates)
+    opening, opening_interest = level + zero_rate, rate_level
+    for k in range(periods):
+        powers = list(map(add, map(mul, powers, growth), rates))
+        if k == periods - 1:
+            closing = closing_interest = 0.0  # the last payment repays the remaining balance
+        else:
+            closing = level - sum(map(mul, weights, powers)) + zero_rate * (periods - k - 1) / periods
+            closing_interest = rate_level - sum(map(mul, rate_weights, powers))
+        q = survival[k]
+        interest[k] = q * opening_interest
+        scheduled[k] = q * (opening - closing)
+        prepaid[k] = q * smm[k] * closing
+        balance[k] = survival[k + 1] * closing
+        opening, opening_interest = closing, closing_interest
+    return columns
+
+
+def unit_values(
+    annual_rates: Sequence[float],
+    periods: int,
+    payments_per_year: int,
+    prepayment: Prepayment | None,
+    dfs: Sequence[float],
+) -> list[float]:
+    """
+    PV per unit of notional of loans at each rate (one term and frequency),
+    dfs[k] being the discount factor of payment k + 1.
+
+    PV = level * sum Q(k-1) DF(k) + sum SMM(k) Q(k-1) DF(k) S(k); the second sum
+    is a polynomial in g per loan, evaluated for all loans at once (Horner, one
+    pass over the periods).
+    """
+    smm, survival = _prepayment_factors(periods, payments_per_year, prepayment)
+    level_weight = sum(q * df for q, df in zip(survival, dfs[:periods]))
+    prepaid_weights = [s * q * df for s, q, df in zip(smm, survival, dfs[:periods - 1])]
+    prepaid_total = sum(prepaid_weights)
+    rates = [rate / payments_per_year for rate in annual_rates]
+    growth = [1.0 + r for r in rates]
+    # horner[j] = sum over k < periods of prepaid_weights[k - 1] * (g_j^k - 1), built from
+    # the top term down with suffix sums of the weights (every term is non-negative).
+    horner = [0.0] * len(rates)
+    suffix = 0.0
+    for w in reversed(prepaid_weights):
+        suffix += w
+        horner = [h * g + suffix * r for h, g, r in zip(horner, growth, rates)]
+    values = []
+    for rate, r, h in zip(annual_rates, rates, horner):
+        if r == 0:
+            values.append(
+                (level_weight + sum(w * (periods - k) for k, w in enumerate(prepaid_weights, 1))) / periods
+            )
+            continue
+        values.append(
+            level_payment(rate, periods, payments_per_year) * level_weight
+            + prepaid_total
+            - h / math.expm1(periods * math.log1p(r))
+        )
+    return values
+
+
+def unit_schedule(
+    annual_rate: float,
+    periods: int,
+    payments_per_year: int,
+    prepayment: Prepayment | None = None,
+) -> tuple[array, array, array, array]:
+    """
+    (interest, scheduled principal, prepaid principal, closing balance) arrays
+    for one unit of notional.
+    """
+    return _term_schedule([annual_rate], [1.0], periods, payments_per_year, prepayment)
+
+
+def payment_times(periods: int, payments_per_year: int) -> array:
+    """Payment times k / payments_per_year for k = 1..periods."""
+    return array("d", [k / payments_per_year for k in range(1, periods + 1)])
+
+
+def unit_payments(
+    annual_rate: float,
+    periods: int,
+    payments_per_year: int,
+    prepayment: Prepayment | None = None,
+) -> array:
+    """Total cash per unit of notional and period (interest + all principal)."""
+    if prepayment is None:
+        return array("d", [level_payment(annual_rate, periods, payments_per_year)]) * periods
+    interest, scheduled, prepaid, _ = unit_schedule(annual_rate, periods, payments_per_year, prepayment)
+    return array("d", map(sum, zip(interest, scheduled, prepaid)))
+
+
+def loan_cashflows(m: LevelPayMortgage) -> MortgageCashflows:
+    """Cashflow arrays of one loan under its own prepayment assumption."""
+    columns = unit_schedule(m.annual_rate, m.periods, m.payments_per_year, m.prepayment)
+    scaled = [array("d", (m.notional * x for x in col)) for col in columns]
+    return MortgageCashflows(payment_times(m.periods, m.payments_per_year), *scaled)
+
+
+def pool_cashflows(pool: MortgagePool) -> MortgageCashflows:
+    """
+    Aggregate cashflow arrays of a pool on its common payment grid.
+
+    All loans must share one payment frequency. Loans of the same shape
+    (MortgagePool.shapes) are merged, and the shapes of each term are amortized
+    together column-wise (see _term_schedule), so the Python loop runs over
+    periods per distinct term, not per loan or rate.
+    """
+    frequencies = set(pool.payments_per_year)
+    if len(frequencies) != 1:
+        raise ValueError("pool_cashflows needs loans with one payment frequency")
+    (freq,) = frequencies
+    horizon = max(pool.periods)
+    terms: dict[int, tuple[list[float], list[float]]] = {}
+    for (rate, periods, _), members in pool.shapes().items():
+        rates, notionals = terms.setdefault(periods, ([], []))
+        rates.append(rate)
+        notionals.append(sum(pool.notionals[i] for i in members))
+    totals = [array("d", bytes(8 * horizon)) for _ in range(4)]
+    for periods, (rates, notionals) in terms.items():
+        for total, col in zip(totals, _term_schedule(rates, notionals, periods, freq, pool.prepayment)):
+            total[:periods] = array("d", map(add, total[:periods], col))
+    return MortgageCashflows(payment_times(horizon, freq), *totals)
@@ -0,0 +1,175 @@
+"""
+Wire encoding of curve snapshots in the `curve_updates:<name>` Redis streams.
+
+Used by the marketdata service (writer and fan-out reader) and the pricing API
+(portfolioPriced reader), so both sides share one definition of the format.
+
+Binary payloads are little-endian and start with a one-byte magic and a
+schema version, then a kind byte and the writer's sequence number:
+
+    header   B magic (0xCB), B version (2), B kind, Q seq, H name length, name (UTF-8)
+    FULL     d t0, I n, n x d pillars, n x d zero rates (cc)
+    DELTA    Q base seq, d t0, I n, I pillars crc32, I m, m x H pillar index, m x d new rate
+
+A DELTA carries only the changed pillars' new rates and applies only to the
+entry it follows: the reader's last curve must have sequence number `base seq`,
+the same name, t0 and pillars (checked by count and CRC-32). A reader that
+missed an entry (stream trimmed, read retried past it) therefore skips deltas
+until the next FULL instead of drifting silently. Writers send a FULL
+periodically so late joiners resynchronize. Legacy JSON payloads ({"name",
+"pillars", "zero_rates_cc", "t0"}) are still decoded (without a sequence number).
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+MAGIC = 0xCB
+VERSION = 2
+FULL = 0
+DELTA = 1
+
+_HEADER = struct.Struct("<BBBQH")
+_FULL_HEAD = struct.Struct("<dI")
+_DELTA_HEAD = struct.Struct("<QdIII")
+
+
+@dataclass(frozen=True)
+class CurveData:
+    """Plain curve snapshot as carried on the wire; `seq` is the writer's sequence number."""
+
+    name: str
+    pillars: tuple[float, ...]
+    zero_rates_cc: tuple[float, ...]
+    t0: float = 0.0
+    seq: Optional[int] = None
+
+
+def _pillars_crc(pillars: tuple[float, ...]) -> int:
+    return zlib.crc32(struct.pack(f"<{len(pillars)}d", *pillars))
+
+
+def _header(kind: int, curve: CurveData) -> bytes:
+    if curve.seq is None:
+        raise ValueError("binary payloads need a sequence number (CurveData.seq)")
+    raw = curve.name.encode()
+    return _HEADER.pack(MAGIC, VERSION, kind, curve.seq, len(raw)) + raw
+
+
+def encode_full(curve: CurveData) -> bytes:
+    """FULL binary payload for `curve`."""
+    n = len(curve.pillars)
+    if len(curve.zero_rates_cc) != n:
+        raise ValueError("pillars and zero_rates_cc must have the same length")
+    return b"".join(
+        (
+            _header(FULL, curve),
+            _FULL_HEAD.pack(curve.t0, n),
+            struct.pack(f"<{n}d", *curve.pillars),
+            struct.pack(f"<{n}d", *curve.zero_rates_cc),
+        )
+    )
+
+
+def encode_delta(previous: CurveData, curve: CurveData) -> Optional[bytes]:
+    """
+    DELTA payload taking `previous` (the entry published just before) to `curve`,
+    or None when a delta cannot express the change (different name, t0 or
+    pillars, or `previous` has no sequence number).
+    """
+    if (
+        previous.seq is None
+        or previous.name != curve.name
+        or previous.t0 != curve.t0
+        or tuple(previous.pillars) != tuple(curve.pillars)
+        or len(curve.zero_rates_cc) != len(curve.pillars)
+    ):
+        return None
+    changed = [
+        (i, new) for i, (old, new) in enumerate(zip(previous.zero_rates_cc, curve.zero_rates_cc)) if new != old
+    ]
+    m = len(changed)
+    pillars = tuple(curve.pillars)
+    return b"".join(
+        (
+            _header(DELTA, curve),
+            _DELTA_HEAD.pack(previous.seq, curve.t0, len(pillars), _pillars_crc(pillars), m),
+            struct.pack(f"<{m}H", *(i for i, _ in changed)),
+            struct.pack(f"<{m}d", *(v for _, v in changed)),
+        )
+    )
+
+
+def encode_json(curve: CurveData) -> str:
+    """Legacy JSON payload."""
+    return json.dumps({
+        "name": curve.name,
+        "pillars": list(curve.pillars),
+        "zero_rates_cc": list(curve.zero_rates_cc),
+        "t0": curve.t0,
+    })
+
+
+def _decode_json(payload: Union[bytes, str]) -> Optional[CurveData]:
+    try:
+        d: dict[str, Any] = json.loads(payload)
+        return CurveData(
+            name=d["name"],
+            pillars=tuple(d["pillars"]),
+            zero_rates_cc=tuple(d["zero_rates_cc"]),
+            t0=d.get("t0", 0.0),
+        )
+    except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError):
+        return None
+
+
+def is_delta(payload: Union[bytes, str]) -> bool:
+    """True for a binary DELTA payload (needs a base curve to decode)."""
+    return isinstance(payload, bytes) and len(payload) >= 3 and payload[0] == MAGIC and payload[2] == DELTA
+
+
+def decode(payload: Union[bytes, str], base: Optional[CurveData] = None) -> Optional[CurveData]:
+    """
+    Curve for a payload (binary FULL/DELTA or legacy JSON); None if invalid, of
+    an unknown version, or a DELTA whose `base` is missing or not the entry it follows.
+    """
+    if isinstance(payload, str) or not payload or payload[0] != MAGIC:
+        return _decode_json(payload)
+    try:
+        _, version, kind, seq, name_len = _HEADER.unpack_from(payload, 0)
+        if version != VERSION:
+            return None
+        offset = _HEADER.size
+        name = payload[offset:offset + name_len].decode()
+        offset += name_len
+        if kind == FULL:
+            t0, n = _FULL_HEAD.unpack_from(payload, offset)
+            offset += _FULL_HEAD.size
+            pillars = struct.unpack_from(f"<{n}d", payload, offset)
+            rates = struct.unpack_from(f"<{n}d", payload, offset + 8 * n)
+            return CurveData(name=name, pillars=pillars, zero_rates_cc=rates, t0=t0, seq=seq)
+        if kind == DELTA:
+            base_seq, t0, n, crc, m = _DELTA_HEAD.unpack_from(payload, offset)
+            if (
+                base is None
+                or base.seq != base_seq
+                or base.name != name
+                or base.t0 != t0
+                or len(base.pillars) != n
+                or _pillars_crc(tuple(base.pillars)) != crc
+            ):
+                return None
+            offset += _DELTA_HEAD.size
+            indices = struct.unpack_from(f"<{m}H", payload, offset)
+            values = struct.unpack_from(f"<{m}d", payload, offset + 2 * m)
+            rates = list(base.zero_rates_cc)
+            for i, v in zip(indices, values):
+                rates[i] = v
+            return CurveData(name=name, pillars=base.pillars, zero_rates_cc=tuple(rates), t0=t0, seq=seq)
+    except (struct.error, UnicodeDecodeError, IndexError):
+        return None
+    return None
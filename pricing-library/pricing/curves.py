@@ -13,6 +13,8 @@ focused on clean interfaces rather than full-blown market conventions
 """
 
 import math
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 from pricing.interfaces import Curve
@@ -27,6 +29,8 @@ class ZeroRateCurve:
     - `zero_rates_cc[i]` is the CC zero rate at `pillars[i]`.
     - `t0` is kept for completeness (reference time) but this curve assumes the
       caller passes times already measured from that reference.
+    - Segment slopes are precomputed at construction, so treat pillars/rates as
+      read-only afterwards (use `bumped` to derive new curves).
 
     Implements Curve protocol structurally (no explicit inheritance).
     """
@@ -38,6 +42,12 @@ class ZeroRateCurve:
 
     def __post_init__(self) -> None:
         self._validate()
+        # slopes[i] is the rate gradient on [pillars[i], pillars[i + 1]].
+        self._slopes = [
+            (self.zero_rates_cc[i + 1] - self.zero_rates_cc[i])
+            / (self.pillars[i + 1] - self.pillars[i])
+            for i in range(len(self.pillars) - 1)
+        ]
 
     def _validate(self) -> None:
         if len(self.pillars) != len(self.zero_rates_cc):
@@ -61,15 +71,12 @@ class ZeroRateCurve:
             return self.zero_rates_cc[0]
         if t >= self.pillars[-1]:
             return self.zero_rates_cc[-1]
-        for i in range(len(self.pillars) - 1):
-            if self.pillars[i] <= t <= self.pillars[i + 1]:
-                t0, t1 = self.pillars[i], self.pillars[i + 1]
-                r0, r1 = self.zero_rates_cc[i], self.zero_rates_cc[i + 1]
-                # Linear interpolation in *rates* (not discount factors).
-                # This is a common simple choice for toy curves; production systems
-                # often interpolate log-DFs or use splines.
-                return r0 + (r1 - r0) * (t - t0) / (t1 - t0)
-        return self.zero_rates_cc[-1]
+        # Binary search for the segment: pillars[i] <= t < pillars[i + 1].
+        i = bisect_right(self.pillars, t) - 1
+        # Linear interpolation in *rates* (not discount factors).
+        # This is a common simple choice for toy curves; production systems
+        # often interpolate log-DFs or use splines.
+        return self.zero_rates_cc[i] + self._slopes[i] * (t - self.pillars[i])
 
     def df(self, t: float) -> float:
         r"""
@@ -81,6 +88,71 @@ class ZeroRateCurve:
         r = self.zero_rate_cc(t)
         return math.exp(-r * t)
 
+    def log_df_derivative(self, t: float) -> float:
+        """
+        d ln DF(t) / d bump for the parallel shift applied by `bumped`.
+
+        A parallel shift moves r(t) by the bump at every t (interpolation and flat
+        extrapolation preserve it), so d DF/d bump = -t * DF(t).
+        """
+        if t < 0:
+            raise ValueError("t must be >= 0")
+        return -t
+
+    def pillar_log_df_derivatives(self, t: float) -> list[tuple[int, float]]:
+        """
+        Sparse key-rate derivatives: (pillar index, d ln DF(t) / d bump of that pillar).
+
+        With linear interpolation r(t) = w * r_i + (1 - w) * r_{i+1}, so a bump to
+        pillar k moves ln DF(t) by -t * w_k. At most two pillars are non-zero and
+        the weights sum to one (they add up to `log_df_derivative`).
+        """
+        if t < 0:
+            raise ValueError("t must be >= 0")
+        if not self.pillars:
+            raise ValueError("curve has no pillars")
+        if t <= self.pillars[0]:
+            return [(0, -t)]
+        if t >= self.pillars[-1]:
+            return [(len(self.pillars) - 1, -t)]
+        i = bisect_right(self.pillars, t) - 1
+        w = (self.pillars[i + 1] - t) / (self.pillars[i + 1] - self.pillars[i])
+        return [(i, -t * w), (i + 1, -t * (1.0 - w))]
+
+    def zero_rates_many(self, times: Sequence[float]) -> list[float]:
+        """
+        Batch version of `zero_rate_cc` for a sequence of times.
+
+        Each time is located with a binary search over the pillars (the stdlib
+        equivalent of a `searchsorted`), so a 360-payment mortgage costs one call
+        and 360 O(log n) lookups instead of 360 linear scans.
+        """
+        if not self.pillars:
+            raise ValueError("curve has no pillars")
+        ts = list(times)
+        if ts and min(ts) < 0:
+            raise ValueError("t must be >= 0")
+        pillars = self.pillars
+        rates = self.zero_rates_cc
+        slopes = self._slopes
+        first, last = pillars[0], pillars[-1]
+        out: list[float] = []
+        for t in ts:
+            if t <= first:
+                out.append(rates[0])
+            elif t >= last:
+                out.append(rates[-1])
+            else:
+                i = bisect_right(pillars, t) - 1
+                out.append(rates[i] + slopes[i] * (t - pillars[i]))
+        return out
+
+    def df_many(self, times: Sequence[float]) -> list[float]:
+        """Batch version of `df`: DF(t_i) = exp(-r(t_i)*t_i) for each time."""
+        ts = list(times)
+        exp = math.exp
+        return [exp(-r * t) for r, t in zip(self.zero_rates_many(ts), ts)]
+
     def bumped(self, bump: float) -> "ZeroRateCurve":
         """
         Return a new curve with a *parallel* additive shift to all zero rates.
@@ -96,6 +168,17 @@ class ZeroRateCurve:
             t0=self.t0,
         )
 
+    def bumped_at(self, index: int, bump: float) -> "ZeroRateCurve":
+        """Return a new curve with `bump` added to the zero rate at `pillars[index]` only."""
+        new_rates = list(self.zero_rates_cc)
+        new_rates[index] += bump
+        return ZeroRateCurve(
+            name=self.name,
+            pillars=list(self.pillars),
+            zero_rates_cc=new_rates,
+            t0=self.t0,
+        )
+
 
 @dataclass
 class HazardRateCurve:
@@ -108,6 +191,8 @@ class HazardRateCurve:
     - pillars[i], hazard_rates[i]: hazard is hazard_rates[i] in segment [prev, pillars[i]]
       (prev=0 for first segment, then pillars[i-1]).
     - bumped(bump) adds `bump` to all hazard rates (absolute; 1bp = 0.0001).
+    - The cumulative hazard at each pillar is precomputed at construction, so treat
+      pillars/hazard_rates as read-only afterwards (use `bumped` to derive new curves).
     """
 
     name: str
@@ -117,6 +202,20 @@ class HazardRateCurve:
 
     def __post_init__(self) -> None:
         self._validate()
+        # _starts[i] is where segment i begins (t0, then the previous pillar);
+        # _cum_hazard[i] is the integral of the hazard from t0 to pillars[i] and
+        # _cum_time[i] the time covered by that integral (the unit-hazard integral).
+        self._starts = [self.t0, *self.pillars[:-1]]
+        self._cum_hazard: list[float] = []
+        self._cum_time: list[float] = []
+        integral = 0.0
+        covered = 0.0
+        for start, end, h in zip(self._starts, self.pillars, self.hazard_rates):
+            if end > start:
+                integral += h * (end - start)
+                covered += end - start
+            self._cum_hazard.append(integral)
+            self._cum_time.append(covered)
 
     def _validate(self) -> None:
         if len(self.pillars) != len(self.hazard_rates):
@@ -135,10 +234,8 @@ class HazardRateCurve:
             return self.hazard_rates[0]
         if t >= self.pillars[-1]:
             return self.hazard_rates[-1]
-        for i in range(len(self.pillars) - 1):
-            if self.pillars[i] <= t <= self.pillars[i + 1]:
-                return self.hazard_rates[i]
-        return self.hazard_rates[-1]
+        # Binary search for the segment: pillars[i] < t <= pillars[i + 1].
+        return self.hazard_rates[bisect_left(self.pillars, t) - 1]
 
     def df(self, t: float) -> float:
         """
@@ -149,19 +246,73 @@ class HazardRateCurve:
             return 1.0
         if not self.pillars:
             raise ValueError("curve has no pillars")
-        # Piecewise integral: hazard_rates[i] applies in [prev, pillars[i]]
-        integral = 0.0
-        prev = self.t0
-        for i in range(len(self.pillars)):
-            t_end = min(self.pillars[i], t)
-            if t_end > prev:
-                integral += self.hazard_rates[i] * (t_end - prev)
-            prev = self.pillars[i]
-            if prev >= t:
-                break
-        if t > self.pillars[-1]:
-            integral += self.hazard_rates[-1] * (t - self.pillars[-1])
-        return math.exp(-integral)
+        return math.exp(-self._integral(t))
+
+    def _integral(self, t: float) -> float:
+        """Cumulative hazard from t0 to t (t > 0): cached pillar integral + one segment."""
+        # hazard_rates[i] applies in [starts[i], pillars[i]]; i = first pillar >= t.
+        i = bisect_left(self.pillars, t)
+        if i == len(self.pillars):
+            return self._cum_hazard[-1] + self.hazard_rates[-1] * (t - self.pillars[-1])
+        integral = self._cum_hazard[i - 1] if i > 0 else 0.0
+        if t > self._starts[i]:
+            integral += self.hazard_rates[i] * (t - self._starts[i])
+        return integral
+
+    def log_df_derivative(self, t: float) -> float:
+        """
+        d ln S(t) / d bump for the parallel hazard shift applied by `bumped`.
+
+        Every covered unit of time picks up the bump, so this is minus the length
+        of [t0, t] covered by the hazard integral.
+        """
+        if t <= 0:
+            return 0.0
+        if not self.pillars:
+            raise ValueError("curve has no pillars")
+        i = bisect_left(self.pillars, t)
+        if i == len(self.pillars):
+            return -(self._cum_time[-1] + (t - self.pillars[-1]))
+        covered = self._cum_time[i - 1] if i > 0 else 0.0
+        if t > self._starts[i]:
+            covered += t - self._starts[i]
+        return -covered
+
+    def pillar_log_df_derivatives(self, t: float) -> list[tuple[int, float]]:
+        """
+        Sparse key-rate derivatives: (pillar index, d ln S(t) / d bump of that hazard).
+
+        hazard_rates[k] applies on its segment (the last one extends flat past the
+        final pillar), so the derivative is minus the overlap of that segment with
+        [t0, t]. The entries add up to `log_df_derivative`.
+        """
+        if t <= 0:
+            return []
+        if not self.pillars:
+            raise ValueError("curve has no pillars")
+        i = bisect_left(self.pillars, t)
+        out = [
+            (k, -(self.pillars[k] - self._starts[k]))
+            for k in range(min(i, len(self.pillars)))
+            if self.pillars[k] > self._starts[k]
+        ]
+        if i == len(self.pillars):
+            out.append((i - 1, -(t - self.pillars[-1])))
+        elif t > self._starts[i]:
+            out.append((i, -(t - self._starts[i])))
+        return out
+
+    def survival_many(self, times: Sequence[float]) -> list[float]:
+        """Batch survival probabilities S(t_i), one cached lookup per time."""
+        if not self.pillars:
+            raise ValueError("curve has no pillars")
+        exp = math.exp
+        integral = self._integral
+        return [exp(-integral(t)) if t > 0 else 1.0 for t in times]
+
+    def df_many(self, times: Sequence[float]) -> list[float]:
+        """Batch version of `df` (survival probabilities; see `survival_many`)."""
+        return self.survival_many(times)
 
     def bumped(self, bump: float) -> "HazardRateCurve":
         """Return new curve with parallel additive shift to all hazard rates."""
@@ -172,3 +323,27 @@ class HazardRateCurve:
             hazard_rates=new_rates,
             t0=self.t0,
         )
+
+    def bumped_at(self, index: int, bump: float) -> "HazardRateCurve":
+        """Return new curve with `bump` added to `hazard_rates[index]` only."""
+        new_rates = list(self.hazard_rates)
+        new_rates[index] += bump
+        return HazardRateCurve(
+            name=self.name,
+            pillars=list(self.pillars),
+            hazard_rates=new_rates,
+            t0=self.t0,
+        )
+
+
+def discount_factors(curve: Curve, times: Sequence[float]) -> list[float]:
+    """
+    Discount factors for many times on any `Curve`.
+
+    Uses the curve's batch `df_many` when it has one (see `BatchCurve`) and falls
+    back to one scalar `df(t)` call per time for third-party curves that don't.
+    """
+    df_many = getattr(curve, "df_many", None)
+    if df_many is not None:
+        return df_many(times)
+    return [curve.df(t) for t in times]
@@ -7,13 +7,28 @@ Design intent:
   - Adding new instruments without modifying engine code (Open/Closed Principle)
   - Swapping pricing models per instrument type
   - Third-party pricer plugins
+- Pricer calls can be observed through `engine.hooks` (see pricing.hooks).
 """
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from pricing.hooks import HookCall, HookRegistry
 from pricing.interfaces import Instrument
 from pricing.market import Market
 from pricing.pricers import BasePricer
+from pricing.pricers.base import Exposure
+
+
+@dataclass(frozen=True)
+class DispatchStats:
+    """Dispatch cache counters: hits reuse a cached pricer, misses scan can_price()."""
+
+    hits: int = 0
+    misses: int = 0
+    cached_types: int = 0
 
 
 class PricingEngine:
@@ -22,10 +37,18 @@ class PricingEngine:
 
     Pricers are registered at initialization and dispatched based on
     can_price() checks. First matching pricer wins.
+
+    The resolution is memoized per instrument type, so can_price() is expected to
+    depend on the instrument's type only (as all built-in pricers do). The cache
+    is cleared whenever a pricer is registered.
     """
 
     def __init__(self) -> None:
         self._pricers: list[BasePricer] = []
+        self._dispatch: dict[type, BasePricer] = {}
+        self._hits = 0
+        self._misses = 0
+        self.hooks = HookRegistry()
 
     def register(self, pricer: BasePricer) -> None:
         """Register a pricer for dispatch.
@@ -33,12 +56,75 @@ class PricingEngine:
         Order matters: first matching pricer wins.
         """
         self._pricers.append(pricer)
+        # A new pricer can only matter for types nothing matched before, but
+        # clearing keeps first-match-wins obviously correct.
+        self._dispatch.clear()
+
+    @property
+    def dispatch_stats(self) -> DispatchStats:
+        """Snapshot of dispatch cache hits/misses since creation (or reset)."""
+        return DispatchStats(
+            hits=self._hits,
+            misses=self._misses,
+            cached_types=len(self._dispatch),
+        )
+
+    def reset_dispatch_stats(self) -> None:
+        """Zero the hit/miss counters (the cache itself is kept)."""
+        self._hits = 0
+        self._misses = 0
 
     def npv(self, instrument: Instrument, market: Market) -> float:
         """Dispatch to appropriate pricer."""
+        pricer = self._resolve(instrument)
+        if not self.hooks:
+            return pricer.npv(instrument, market)
+        call = HookCall("npv", type(instrument), pricer)
+        return self.hooks.run(call, pricer.npv, instrument, market)
+
+    def npv_batch(
+        self, instruments: Sequence[Instrument], market: Market
+    ) -> list[float]:
+        """
+        Price many instruments against one market.
+
+        Instruments are grouped by type and each group is dispatched once to its
+        pricer's npv_batch(), so per-trade dispatch is paid once per type rather
+        than once per trade. Results are returned in input order.
+        """
+        groups: dict[type, list[int]] = {}
+        for i, instrument in enumerate(instruments):
+            groups.setdefault(type(instrument), []).append(i)
+        npvs = [0.0] * len(instruments)
+        for indices in groups.values():
+            group = [instruments[i] for i in indices]
+            pricer = self._resolve(group[0])
+            if self.hooks:
+                call = HookCall("npv_batch", type(group[0]), pricer, len(group))
+                values = self.hooks.run(call, pricer.npv_batch, group, market)
+            else:
+                values = pricer.npv_batch(group, market)
+            for i, value in zip(indices, values):
+                npvs[i] = value
+        return npvs
+
+    def exposures(
+        self, instrument: Instrument, market: Market
+    ) -> list[Exposure] | None:
+        """Curve exposures from the instrument's pricer (None if it has none)."""
+        return self._resolve(instrument).exposures(instrument, market)
+
+    def _resolve(self, instrument: Instrument) -> BasePricer:
+        """Return the first registered pricer that can price the instrument."""
+        pricer = self._dispatch.get(type(instrument))
+        if pricer is not None:
+            self._hits += 1
+            return pricer
+        self._misses += 1
         for pricer in self._pricers:
             if pricer.can_price(instrument):
-                return pricer.npv(instrument, market)
+                self._dispatch[type(instrument)] = pricer
+                return pricer
         raise ValueError(
             f"No pricer registered for {type(instrument).__name__}. "
             "Register a pricer with engine.register(pricer)."
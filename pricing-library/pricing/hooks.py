@@ -0,0 +1,215 @@
+"""
+Instrumentation hooks around pricer calls.
+
+Every PricingEngine has a HookRegistry (`engine.hooks`); `pricing.add_hook`
+targets the default engine, so hooks see every `price()` / `price_batch()`
+call. Each pricer invocation is reported as a HookCall (operation, instrument
+type, pricer, number of instruments):
+
+    hook.start(call) -> token          # before the pricer runs
+    hook.finish(call, token, error)    # after it returns or raises
+
+When no hook is registered the engine skips all of this (one truthiness check
+per call), so production code can leave the machinery in place.
+
+Built-in hooks: CallCounter (calls per pricer/type), TimingHook (wall time per
+pricer/type), ProfilingHook (cProfile on every Nth call, aggregated).
+"""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any, Protocol, TypeVar, runtime_checkable
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HookCall:
+    """One pricer invocation: operation ('npv' or 'npv_batch'), instrument type, pricer, size."""
+
+    operation: str
+    instrument_type: type
+    pricer: Any
+    count: int = 1
+
+    @property
+    def key(self) -> tuple[str, str]:
+        """(pricer class name, instrument type name): the default aggregation key."""
+        return type(self.pricer).__name__, self.instrument_type.__name__
+
+
+@runtime_checkable
+class PricingHook(Protocol):
+    """Protocol for hooks: start() before the pricer runs, finish() after."""
+
+    def start(self, call: HookCall) -> Any:
+        """Called before the pricer; the return value is passed back to finish()."""
+        ...
+
+    def finish(self, call: HookCall, token: Any, error: BaseException | None) -> None:
+        """Called after the pricer returned (error is None) or raised."""
+        ...
+
+
+class HookRegistry:
+    """Ordered set of hooks; falsy when empty so callers can skip dispatch entirely."""
+
+    def __init__(self) -> None:
+        self._hooks: tuple[PricingHook, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self._hooks)
+
+    def __iter__(self) -> Iterator[PricingHook]:
+        return iter(self._hooks)
+
+    def __len__(self) -> int:
+        return len(self._hooks)
+
+    def add(self, hook: PricingHook) -> PricingHook:
+        """Register `hook` (returned, for chaining)."""
+        # Replace the tuple rather than mutate it: a call in progress keeps its snapshot.
+        self._hooks = (*self._hooks, hook)
+        return hook
+
+    def remove(self, hook: PricingHook) -> None:
+        """Unregister `hook`. Raises ValueError if it is not registered."""
+        if hook not in self._hooks:
+            raise ValueError("hook is not registered")
+        self._hooks = tuple(h for h in self._hooks if h is not hook)
+
+    def clear(self) -> None:
+        self._hooks = ()
+
+    def run(self, call: HookCall, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Call fn(*args) between the hooks' start() and finish() (finish in reverse order).
+
+        If a start() raises, fn is not called and only the hooks already started are
+        finished (with that error).
+        """
+        started: list[tuple[PricingHook, Any]] = []
+        error: BaseException | None = None
+        try:
+            for hook in self._hooks:
+                started.append((hook, hook.start(call)))
+            return fn(*args)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            for hook, token in reversed(started):
+                hook.finish(call, token, error)
+
+
+class CallCounter:
+    """Counts pricer calls and priced instruments per (pricer, instrument type)."""
+
+    def __init__(self) -> None:
+        self.calls: dict[tuple[str, str], int] = {}
+        self.instruments: dict[tuple[str, str], int] = {}
+        self.errors: dict[tuple[str, str], int] = {}
+
+    def start(self, call: HookCall) -> None:
+        return None
+
+    def finish(self, call: HookCall, token: None, error: BaseException | None) -> None:
+        key = call.key
+        self.calls[key] = self.calls.get(key, 0) + 1
+        self.instruments[key] = self.instruments.get(key, 0) + call.count
+        if error is not None:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+
+@dataclass
+class TimingStats:
+    """Accumulated wall time for one (pricer, instrument type)."""
+
+    calls: int = 0
+    instruments: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class TimingHook:
+    """Wall-clock timer per (pricer, instrument type), e.g. to find hot pricers."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self.stats: dict[tuple[str, str], TimingStats] = {}
+
+    def start(self, call: HookCall) -> float:
+        return self._clock()
+
+    def finish(self, call: HookCall, token: float, error: BaseException | None) -> None:
+        elapsed = self._clock() - token
+        stats = self.stats.get(call.key)
+        if stats is None:
+            stats = self.stats[call.key] = TimingStats()
+        stats.calls += 1
+        stats.instruments += call.count
+        stats.total_seconds += elapsed
+        stats.max_seconds = max(stats.max_seconds, elapsed)
+
+    def hottest(self, n: int = 5) -> list[tuple[tuple[str, str], TimingStats]]:
+        """The n (pricer, instrument type) keys with the most total time."""
+        return sorted(self.stats.items(), key=lambda kv: kv[1].total_seconds, reverse=True)[:n]
+
+
+class ProfilingHook:
+    """
+    Samples pricer calls with cProfile: every `sample_every`-th call is profiled
+    and the results are aggregated into one pstats.Stats per (pricer, instrument type).
+
+    Calls made while another sample is running (nested pricing) are not profiled.
+    """
+
+    def __init__(self, sample_every: int = 100) -> None:
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+        self.sample_every = sample_every
+        self.samples: dict[tuple[str, str], int] = {}
+        self._profiles: dict[tuple[str, str], pstats.Stats] = {}
+        self._seen = 0
+        self._active = False
+
+    def start(self, call: HookCall) -> cProfile.Profile | None:
+        self._seen += 1
+        if self._active or self._seen % self.sample_every:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active in this thread.
+            return None
+        self._active = True
+        return profile
+
+    def finish(
+        self, call: HookCall, token: cProfile.Profile | None, error: BaseException | None
+    ) -> None:
+        if token is None:
+            return
+        token.disable()
+        self._active = False
+        key = call.key
+        self.samples[key] = self.samples.get(key, 0) + 1
+        stats = self._profiles.get(key)
+        if stats is None:
+            self._profiles[key] = pstats.Stats(token)
+        else:
+            stats.add(token)
+
+    def stats(self, key: tuple[str, str]) -> pstats.Stats | None:
+        """Aggregated profile for (pricer name, instrument type name), if sampled."""
+        return self._profiles.get(key)
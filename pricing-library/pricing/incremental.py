@@ -0,0 +1,243 @@
+"""
+Incremental repricing of a book on curve ticks.
+
+A full revaluation caches, per trade and curve, each pricer exposure
+(d PV / d ln df(t) = cashflow * df(t)) together with the curve's sparse pillar
+derivatives of ln df(t). When a tick moves some pillars by dr, ln df(t) moves
+by sum_k d_k(t) * dr_k exactly (linear interpolation of zero rates, piecewise
+constant hazards), so each affected exposure scales by exp(that move) and the
+NPV changes by amount * (ratio - 1). Built-in pricers are linear in each
+curve's discount factors, so the update is exact, and only trades with
+cashflows in the moved pillar segments are touched.
+
+Falls back to a full revaluation when the tick moves any pillar by more than
+`max_move`, changes the curve's pillars or type, or after `full_revalue_every`
+incremental ticks (bounding float drift). Trades whose pricer has no exposures,
+or whose curves have no pillar derivatives, are repriced in full when one of
+their curves changes.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from pricing.curves import HazardRateCurve, ZeroRateCurve
+from pricing.engine import PricingEngine
+from pricing.interfaces import Curve, Instrument
+from pricing.market import Market
+from pricing.pricing import exposures as default_exposures
+from pricing.pricing import price_batch as default_price_batch
+
+
+@dataclass
+class IncrementalStats:
+    """Counters since construction: ticks applied, how they were handled, trades repriced."""
+
+    ticks: int = 0
+    incremental_ticks: int = 0
+    full_revalues: int = 0
+    trades_updated: int = 0
+
+
+# Cached exposures of one trade on one curve, grouped by the pillars they depend
+# on: {pillar indices: [[amount (cashflow * df), t, pillar derivatives], ...]}.
+_Legs = dict[tuple[int, ...], list[list]]
+
+
+def _pillar_values(curve: Curve) -> list[float] | None:
+    """Pillar rates of the built-in curves (zero rates or hazards); None for others."""
+    if isinstance(curve, ZeroRateCurve):
+        return curve.zero_rates_cc
+    if isinstance(curve, HazardRateCurve):
+        return curve.hazard_rates
+    return None
+
+
+def _pillar_moves(old: Curve, new: Curve) -> list[float] | None:
+    """Per-pillar change from old to new, or None when the curves are not comparable."""
+    before, after = _pillar_values(old), _pillar_values(new)
+    if before is None or after is None or type(old) is not type(new):
+        return None
+    if old.pillars != new.pillars or old.t0 != new.t0:  # type: ignore[attr-defined]
+        return None
+    return [b - a for a, b in zip(before, after)]
+
+
+class IncrementalBook:
+    """
+    NPVs of a fixed list of trades, kept current across curve updates.
+
+    Use `update_curve(curve)` with a new snapshot of a market curve, or
+    `apply_pillar_deltas(name, deltas)` with per-pillar moves (None = unchanged,
+    as in the marketdata feed's `rate_deltas_cc`). Pass `engine` to price with
+    a custom PricingEngine instead of the default one.
+    """
+
+    def __init__(
+        self,
+        trades: Sequence[Instrument],
+        market: Market,
+        engine: PricingEngine | None = None,
+        max_move: float = 0.01,
+        full_revalue_every: int | None = 500,
+    ) -> None:
+        if max_move <= 0:
+            raise ValueError("max_move must be positive")
+        if full_revalue_every is not None and full_revalue_every < 1:
+            raise ValueError("full_revalue_every must be >= 1")
+        self.trades = list(trades)
+        self.max_move = max_move
+        self.full_revalue_every = full_revalue_every
+        self.stats = IncrementalStats()
+        self._price_batch = engine.npv_batch if engine is not None else default_price_batch
+        self._exposures = engine.exposures if engine is not None else default_exposures
+        self.revalue(market)
+
+    @property
+    def market(self) -> Market:
+        return self._market
+
+    @property
+    def npvs(self) -> list[float]:
+        """Current NPVs, in trade order."""
+        return list(self._npvs)
+
+    def revalue(self, market: Market | None = None) -> None:
+        """Full revaluation (optionally on a new market) and rebuild of the cached state."""
+        if market is not None:
+            self._market = market
+        self._npvs = self._price_batch(self.trades, self._market)
+        # trade index -> curve name -> legs; curve name -> pillar -> trade indices
+        self._legs: list[dict[str, _Legs]] = [{} for _ in self.trades]
+        self._by_pillar: dict[str, dict[int, set[int]]] = {}
+        # curve name -> trades repriced in full when it changes ("*" = any curve)
+        self._opaque: dict[str, set[int]] = {}
+        # curve name -> trades whose legs on it are out of date (see update_curve)
+        self._stale: dict[str, set[int]] = {}
+        derivative_memo: dict[str, dict[float, list[tuple[int, float]]]] = {}
+        for i in range(len(self.trades)):
+            self._index(i, derivative_memo)
+        self._since_full = 0
+        self.stats.full_revalues += 1
+
+    def _index(self, i: int, memo: dict[str, dict[float, list[tuple[int, float]]]]) -> None:
+        """Cache trade i's exposures on the current market and index them by pillar."""
+        trade_exposures = self._exposures(self.trades[i], self._market)
+        if trade_exposures is None:
+            self._opaque.setdefault("*", set()).add(i)
+            return
+        legs = self._legs[i]
+        for name, t, amount in trade_exposures:
+            by_time = memo.get(name)
+            if by_time is None:
+                curve = self._market.curve(name)
+                by_time = memo[name] = {} if hasattr(curve, "pillar_log_df_derivatives") else None
+            if by_time is None:
+                self._opaque.setdefault(name, set()).add(i)
+                continue
+            derivatives = by_time.get(t)
+            if derivatives is None:
+                derivatives = by_time[t] = self._market.curve(name).pillar_log_df_derivatives(t)
+            key = tuple(k for k, _ in derivatives)
+            groups = legs.setdefault(name, {})
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = []
+                pillars = self._by_pillar.setdefault(name, {})
+                for k in key:
+                    pillars.setdefault(k, set()).add(i)
+            group.append([amount, t, derivatives])
+
+    def _reindex(self, i: int) -> None:
+        """Drop and rebuild trade i's cached exposures at the current market."""
+        for name, groups in self._legs[i].items():
+            pillars = self._by_pillar[name]
+            for key in groups:
+                for k in key:
+                    pillars[k].discard(i)
+        for trades in (*self._opaque.values(), *self._stale.values()):
+            trades.discard(i)
+        self._legs[i] = {}
+        self._index(i, {})
+
+    def update_curve(self, curve: Curve, name: str | None = None) -> list[int]:
+        """
+        Replace market curve `name` (default: curve.name) and update NPVs.
+        Returns the indices of the trades whose NPV was recomputed.
+        """
+        name = name or curve.name  # type: ignore[attr-defined]
+        market = self._market.with_curve(name, curve)
+        self.stats.ticks += 1
+        moves = _pillar_moves(self._market.curve(name), curve)
+        due = self.full_revalue_every is not None and self._since_full >= self.full_revalue_every
+        if moves is None or due or any(abs(m) > self.max_move for m in moves):
+            self.revalue(market)
+            self.stats.trades_updated += len(self.trades)
+            return list(range(len(self.trades)))
+
+        # Legs on this curve that embed another curve's moved discount factors
+        # (e.g. CDS survival legs) are rebuilt on the pre-tick market first.
+        for i in self._stale.pop(name, set()):
+            self._reindex(i)
+        self._since_full += 1
+        self.stats.incremental_ticks += 1
+        moved = {k: m for k, m in enumerate(moves) if m != 0.0}
+        pillars = self._by_pillar.get(name, {})
+        affected: set[int] = set()
+        for k in moved:
+            affected.update(pillars.get(k, ()))
+        ratios: dict[float, float] = {}
+        exp = math.exp
+        for i in affected:
+            change = 0.0
+            for key, group in self._legs[i][name].items():
+                if not any(k in moved for k in key):
+                    continue
+                for leg in group:
+                    t = leg[1]
+                    ratio = ratios.get(t)
+                    if ratio is None:
+                        ratio = ratios[t] = exp(sum(d * moved.get(k, 0.0) for k, d in leg[2]))
+                    change += leg[0] * (ratio - 1.0)
+                    leg[0] *= ratio
+            self._npvs[i] += change
+        self._market = market
+
+        opaque = sorted(self._opaque.get("*", set()) | self._opaque.get(name, set()))
+        if opaque:
+            for i, value in zip(opaque, self._price_batch([self.trades[i] for i in opaque], market)):
+                self._npvs[i] = value
+        updated = affected.union(opaque)
+        for i in updated:
+            for other in self._legs[i]:
+                if other != name:
+                    self._stale.setdefault(other, set()).add(i)
+        self.stats.trades_updated += len(updated)
+        return sorted(updated)
+
+    def apply_pillar_deltas(self, name: str, deltas: Sequence[float | None]) -> list[int]:
+        """Move pillars of curve `name` by `deltas` (None or 0 = unchanged); see update_curve."""
+        curve = self._market.curve(name)
+        bumped_at = getattr(curve, "bumped_at", None)
+        if bumped_at is None:
+            raise ValueError(f"curve '{name}' does not support per-pillar bumps")
+        for k, delta in enumerate(deltas):
+            if delta:
+                curve = curve.bumped_at(k, delta)  # type: ignore[attr-defined]
+        return self.update_curve(curve, name)
+
+    def pillar_sensitivities(self, index: int, name: str) -> list[float]:
+        """
+        d PV / d bump per pillar of curve `name` for trade `index` (as KeyRatePV01
+        with bump 1.0), from the cached state at the current market.
+        """
+        if index in self._stale.get(name, ()):
+            self._reindex(index)
+        buckets = [0.0] * len(self._market.curve(name).pillars)  # type: ignore[attr-defined]
+        for group in self._legs[index].get(name, {}).values():
+            for amount, _, derivatives in group:
+                for k, d in derivatives:
+                    buckets[k] += amount * d
+        return buckets
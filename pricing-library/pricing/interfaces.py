@@ -9,6 +9,7 @@ without modifying core code.
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import TYPE_CHECKING, Protocol, runtime_checkable
 
 if TYPE_CHECKING:
@@ -34,6 +35,57 @@ class Curve(Protocol):
         ...
 
 
+@runtime_checkable
+class BatchCurve(Curve, Protocol):
+    """Optional extension of Curve with batch evaluation.
+
+    Curves that can evaluate many times at once (e.g. one binary-search pass over
+    pillars) implement df_many(). Pricers go through
+    pricing.curves.discount_factors(), which falls back to scalar df() calls for
+    curves that only implement the base Curve protocol.
+    """
+
+    def df_many(self, times: Sequence[float]) -> list[float]:
+        """Return discount factors for each time in `times`, in order."""
+        ...
+
+
+@runtime_checkable
+class DifferentiableCurve(Curve, Protocol):
+    """Optional extension of Curve exposing its parallel-bump derivative.
+
+    log_df_derivative(t) is d ln df(t) / d bump for the shift applied by
+    bumped(bump). Pricers report d PV / d ln df(t) per curve lookup (see
+    BasePricer.exposures), so the two combine into an analytic parallel
+    sensitivity without repricing.
+    """
+
+    def log_df_derivative(self, t: float) -> float:
+        """Return d ln df(t) / d bump (e.g. -t for a zero-rate curve)."""
+        ...
+
+
+@runtime_checkable
+class KeyRateCurve(Curve, Protocol):
+    """Optional extension of Curve with per-pillar (key-rate) bumps.
+
+    pillar_log_df_derivatives(t) returns the sparse (pillar index, d ln df(t) /
+    d bump) pairs for a bump to a single pillar, as applied by bumped_at(). The
+    KeyRatePV01 measure uses them to build a whole ladder in one pass over a
+    pricer's exposures, and falls back to bumped_at() per pillar otherwise.
+    """
+
+    pillars: list[float]
+
+    def pillar_log_df_derivatives(self, t: float) -> list[tuple[int, float]]:
+        """Return (pillar index, d ln df(t) / d bump of that pillar) pairs."""
+        ...
+
+    def bumped_at(self, index: int, bump: float) -> Curve:
+        """Return new curve with `bump` applied to pillars[index] only."""
+        ...
+
+
 @runtime_checkable
 class Instrument(Protocol):
     """Marker protocol for all priceable instruments.
@@ -59,6 +111,18 @@ class Pricer(Protocol):
         """Compute present value in the appropriate currency."""
         ...
 
+    def npv_batch(
+        self, instruments: Sequence[Instrument], market: Market
+    ) -> list[float]:
+        """Compute present values for many instruments of a type it handles."""
+        ...
+
+    def exposures(
+        self, instrument: Instrument, market: Market
+    ) -> list[tuple[str, float, float]] | None:
+        """Return (curve_name, t, d PV / d ln df(t)) per curve lookup, or None."""
+        ...
+
 
 class RiskMeasure(Protocol):
     """Protocol for risk measure implementations.
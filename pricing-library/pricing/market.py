@@ -13,26 +13,60 @@ We keep this class small so that:
 
 from __future__ import annotations
 
-from copy import deepcopy
+from collections import ChainMap
+from collections.abc import Mapping
+from typing import TypeVar
 
 from pricing.interfaces import Curve
 
+_V = TypeVar("_V")
+
+# Overlay chains longer than this are flattened into a single dict, so lookups
+# stay cheap when scenarios are derived from scenarios (e.g. bump loops).
+MAX_OVERLAY_DEPTH = 16
+
+
+def _overlay(base: Mapping[str, _V], key: str, value: _V) -> Mapping[str, _V]:
+    """Return `base` shadowed by {key: value} without copying `base`."""
+    if isinstance(base, ChainMap):
+        if len(base.maps) >= MAX_OVERLAY_DEPTH:
+            flat = dict(base)
+            flat[key] = value
+            return flat
+        return base.new_child({key: value})
+    return ChainMap({key: value}, base)
+
 
 class Market:
     """
     Market snapshot: discount curves (by name) and FX spot rates (pair -> rate).
     Immutable-style: with_curve / with_fx return new Market instances.
+
+    Scenario markets are overlays: `curves` / `fx_spot` of a derived market are
+    ChainMaps whose first layer holds the shadowed entry and whose remaining
+    layers are the parent's own maps (shared, not copied), so deriving a
+    scenario is O(1) in the number of curves. Treat both mappings as read-only.
     """
 
     def __init__(
         self,
-        curves: dict[str, Curve] | None = None,
-        fx_spot: dict[str, float] | None = None,
+        curves: Mapping[str, Curve] | None = None,
+        fx_spot: Mapping[str, float] | None = None,
     ) -> None:
         # Defensive copies: callers can keep their own dicts without risking
         # accidental mutation of the Market snapshot (and vice-versa).
-        self.curves: dict[str, Curve] = curves.copy() if curves else {}
-        self.fx_spot: dict[str, float] = fx_spot.copy() if fx_spot else {}
+        self.curves: Mapping[str, Curve] = dict(curves) if curves else {}
+        self.fx_spot: Mapping[str, float] = dict(fx_spot) if fx_spot else {}
+
+    @classmethod
+    def _layered(
+        cls, curves: Mapping[str, Curve], fx_spot: Mapping[str, float]
+    ) -> "Market":
+        """Build a Market sharing the given mappings (no defensive copy)."""
+        market = cls.__new__(cls)
+        market.curves = curves
+        market.fx_spot = fx_spot
+        return market
 
     def curve(self, name: str) -> Curve:
         """Return curve by name. Raises KeyError if not found."""
@@ -43,16 +77,9 @@ class Market:
         return self.fx_spot[pair]
 
     def with_curve(self, name: str, curve: Curve) -> "Market":
-        """Return a new Market with the given curve updated/added."""
-        # Use deepcopy to preserve the "immutable snapshot" feel, even if future
-        # curve objects become nested/mutable.
-        new_curves = deepcopy(self.curves)
-        new_curves[name] = curve
-        return Market(curves=new_curves, fx_spot=self.fx_spot)
+        """Return a new Market with the given curve updated/added (overlay on this one)."""
+        return Market._layered(_overlay(self.curves, name, curve), self.fx_spot)
 
     def with_fx(self, pair: str, spot: float) -> "Market":
-        """Return a new Market with the given FX pair updated/added."""
-        # Copy-on-write update: keep original snapshot unchanged.
-        new_fx = deepcopy(self.fx_spot)
-        new_fx[pair] = spot
-        return Market(curves=self.curves, fx_spot=new_fx)
+        """Return a new Market with the given FX pair updated/added (overlay on this one)."""
+        return Market._layered(self.curves, _overlay(self.fx_spot, pair, spot))
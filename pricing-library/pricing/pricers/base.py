@@ -3,16 +3,23 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import TypeAlias
 
 from pricing.interfaces import Instrument
 from pricing.market import Market
 
+# (curve_name, t, d PV / d ln df(t)): how PV responds to one curve lookup.
+Exposure: TypeAlias = tuple[str, float, float]
+
 
 class BasePricer(ABC):
     """Abstract base class for instrument pricers.
 
     Subclasses implement can_price() and npv() for specific instrument types.
     This allows pricing logic to be isolated, testable, and pluggable.
+    Override npv_batch() when many instruments can share curve lookups, and
+    exposures() to enable analytic sensitivities.
     """
 
     @abstractmethod
@@ -24,3 +31,22 @@ class BasePricer(ABC):
     def npv(self, instrument: Instrument, market: Market) -> float:
         """Compute present value."""
         ...
+
+    def npv_batch(
+        self, instruments: Sequence[Instrument], market: Market
+    ) -> list[float]:
+        """Compute present values for instruments this pricer handles (in order).
+
+        Default: one npv() call per instrument.
+        """
+        return [self.npv(instrument, market) for instrument in instruments]
+
+    def exposures(
+        self, instrument: Instrument, market: Market
+    ) -> list[Exposure] | None:
+        """Curve exposures for analytic risk: (curve_name, t, d PV / d ln df(t)).
+
+        One entry per curve lookup the PV depends on (entries for the same time
+        may repeat). Default None: risk measures fall back to bump-and-reprice.
+        """
+        return None
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+
+from pricing.curves import discount_factors
 from pricing.interfaces import Instrument
 from pricing.market import Market
-from pricing.pricers.base import BasePricer
+from pricing.pricers.base import BasePricer, Exposure
 from pricing.products.bond import ZeroCouponBond
 
 
@@ -20,3 +23,26 @@ class BondPricer(BasePricer):
         bond = instrument
         c = market.curve(bond.curve)
         return bond.notional * c.df(bond.maturity)
+
+    def exposures(self, instrument: Instrument, market: Market) -> list[Exposure]:
+        """Single cashflow: d PV / d ln DF(T) = PV."""
+        assert isinstance(instrument, ZeroCouponBond)
+        bond = instrument
+        pv = bond.notional * market.curve(bond.curve).df(bond.maturity)
+        return [(bond.curve, bond.maturity, pv)]
+
+    def npv_batch(
+        self, instruments: Sequence[Instrument], market: Market
+    ) -> list[float]:
+        """One batch DF call per curve: PV_i = notional_i * DF(maturity_i)."""
+        by_curve: dict[str, list[int]] = {}
+        for i, bond in enumerate(instruments):
+            assert isinstance(bond, ZeroCouponBond)
+            by_curve.setdefault(bond.curve, []).append(i)
+        npvs = [0.0] * len(instruments)
+        for curve_name, indices in by_curve.items():
+            c = market.curve(curve_name)
+            dfs = discount_factors(c, [instruments[i].maturity for i in indices])
+            for i, df in zip(indices, dfs):
+                npvs[i] = instruments[i].notional * df
+        return npvs
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from array import array
+from collections.abc import Sequence
+
+from pricing.curves import discount_factors
 from pricing.interfaces import Curve, Instrument
 from pricing.market import Market
-from pricing.pricers.base import BasePricer
-from pricing.products.cds import CDS
+from pricing.pricers.base import BasePricer, Exposure
+from pricing.products.cds import CDS, CDSBlock
 
 
 class CDSPricer(BasePricer):
@@ -28,20 +32,104 @@ class CDSPricer(BasePricer):
         npv = pv_protection - pv_premium
         return npv if cds.protection_buyer else -npv
 
+    def exposures(self, instrument: Instrument, market: Market) -> list[Exposure]:
+        """
+        Premium terms N*s*accrual*DF(t)*S(t) load equally on DF(t) and S(t);
+        protection terms N(1-R)*DF(t_mid)*(S(t_prev) - S(t)) load on DF(t_mid)
+        and with opposite signs on the two survival probabilities.
+        """
+        assert isinstance(instrument, CDS)
+        cds = instrument
+        sign = 1.0 if cds.protection_buyer else -1.0
+        disc = market.curve(cds.discount_curve)
+        surv = market.curve(cds.survival_curve)
+        times = [cds.t0, *cds.pay_times]
+        mids = [(times[i] + times[i + 1]) / 2.0 for i in range(len(times) - 1)]
+        dfs = discount_factors(disc, cds.pay_times)
+        df_mids = discount_factors(disc, mids)
+        survs = discount_factors(surv, times)
+        lgd = sign * cds.notional * (1.0 - cds.recovery)
+        out: list[Exposure] = []
+        for i, t in enumerate(cds.pay_times):
+            prev, s_prev, s_t = times[i], survs[i], survs[i + 1]
+            premium = -sign * cds.notional * cds.premium_rate * (t - prev) * dfs[i] * s_t
+            out.append((cds.discount_curve, t, premium))
+            out.append((cds.survival_curve, t, premium))
+            out.append((cds.discount_curve, mids[i], lgd * df_mids[i] * (s_prev - s_t)))
+            out.append((cds.survival_curve, prev, lgd * df_mids[i] * s_prev))
+            out.append((cds.survival_curve, t, -lgd * df_mids[i] * s_t))
+        return out
+
+    def npv_batch(
+        self, instruments: Sequence[Instrument], market: Market
+    ) -> list[float]:
+        """Pack CDS into one CDSBlock per (discount, survival) curve pair and value each block."""
+        by_curves: dict[tuple[str, str], list[int]] = {}
+        for i, cds in enumerate(instruments):
+            assert isinstance(cds, CDS)
+            by_curves.setdefault((cds.discount_curve, cds.survival_curve), []).append(i)
+        npvs = [0.0] * len(instruments)
+        for indices in by_curves.values():
+            block = CDSBlock.from_trades([instruments[i] for i in indices])
+            for i, value in zip(indices, self.npv_block(block, market)):
+                npvs[i] = value
+        return npvs
+
+    @staticmethod
+    def npv_block(block: CDSBlock, market: Market) -> list[float]:
+        """
+        Value every CDS in a CDSBlock (same conventions as npv()).
+
+        Discount factors, survival probabilities and mid-period discount factors for
+        the whole block come from a handful of batch curve calls; both legs are then
+        accumulated in a single pass over the flat schedule.
+        """
+        disc = market.curve(block.discount_curve)
+        surv = market.curve(block.survival_curve)
+        pay_times, offsets = block.pay_times, block.offsets
+        mids = array("d")
+        for i in range(len(block)):
+            prev = block.t0s[i]
+            for j in range(offsets[i], offsets[i + 1]):
+                mids.append((prev + pay_times[j]) / 2.0)
+                prev = pay_times[j]
+        dfs = discount_factors(disc, pay_times)
+        df_mids = discount_factors(disc, mids)
+        survs = discount_factors(surv, pay_times)
+        s_starts = discount_factors(surv, block.t0s)
+        npvs = []
+        for i in range(len(block)):
+            prev, s_prev = block.t0s[i], s_starts[i]
+            annuity = 0.0
+            protection = 0.0
+            for j in range(offsets[i], offsets[i + 1]):
+                t, s_t = pay_times[j], survs[j]
+                annuity += (t - prev) * dfs[j] * s_t
+                protection += df_mids[j] * (s_prev - s_t)
+                prev, s_prev = t, s_t
+            notional = block.notionals[i]
+            npv = notional * (
+                (1.0 - block.recoveries[i]) * protection
+                - block.premium_rates[i] * annuity
+            )
+            npvs.append(npv if block.protection_buyer[i] else -npv)
+        return npvs
+
     @staticmethod
     def _pv_premium_leg(cds: CDS, disc: Curve, surv: Curve) -> float:
         """Premium leg: sum_i N * s * accrual_i * DF(t_i) * S(t_i)."""
+        return cds.premium_rate * CDSPricer._risky_annuity(cds, disc, surv)
+
+    @staticmethod
+    def _risky_annuity(cds: CDS, disc: Curve, surv: Curve) -> float:
+        """Risky annuity: sum_i N * accrual_i * DF(t_i) * S(t_i)."""
         pv = 0.0
         prev = cds.t0
-        for t in cds.pay_times:
+        dfs = discount_factors(disc, cds.pay_times)
+        survs = discount_factors(surv, cds.pay_times)
+        for t, df_t, s_t in zip(cds.pay_times, dfs, survs):
             accrual = t - prev
-            pv += (
-                cds.notional
-                * cds.premium_rate
-                * accrual
-                * disc.df(t)
-                * surv.df(t)
-            )
+            pv += cds.notional * accrual * df_t * s_t
             prev = t
         return pv
 
@@ -49,20 +137,13 @@ class CDSPricer(BasePricer):
     def _pv_protection_leg(cds: CDS, disc: Curve, surv: Curve) -> float:
         """Protection leg (discrete): sum_i N(1-R) * DF(t_mid) * (S(t_{i-1}) - S(t_i))."""
         pv = 0.0
-        prev = cds.t0
-        s_prev = surv.df(prev)
-        for t in cds.pay_times:
-            s_t = surv.df(t)
-            t_mid = (prev + t) / 2.0
+        times = [cds.t0, *cds.pay_times]
+        # One survival lookup per date: S(t_{i-1}) is reused from the previous period.
+        survs = discount_factors(surv, times)
+        mids = [(times[i] + times[i + 1]) / 2.0 for i in range(len(times) - 1)]
+        for df_mid, s_prev, s_t in zip(discount_factors(disc, mids), survs, survs[1:]):
             prob_default = s_prev - s_t
-            pv += (
-                cds.notional
-                * (1.0 - cds.recovery)
-                * disc.df(t_mid)
-                * prob_default
-            )
-            prev = t
-            s_prev = s_t
+            pv += cds.notional * (1.0 - cds.recovery) * df_mid * prob_default
         return pv
 
     @staticmethod
@@ -71,12 +152,7 @@ class CDSPricer(BasePricer):
         disc = market.curve(cds.discount_curve)
         surv = market.curve(cds.survival_curve)
         pv_protection = CDSPricer._pv_protection_leg(cds, disc, surv)
-        risky_annuity = 0.0
-        prev = cds.t0
-        for t in cds.pay_times:
-            accrual = t - prev
-            risky_annuity += cds.notional * accrual * disc.df(t) * surv.df(t)
-            prev = t
+        risky_annuity = CDSPricer._risky_annuity(cds, disc, surv)
         if risky_annuity <= 0:
             return 0.0
         return pv_protection / risky_annuity
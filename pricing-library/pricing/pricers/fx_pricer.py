@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
+
+from pricing.curves import discount_factors
 from pricing.interfaces import Instrument
 from pricing.market import Market
-from pricing.pricers.base import BasePricer
+from pricing.pricers.base import BasePricer, Exposure
 from pricing.products.fx import FXForward
 
 
@@ -29,3 +32,46 @@ class FXPricer(BasePricer):
             * df_quote
             * (fwd_rate - fwd.strike)
         )
+
+    def exposures(self, instrument: Instrument, market: Market) -> list[Exposure]:
+        """PV = N * (spot * DF_base(T) - strike * DF_quote(T)): one exposure per curve."""
+        assert isinstance(instrument, FXForward)
+        fwd = instrument
+        spot = market.fx(fwd.pair)
+        df_base = market.curve(fwd.base_curve).df(fwd.maturity)
+        df_quote = market.curve(fwd.quote_curve).df(fwd.maturity)
+        return [
+            (fwd.base_curve, fwd.maturity, fwd.notional_base * spot * df_base),
+            (fwd.quote_curve, fwd.maturity, -fwd.notional_base * fwd.strike * df_quote),
+        ]
+
+    def npv_batch(
+        self, instruments: Sequence[Instrument], market: Market
+    ) -> list[float]:
+        """Same CIP formula with base and quote DFs fetched in one batch call per curve."""
+        df_base = _maturity_dfs(instruments, market, lambda f: f.base_curve)
+        df_quote = _maturity_dfs(instruments, market, lambda f: f.quote_curve)
+        npvs = []
+        for fwd, db, dq in zip(instruments, df_base, df_quote):
+            fwd_rate = market.fx(fwd.pair) * db / dq
+            npvs.append(fwd.notional_base * dq * (fwd_rate - fwd.strike))
+        return npvs
+
+
+def _maturity_dfs(
+    forwards: Sequence[Instrument],
+    market: Market,
+    curve_of: Callable[[FXForward], str],
+) -> list[float]:
+    """DF(maturity) for each forward on the curve selected by `curve_of`."""
+    by_curve: dict[str, list[int]] = {}
+    for i, fwd in enumerate(forwards):
+        assert isinstance(fwd, FXForward)
+        by_curve.setdefault(curve_of(fwd), []).append(i)
+    dfs = [0.0] * len(forwards)
+    for curve_name, indices in by_curve.items():
+        c = market.curve(curve_name)
+        batch = discount_factors(c, [forwards[i].maturity for i in indices])
+        for i, df in zip(indices, batch):
+            dfs[i] = df
+    return dfs
@@ -2,37 +2,103 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+from itertools import accumulate
+
+from pricing.amortization import level_payment, payment_times, unit_payments, unit_values
+from pricing.curves import discount_factors
 from pricing.interfaces import Instrument
 from pricing.market import Market
-from pricing.pricers.base import BasePricer
-from pricing.products.mortgage import LevelPayMortgage
+from pricing.pricers.base import BasePricer, Exposure
+from pricing.products.mortgage import LevelPayMortgage, MortgagePool
 
 
 class MortgagePricer(BasePricer):
-    """Pricer for level-pay fixed-rate mortgages (no prepayment, no default)."""
+    """Pricer for level-pay fixed-rate mortgages (optional CPR/PSA prepayment, no default)."""
 
     def can_price(self, instrument: Instrument) -> bool:
         return isinstance(instrument, LevelPayMortgage)
 
     def npv(self, instrument: Instrument, market: Market) -> float:
         """
-        Level-pay mortgage: constant payment from annuity formula,
-        PV = sum of payment * DF(t_i) over pay_times.
+        Without prepayment: constant annuity payment, PV = payment * sum of DF(t_i).
+        With prepayment: PV = notional * sum of unit cashflow_i * DF(t_i), the unit
+        cashflows being interest + scheduled + prepaid principal per unit of
+        notional (summed in closed form, see pricing.amortization.unit_values).
         """
         assert isinstance(instrument, LevelPayMortgage)
         m = instrument
         c = market.curve(m.curve)
-        n = int(m.term_years * m.payments_per_year)
-        r = m.annual_rate / m.payments_per_year
-        if r == 0:
-            payment = m.notional / n
+        dfs = discount_factors(c, payment_times(m.periods, m.payments_per_year))
+        if m.prepayment is None:
+            return m.notional * (level_payment(m.annual_rate, m.periods, m.payments_per_year) * sum(dfs))
+        unit_pv = unit_values([m.annual_rate], m.periods, m.payments_per_year, m.prepayment, dfs)[0]
+        return m.notional * unit_pv
+
+    def exposures(self, instrument: Instrument, market: Market) -> list[Exposure]:
+        """
+        One exposure per payment: d PV / d ln DF(t_i) = cashflow_i * DF(t_i)
+        (CPR/PSA prepayment does not depend on rates, so cashflows are fixed).
+        """
+        assert isinstance(instrument, LevelPayMortgage)
+        m = instrument
+        pay_times = payment_times(m.periods, m.payments_per_year)
+        dfs = discount_factors(market.curve(m.curve), pay_times)
+        if m.prepayment is None:
+            payment = m.notional * level_payment(m.annual_rate, m.periods, m.payments_per_year)
+            return [(m.curve, t, payment * df) for t, df in zip(pay_times, dfs)]
+        cash = unit_payments(m.annual_rate, m.periods, m.payments_per_year, m.prepayment)
+        return [(m.curve, t, m.notional * a * df) for t, a, df in zip(pay_times, cash, dfs)]
+
+    def npv_batch(
+        self, instruments: Sequence[Instrument], market: Market
+    ) -> list[float]:
+        """Pack loans into one MortgagePool per (curve, prepayment) and value each pool."""
+        for m in instruments:
+            assert isinstance(m, LevelPayMortgage)
+        npvs = [0.0] * len(instruments)
+        for indices, pool in MortgagePool.partition(instruments):
+            for i, value in zip(indices, self.npv_pool(pool, market)):
+                npvs[i] = value
+        return npvs
+
+    @staticmethod
+    def npv_pool(pool: MortgagePool, market: Market) -> list[float]:
+        """
+        Value every loan in a MortgagePool (same conventions as npv()).
+
+        DFs come from one batch curve call per payment frequency. Each distinct
+        loan shape (MortgagePool.shapes) is valued once for a unit notional and
+        scaled by its loans' notionals: without prepayment that is the level
+        payment times a prefix sum of the DFs; with prepayment the shapes of each
+        term are valued together in one pass over the periods (unit_values).
+        """
+        c = market.curve(pool.curve)
+        prepayment = pool.prepayment
+        grids: dict[int, list[float]] = {}
+        for freq in set(pool.payments_per_year):
+            horizon = max(p for p, f in zip(pool.periods, pool.payments_per_year) if f == freq)
+            dfs = discount_factors(c, payment_times(horizon, freq))
+            if prepayment is None:
+                # annuity[k] = DF(t_1) + ... + DF(t_k)
+                grids[freq] = [0.0, *accumulate(dfs)]
+            else:
+                grids[freq] = dfs
+        shapes = pool.shapes()
+        unit_pvs: dict[tuple[float, int, int], float] = {}
+        if prepayment is None:
+            for rate, periods, freq in shapes:
+                unit_pvs[rate, periods, freq] = level_payment(rate, periods, freq) * grids[freq][periods]
         else:
-            payment = (
-                m.notional
-                * (r * (1 + r) ** n)
-                / ((1 + r) ** n - 1)
-            )
-        pay_times = [
-            i / m.payments_per_year for i in range(1, n + 1)
-        ]
-        return sum(payment * c.df(t) for t in pay_times)
+            terms: dict[tuple[int, int], list[float]] = {}
+            for rate, periods, freq in shapes:
+                terms.setdefault((periods, freq), []).append(rate)
+            for (periods, freq), rates in terms.items():
+                values = unit_values(rates, periods, freq, prepayment, grids[freq])
+                unit_pvs.update(((rate, periods, freq), v) for rate, v in zip(rates, values))
+        npvs = [0.0] * len(pool)
+        for shape, members in shapes.items():
+            unit_pv = unit_pvs[shape]
+            for i in members:
+                npvs[i] = pool.notionals[i] * unit_pv
+        return npvs
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+
+from pricing.curves import discount_factors
 from pricing.interfaces import Curve, Instrument
 from pricing.market import Market
-from pricing.pricers.base import BasePricer
-from pricing.products.swap import FixedFloatSwap
+from pricing.pricers.base import BasePricer, Exposure
+from pricing.products.swap import FixedFloatSwap, SwapBlock
 
 
 class SwapPricer(BasePricer):
@@ -26,6 +29,68 @@ class SwapPricer(BasePricer):
         pv_float = self._pv_float_leg(swap, c)
         return pv_float - pv_fixed
 
+    def exposures(self, instrument: Instrument, market: Market) -> list[Exposure]:
+        """
+        Fixed leg: -N * K * accrual_i * DF(t_i) at each pay time.
+        Float leg: each period with accrual > 0 is N * (DF(prev) - DF(t)).
+        """
+        assert isinstance(instrument, FixedFloatSwap)
+        swap = instrument
+        dfs = discount_factors(market.curve(swap.curve), [swap.t0, *swap.pay_times])
+        out: list[Exposure] = []
+        prev, df_prev = swap.t0, dfs[0]
+        for t, df_t in zip(swap.pay_times, dfs[1:]):
+            accrual = t - prev
+            out.append((swap.curve, t, -swap.notional * swap.fixed_rate * accrual * df_t))
+            if accrual > 0:
+                out.append((swap.curve, prev, swap.notional * df_prev))
+                out.append((swap.curve, t, -swap.notional * df_t))
+            prev, df_prev = t, df_t
+        return out
+
+    def npv_batch(
+        self, instruments: Sequence[Instrument], market: Market
+    ) -> list[float]:
+        """Pack swaps into one SwapBlock per curve and value each block in one pass."""
+        by_curve: dict[str, list[int]] = {}
+        for i, swap in enumerate(instruments):
+            assert isinstance(swap, FixedFloatSwap)
+            by_curve.setdefault(swap.curve, []).append(i)
+        npvs = [0.0] * len(instruments)
+        for indices in by_curve.values():
+            block = SwapBlock.from_trades([instruments[i] for i in indices])
+            for i, value in zip(indices, self.npv_block(block, market)):
+                npvs[i] = value
+        return npvs
+
+    @staticmethod
+    def npv_block(block: SwapBlock, market: Market) -> list[float]:
+        """
+        Value every swap in a SwapBlock (same conventions as npv()).
+
+        DFs for all pay times and all start dates come from two batch curve calls;
+        the legs are then accumulated in a single pass over the flat schedule. Per
+        period the single-curve float leg telescopes to N * (DF(prev) - DF(t)).
+        """
+        c = market.curve(block.curve)
+        dfs = discount_factors(c, block.pay_times)
+        df_starts = discount_factors(c, block.t0s)
+        pay_times, offsets = block.pay_times, block.offsets
+        npvs = []
+        for i in range(len(block)):
+            prev, df_prev = block.t0s[i], df_starts[i]
+            annuity = 0.0
+            float_pv = 0.0
+            for j in range(offsets[i], offsets[i + 1]):
+                t, df_t = pay_times[j], dfs[j]
+                accrual = t - prev
+                annuity += accrual * df_t
+                if accrual > 0:
+                    float_pv += df_prev - df_t
+                prev, df_prev = t, df_t
+            npvs.append(block.notionals[i] * (float_pv - block.fixed_rates[i] * annuity))
+        return npvs
+
     @staticmethod
     def _pv_fixed_leg(swap: FixedFloatSwap, c: Curve) -> float:
         """
@@ -35,9 +100,9 @@ class SwapPricer(BasePricer):
         """
         pv = 0.0
         prev = swap.t0
-        for t in swap.pay_times:
+        for t, df_t in zip(swap.pay_times, discount_factors(c, swap.pay_times)):
             accrual = t - prev
-            pv += swap.notional * swap.fixed_rate * accrual * c.df(t)
+            pv += swap.notional * swap.fixed_rate * accrual * df_t
             prev = t
         return pv
 
@@ -49,10 +114,10 @@ class SwapPricer(BasePricer):
         """
         pv = 0.0
         prev = swap.t0
-        df_prev = c.df(prev)
-        for t in swap.pay_times:
+        dfs = discount_factors(c, [swap.t0, *swap.pay_times])
+        df_prev = dfs[0]
+        for t, df_t in zip(swap.pay_times, dfs[1:]):
             accrual = t - prev
-            df_t = c.df(t)
             fwd = (df_prev / df_t - 1.0) / accrual if accrual > 0 else 0.0
             cf = swap.notional * fwd * accrual
             pv += cf * df_t
@@ -6,12 +6,18 @@ It delegates to a default `PricingEngine` instance that contains the pricing log
 
 Keeping this as a thin wrapper gives you a stable, ergonomic API while still
 allowing advanced users to instantiate/configure their own engines.
+
+Instrumentation hooks (timers, counters, cProfile sampling; see pricing.hooks)
+are attached to the default engine with `add_hook` / `remove_hook`.
 """
 
+from collections.abc import Sequence
 from typing import TypeAlias
 
 from pricing.engine import create_default_engine
+from pricing.hooks import PricingHook
 from pricing.market import Market
+from pricing.pricers.base import Exposure
 from pricing.products.bond import ZeroCouponBond
 from pricing.products.cds import CDS
 from pricing.products.fx import FXForward
@@ -28,5 +34,24 @@ _default_engine = create_default_engine()
 
 def price(trade: Trade, market: Market) -> float:
     """Return present value of trade (via default registry-based engine)."""
-    # One place to hook cross-cutting concerns later (tracing, caching, validation).
     return _default_engine.npv(trade, market)
+
+
+def price_batch(trades: Sequence[Trade], market: Market) -> list[float]:
+    """Return present values of many trades, in order (one dispatch per trade type)."""
+    return _default_engine.npv_batch(trades, market)
+
+
+def exposures(trade: Trade, market: Market) -> list[Exposure] | None:
+    """Return curve exposures (curve_name, t, d PV / d ln df(t)) of trade, or None."""
+    return _default_engine.exposures(trade, market)
+
+
+def add_hook(hook: PricingHook) -> PricingHook:
+    """Attach an instrumentation hook to price() / price_batch() (returned, for chaining)."""
+    return _default_engine.hooks.add(hook)
+
+
+def remove_hook(hook: PricingHook) -> None:
+    """Detach a hook previously attached with add_hook."""
+    _default_engine.hooks.remove(hook)
@@ -1,9 +1,17 @@
 """Products: bond, swap, FX forward, mortgage, CDS."""
 
 from pricing.products.bond import ZeroCouponBond
-from pricing.products.cds import CDS
+from pricing.products.cds import CDS, CDSBlock
 from pricing.products.fx import FXForward
 from pricing.products.mortgage import LevelPayMortgage
-from pricing.products.swap import FixedFloatSwap
+from pricing.products.swap import FixedFloatSwap, SwapBlock
 
-__all__ = ["ZeroCouponBond", "CDS", "FixedFloatSwap", "FXForward", "LevelPayMortgage"]
+__all__ = [
+    "ZeroCouponBond",
+    "CDS",
+    "CDSBlock",
+    "FixedFloatSwap",
+    "SwapBlock",
+    "FXForward",
+    "LevelPayMortgage",
+]
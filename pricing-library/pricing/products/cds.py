@@ -1,5 +1,9 @@
 """Single-name CDS product (instrument data only; pricing via PricingEngine)."""
 
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 
@@ -20,3 +24,69 @@ class CDS:
     recovery: float = 0.4
     t0: float = 0.0
     protection_buyer: bool = True
+
+
+@dataclass
+class CDSBlock:
+    """
+    Columnar (structure-of-arrays) book of CDS sharing discount and survival curves.
+    Per-trade fields are contiguous arrays (`protection_buyer` as 0/1 bytes); the
+    ragged premium schedules are stored back to back in `pay_times`, with trade i's
+    schedule at pay_times[offsets[i]:offsets[i + 1]].
+    Priced in one pass by CDSPricer.npv_block.
+    """
+
+    discount_curve: str
+    survival_curve: str
+    notionals: array
+    premium_rates: array
+    recoveries: array
+    pay_times: array
+    offsets: array
+    t0s: array
+    protection_buyer: array
+
+    def __post_init__(self) -> None:
+        n = len(self.notionals)
+        columns = (self.premium_rates, self.recoveries, self.t0s, self.protection_buyer)
+        if any(len(col) != n for col in columns):
+            raise ValueError(
+                "notionals, premium_rates, recoveries, t0s and protection_buyer "
+                "must have the same length"
+            )
+        if len(self.offsets) != n + 1 or self.offsets[0] != 0:
+            raise ValueError("offsets must start at 0 and have len(block) + 1 entries")
+        if self.offsets[-1] != len(self.pay_times):
+            raise ValueError("offsets[-1] must equal len(pay_times)")
+
+    def __len__(self) -> int:
+        return len(self.notionals)
+
+    def schedule(self, i: int) -> array:
+        """Pay times of trade i."""
+        return self.pay_times[self.offsets[i]:self.offsets[i + 1]]
+
+    @classmethod
+    def from_trades(cls, trades: Sequence[CDS]) -> CDSBlock:
+        """Pack CDS trades (all on the same discount/survival curves) into a block."""
+        if not trades:
+            raise ValueError("trades must not be empty")
+        disc, surv = trades[0].discount_curve, trades[0].survival_curve
+        if any(c.discount_curve != disc or c.survival_curve != surv for c in trades):
+            raise ValueError("all CDS in a block must share discount and survival curves")
+        pay_times = array("d")
+        offsets = array("q", [0])
+        for c in trades:
+            pay_times.extend(c.pay_times)
+            offsets.append(len(pay_times))
+        return cls(
+            discount_curve=disc,
+            survival_curve=surv,
+            notionals=array("d", (c.notional for c in trades)),
+            premium_rates=array("d", (c.premium_rate for c in trades)),
+            recoveries=array("d", (c.recovery for c in trades)),
+            pay_times=pay_times,
+            offsets=offsets,
+            t0s=array("d", (c.t0 for c in trades)),
+            protection_buyer=array("b", (c.protection_buyer for c in trades)),
+        )
@@ -1,13 +1,56 @@
-"""Level-pay mortgage product (instrument data only; pricing via PricingEngine)."""
+"""Level-pay mortgage products (instrument data only; pricing via PricingEngine)."""
 
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass
 
+PSA_RAMP_MONTHS = 30
+PSA_PLATEAU_CPR = 0.06
+
+
+@dataclass(frozen=True)
+class Prepayment:
+    """
+    Prepayment speed assumption, as an annual CPR (conditional prepayment rate).
+
+    cpr: constant CPR (0.06 = 6% of the balance prepaid per year).
+    psa: PSA speed in percent; when set it replaces cpr. 100 PSA ramps CPR up
+    linearly by 0.2% per month of loan age to 6% at month 30 and stays there;
+    other speeds scale that curve (200 PSA = twice the CPR).
+    """
+
+    cpr: float = 0.0
+    psa: float | None = None
+
+    def __post_init__(self) -> None:
+        if not 0.0 <= self.cpr < 1.0:
+            raise ValueError("cpr must be in [0, 1)")
+        if self.psa is not None and self.psa < 0:
+            raise ValueError("psa must be non-negative")
+
+    def cpr_at(self, month: float) -> float:
+        """Annual CPR at loan age `month` (months since origination)."""
+        if self.psa is None:
+            return self.cpr
+        ramp = min(month, PSA_RAMP_MONTHS) / PSA_RAMP_MONTHS
+        return min(ramp * PSA_PLATEAU_CPR * self.psa / 100.0, 1.0)
+
+    def smm(self, period: int, payments_per_year: int) -> float:
+        """Fraction of the balance prepaid in payment period `period` (1-based)."""
+        cpr = self.cpr_at(period * 12.0 / payments_per_year)
+        return 1.0 - (1.0 - cpr) ** (1.0 / payments_per_year)
+
 
 @dataclass
 class LevelPayMortgage:
     """
-    Fixed-rate level-payment mortgage (no prepayment).
-    Value to lender = PV of all level payments discounted with the curve.
+    Fixed-rate level-payment mortgage.
+    Value to lender = PV of all payments discounted with the curve. Without
+    prepayment the payment is a constant annuity; with a Prepayment assumption
+    part of the balance is repaid early each period and the scheduled payment is
+    re-amortized over the remaining term.
     """
 
     curve: str
@@ -15,3 +58,87 @@ class LevelPayMortgage:
     annual_rate: float
     term_years: float
     payments_per_year: int
+    prepayment: Prepayment | None = None
+
+    @property
+    def periods(self) -> int:
+        """Number of scheduled payments."""
+        return int(self.term_years * self.payments_per_year)
+
+
+@dataclass
+class MortgagePool:
+    """
+    Columnar (structure-of-arrays) pool of level-pay mortgages on one curve with
+    one prepayment assumption (e.g. the loans behind an MBS).
+    Per-loan fields are contiguous arrays; `periods` and `payments_per_year` are
+    integer arrays. Cashflows come from pricing.amortization.pool_cashflows and
+    values from MortgagePricer.npv_pool.
+    """
+
+    curve: str
+    notionals: array
+    annual_rates: array
+    periods: array
+    payments_per_year: array
+    prepayment: Prepayment | None = None
+
+    def __post_init__(self) -> None:
+        n = len(self.notionals)
+        if any(len(col) != n for col in (self.annual_rates, self.periods, self.payments_per_year)):
+            raise ValueError(
+                "notionals, annual_rates, periods and payments_per_year must have the same length"
+            )
+        if any(p <= 0 for p in self.periods) or any(f <= 0 for f in self.payments_per_year):
+            raise ValueError("periods and payments_per_year must be positive")
+
+    def __len__(self) -> int:
+        return len(self.notionals)
+
+    def shapes(self) -> dict[tuple[float, int, int], list[int]]:
+        """
+        Loan indices per distinct (rate, periods, payments per year), in first-seen
+        order. Loans of one shape have cashflows proportional to their notional.
+        """
+        shapes: dict[tuple[float, int, int], list[int]] = {}
+        for i, key in enumerate(zip(self.annual_rates, self.periods, self.payments_per_year)):
+            shapes.setdefault(key, []).append(i)
+        return shapes
+
+    @classmethod
+    def from_loans(
+        cls, loans: Sequence[LevelPayMortgage], prepayment: Prepayment | None = None
+    ) -> MortgagePool:
+        """
+        Pack loans (all on the same curve) into a pool, preserving order.
+
+        The pool uses `prepayment` if given, else the loans' common assumption
+        (loans with different assumptions cannot share a pool).
+        """
+        if not loans:
+            raise ValueError("loans must not be empty")
+        curve = loans[0].curve
+        if any(m.curve != curve for m in loans):
+            raise ValueError("all loans in a pool must share the same curve")
+        if prepayment is None:
+            prepayment = loans[0].prepayment
+            if any(m.prepayment != prepayment for m in loans):
+                raise ValueError("loans in a pool must share one prepayment assumption")
+        return cls(
+            curve=curve,
+            notionals=array("d", (m.notional for m in loans)),
+            annual_rates=array("d", (m.annual_rate for m in loans)),
+            periods=array("q", (m.periods for m in loans)),
+            payments_per_year=array("q", (m.payments_per_year for m in loans)),
+            prepayment=prepayment,
+        )
+
+    @classmethod
+    def partition(cls, loans: Sequence[LevelPayMortgage]) -> list[tuple[list[int], MortgagePool]]:
+        """Pack loans into one pool per (curve, prepayment): [(input indices, pool)]."""
+        groups: dict[tuple, list[int]] = {}
+        for i, m in enumerate(loans):
+            groups.setdefault((m.curve, m.prepayment), []).append(i)
+        return [
+            (indices, cls.from_loans([loans[i] for i in indices])) for indices in groups.values()
+        ]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 
@@ -19,3 +21,59 @@ class FixedFloatSwap:
     fixed_rate: float
     pay_times: list[float]
     t0: float = 0.0
+
+
+@dataclass
+class SwapBlock:
+    """
+    Columnar (structure-of-arrays) book of fixed-float swaps on one curve.
+    Per-trade fields are contiguous float arrays; the ragged pay schedules are
+    stored back to back in `pay_times`, with trade i's schedule at
+    pay_times[offsets[i]:offsets[i + 1]] (so len(offsets) == len(block) + 1).
+    Priced in one pass by SwapPricer.npv_block.
+    """
+
+    curve: str
+    notionals: array
+    fixed_rates: array
+    pay_times: array
+    offsets: array
+    t0s: array
+
+    def __post_init__(self) -> None:
+        n = len(self.notionals)
+        if len(self.fixed_rates) != n or len(self.t0s) != n:
+            raise ValueError("notionals, fixed_rates and t0s must have the same length")
+        if len(self.offsets) != n + 1 or self.offsets[0] != 0:
+            raise ValueError("offsets must start at 0 and have len(block) + 1 entries")
+        if self.offsets[-1] != len(self.pay_times):
+            raise ValueError("offsets[-1] must equal len(pay_times)")
+
+    def __len__(self) -> int:
+        return len(self.notionals)
+
+    def schedule(self, i: int) -> array:
+        """Pay times of trade i."""
+        return self.pay_times[self.offsets[i]:self.offsets[i + 1]]
+
+    @classmethod
+    def from_trades(cls, swaps: Sequence[FixedFloatSwap]) -> SwapBlock:
+        """Pack swaps (all on the same curve) into a block, preserving order."""
+        if not swaps:
+            raise ValueError("swaps must not be empty")
+        curve = swaps[0].curve
+        if any(s.curve != curve for s in swaps):
+            raise ValueError("all swaps in a block must share the same curve")
+        pay_times = array("d")
+        offsets = array("q", [0])
+        for s in swaps:
+            pay_times.extend(s.pay_times)
+            offsets.append(len(pay_times))
+        return cls(
+            curve=curve,
+            notionals=array("d", (s.notional for s in swaps)),
+            fixed_rates=array("d", (s.fixed_rate for s in swaps)),
+            pay_times=pay_times,
+            offsets=offsets,
+            t0s=array("d", (s.t0 for s in swaps)),
+        )
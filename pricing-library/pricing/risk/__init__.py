@@ -1,7 +1,9 @@
 """
 Risk measures implemented via "bump and reprice".
 
-New code should use PV01Parallel, FXDelta, and CS01Parallel classes for composability.
+New code should use PV01Parallel, FXDelta, and CS01Parallel classes for composability;
+compute_risks() evaluates several of them on one trade with a single base valuation.
+KeyRatePV01 produces a per-pillar PV01 ladder.
 Legacy functions pv01_parallel, fx_delta, and cs01_parallel are preserved for backward compatibility.
 """
 
@@ -9,10 +11,12 @@ from __future__ import annotations
 
 from pricing.market import Market
 from pricing.pricing import Trade
-from pricing.risk.base import BaseRiskMeasure
+from pricing.risk.base import BaseRiskMeasure, BumpRiskMeasure
 from pricing.risk.cs01 import CS01Parallel
 from pricing.risk.fx_delta import FXDelta
+from pricing.risk.key_rate import KeyRatePV01
 from pricing.risk.pv01 import PV01Parallel
+from pricing.risk.runner import compute_risks
 
 
 def pv01_parallel(
@@ -60,9 +64,12 @@ def cs01_parallel(
 
 __all__ = [
     "BaseRiskMeasure",
+    "BumpRiskMeasure",
+    "compute_risks",
     "PV01Parallel",
     "FXDelta",
     "CS01Parallel",
+    "KeyRatePV01",
     "pv01_parallel",
     "fx_delta",
     "cs01_parallel",
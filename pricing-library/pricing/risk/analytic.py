@@ -0,0 +1,57 @@
+"""Analytic parallel sensitivities from pricer exposures and curve derivatives."""
+
+from __future__ import annotations
+
+from pricing.interfaces import Instrument
+from pricing.market import Market
+from pricing.pricing import exposures
+
+
+def parallel_sensitivity(
+    instrument: Instrument, market: Market, curve_name: str
+) -> float | None:
+    """
+    d PV / d bump for a parallel shift of `curve_name` (as applied by `bumped`).
+
+    Chain rule over the pricer's exposures: sum of (d PV / d ln df(t)) *
+    (d ln df(t) / d bump). Returns None when the pricer has no exposures or the
+    curve has no log_df_derivative, so callers can fall back to bump-and-reprice.
+    """
+    curve = market.curve(curve_name)
+    derivative = getattr(curve, "log_df_derivative", None)
+    if derivative is None:
+        return None
+    trade_exposures = exposures(instrument, market)
+    if trade_exposures is None:
+        return None
+    return sum(
+        amount * derivative(t)
+        for name, t, amount in trade_exposures
+        if name == curve_name
+    )
+
+
+def key_rate_sensitivities(
+    instrument: Instrument, market: Market, curve_name: str
+) -> list[float] | None:
+    """
+    d PV / d bump per pillar of `curve_name` (as applied by `bumped_at`).
+
+    One pass over the pricer's exposures, spreading each onto the pillars that
+    interpolate its time. Returns None when the pricer has no exposures or the
+    curve has no pillar_log_df_derivatives.
+    """
+    curve = market.curve(curve_name)
+    derivatives = getattr(curve, "pillar_log_df_derivatives", None)
+    if derivatives is None:
+        return None
+    trade_exposures = exposures(instrument, market)
+    if trade_exposures is None:
+        return None
+    buckets = [0.0] * len(curve.pillars)
+    for name, t, amount in trade_exposures:
+        if name != curve_name:
+            continue
+        for k, d in derivatives(t):
+            buckets[k] += amount * d
+    return buckets
@@ -6,6 +6,7 @@ from abc import ABC, abstractmethod
 
 from pricing.interfaces import Instrument
 from pricing.market import Market
+from pricing.pricing import price
 
 
 class BaseRiskMeasure(ABC):
@@ -21,3 +22,37 @@ class BaseRiskMeasure(ABC):
     def compute(self, instrument: Instrument, market: Market) -> float:
         """Compute the risk measure value."""
         ...
+
+
+class BumpRiskMeasure(BaseRiskMeasure):
+    """
+    Bump-and-reprice risk measure split into scenario + finite-difference steps.
+
+    Subclasses define the bumped scenario market and how to turn (base PV,
+    bumped PV) into the measure. That lets a risk runner price the unbumped base
+    once and share it across many measures; compute() does both steps for a
+    single measure. Subclasses with a closed form override analytic_value(),
+    which is tried first.
+    """
+
+    @abstractmethod
+    def scenario(self, market: Market) -> Market:
+        """Return the bumped market."""
+        ...
+
+    @abstractmethod
+    def from_pvs(self, pv_base: float, pv_bumped: float, market: Market) -> float:
+        """Combine base and bumped PVs into the measure value (market is the base)."""
+        ...
+
+    def analytic_value(self, instrument: Instrument, market: Market) -> float | None:
+        """Closed-form value if available, else None (bump-and-reprice is used)."""
+        return None
+
+    def compute(self, instrument: Instrument, market: Market) -> float:
+        """Analytic value when available; otherwise price base and bumped scenario."""
+        value = self.analytic_value(instrument, market)
+        if value is not None:
+            return value
+        pv_bumped = price(instrument, self.scenario(market))
+        return self.from_pvs(price(instrument, market), pv_bumped, market)
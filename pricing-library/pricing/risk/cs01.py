@@ -6,25 +6,37 @@ from dataclasses import dataclass
 
 from pricing.interfaces import Instrument
 from pricing.market import Market
-from pricing.pricing import price
-from pricing.risk.base import BaseRiskMeasure
+from pricing.risk.analytic import parallel_sensitivity
+from pricing.risk.base import BumpRiskMeasure
 
 
 @dataclass
-class CS01Parallel(BaseRiskMeasure):
+class CS01Parallel(BumpRiskMeasure):
     """CS01: sensitivity to parallel hazard curve shift."""
 
     hazard_curve_name: str
     bump_bp: float = 1.0
+    use_analytic: bool = True
 
     @property
     def name(self) -> str:
         return f"CS01_{self.hazard_curve_name}"
 
-    def compute(self, instrument: Instrument, market: Market) -> float:
-        """PV(bumped) - PV(base) for parallel hazard curve shift."""
+    def analytic_value(self, instrument: Instrument, market: Market) -> float | None:
+        """First-order value: d PV / d bump * bump (None -> bump-and-reprice)."""
+        if not self.use_analytic:
+            return None
+        sensitivity = parallel_sensitivity(instrument, market, self.hazard_curve_name)
+        if sensitivity is None:
+            return None
+        return sensitivity * self.bump_bp / 10000.0
+
+    def scenario(self, market: Market) -> Market:
+        """Market with the hazard curve shifted in parallel by bump_bp."""
         bump = self.bump_bp / 10000.0
         curve = market.curve(self.hazard_curve_name)
-        bumped_curve = curve.bumped(bump)
-        bumped_market = market.with_curve(self.hazard_curve_name, bumped_curve)
-        return price(instrument, bumped_market) - price(instrument, market)
+        return market.with_curve(self.hazard_curve_name, curve.bumped(bump))
+
+    def from_pvs(self, pv_base: float, pv_bumped: float, market: Market) -> float:
+        """PV(bumped) - PV(base) for parallel hazard curve shift."""
+        return pv_bumped - pv_base
@@ -4,14 +4,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from pricing.interfaces import Instrument
 from pricing.market import Market
-from pricing.pricing import price
-from pricing.risk.base import BaseRiskMeasure
+from pricing.risk.base import BumpRiskMeasure
 
 
 @dataclass
-class FXDelta(BaseRiskMeasure):
+class FXDelta(BumpRiskMeasure):
     """FX delta: (PV(bumped) - PV(base)) / (spot_bumped - spot)."""
 
     pair: str
@@ -21,11 +19,13 @@ class FXDelta(BaseRiskMeasure):
     def name(self) -> str:
         return f"FXDelta_{self.pair}"
 
-    def compute(self, instrument: Instrument, market: Market) -> float:
+    def scenario(self, market: Market) -> Market:
+        """Market with the spot scaled by (1 + bump_pct)."""
+        spot = market.fx(self.pair)
+        return market.with_fx(self.pair, spot * (1.0 + self.bump_pct))
+
+    def from_pvs(self, pv_base: float, pv_bumped: float, market: Market) -> float:
         """Finite-difference delta with relative spot bump."""
         spot = market.fx(self.pair)
         spot_bumped = spot * (1.0 + self.bump_pct)
-        bumped_market = market.with_fx(self.pair, spot_bumped)
-        pv_base = price(instrument, market)
-        pv_bumped = price(instrument, bumped_market)
         return (pv_bumped - pv_base) / (spot_bumped - spot)
@@ -0,0 +1,41 @@
+"""Risk runner: many risk measures on one trade with a single base valuation."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from pricing.interfaces import Instrument, RiskMeasure
+from pricing.market import Market
+from pricing.pricing import price
+from pricing.risk.base import BumpRiskMeasure
+
+
+def compute_risks(
+    instrument: Instrument,
+    market: Market,
+    measures: Sequence[RiskMeasure],
+    base_pv: float | None = None,
+) -> dict[str, float]:
+    """
+    Compute several risk measures, pricing the unbumped base at most once.
+
+    Bump-and-reprice measures (BumpRiskMeasure) use their analytic value when
+    they have one; otherwise they share one base PV and cost one bumped
+    valuation each. Any other RiskMeasure falls back to its own compute().
+    Pass base_pv when the caller has already priced the trade on `market`.
+    Returns {measure.name: value} in the order of `measures`.
+    """
+    results: dict[str, float] = {}
+    for measure in measures:
+        if isinstance(measure, BumpRiskMeasure):
+            value = measure.analytic_value(instrument, market)
+            if value is not None:
+                results[measure.name] = value
+                continue
+            if base_pv is None:
+                base_pv = price(instrument, market)
+            pv_bumped = price(instrument, measure.scenario(market))
+            results[measure.name] = measure.from_pvs(base_pv, pv_bumped, market)
+        else:
+            results[measure.name] = measure.compute(instrument, market)
+    return results
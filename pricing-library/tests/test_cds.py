@@ -1,9 +1,9 @@
-"""Tests for CDS and CS01."""
+"""Tests for CDS, CDSBlock and CS01."""
 
 from pricing.curves import HazardRateCurve, ZeroRateCurve
 from pricing.market import Market
 from pricing.pricers.cds_pricer import CDSPricer
-from pricing.products.cds import CDS
+from pricing.products.cds import CDS, CDSBlock
 from pricing.pricing import price
 from pricing.risk import cs01_parallel
 
@@ -70,3 +70,28 @@ def test_cs01_protection_buyer_positive() -> None:
     )
     cs01 = cs01_parallel(cds, market, "CORP_HAZ", bump_bp=1.0)
     assert cs01 > 0
+
+
+def test_cds_block_matches_per_trade_npv() -> None:
+    """CDSPricer.npv_block values a ragged block exactly like per-trade npv()."""
+    disc_curve = ZeroRateCurve(name="USD_DISC", pillars=[0.5, 1.0, 2.0, 5.0], zero_rates_cc=[0.045, 0.043, 0.04, 0.038])
+    hazard_curve = HazardRateCurve(name="CORP_HAZ", pillars=[1.0, 3.0, 5.0], hazard_rates=[0.008, 0.012, 0.015])
+    market = Market(curves={"USD_DISC": disc_curve, "CORP_HAZ": hazard_curve})
+    trades = [
+        CDS(
+            discount_curve="USD_DISC", survival_curve="CORP_HAZ", notional=10_000_000,
+            premium_rate=0.01, pay_times=[0.5 * (i + 1) for i in range(10)],
+        ),
+        CDS(
+            discount_curve="USD_DISC", survival_curve="CORP_HAZ", notional=5_000_000,
+            premium_rate=0.006, pay_times=[1.0, 2.0, 3.0], recovery=0.25, protection_buyer=False,
+        ),
+        CDS(
+            discount_curve="USD_DISC", survival_curve="CORP_HAZ", notional=1_000_000,
+            premium_rate=0.02, pay_times=[1.5, 2.0], t0=1.0,
+        ),
+    ]
+    block = CDSBlock.from_trades(trades)
+    assert len(block) == 3
+    for cds, value in zip(trades, CDSPricer.npv_block(block, market)):
+        assert abs(value - price(cds, market)) < 1e-6
@@ -1,9 +1,9 @@
-"""Tests for ZeroRateCurve."""
+"""Tests for ZeroRateCurve and HazardRateCurve."""
 
 import math
 import pytest
 
-from pricing.curves import ZeroRateCurve
+from pricing.curves import HazardRateCurve, ZeroRateCurve, discount_factors
 
 
 def test_curve_interpolation_endpoints() -> None:
@@ -88,3 +88,90 @@ def test_zero_rate_t_negative_raises() -> None:
     curve = ZeroRateCurve(name="C", pillars=[1.0], zero_rates_cc=[0.04])
     with pytest.raises(ValueError, match="t must be >= 0"):
         curve.zero_rate_cc(-0.1)
+
+
+def test_zero_rates_many_matches_scalar() -> None:
+    """Batch zero rates agree with zero_rate_cc, including extrapolation and pillar hits."""
+    pillars = [0.5, 1.0, 2.0, 5.0]
+    rates = [0.05, 0.04, 0.035, 0.03]
+    curve = ZeroRateCurve(name="C", pillars=pillars, zero_rates_cc=rates)
+    times = [0.0, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 7.0]
+    batch = curve.zero_rates_many(times)
+    assert len(batch) == len(times)
+    for t, r in zip(times, batch):
+        assert abs(r - curve.zero_rate_cc(t)) < 1e-15
+
+
+def test_df_many_matches_scalar() -> None:
+    """Batch discount factors agree with df(t) for unsorted times."""
+    curve = ZeroRateCurve(name="C", pillars=[0.5, 1.0, 2.0], zero_rates_cc=[0.05, 0.04, 0.035])
+    times = [2.5, 0.1, 1.2, 0.5]
+    for t, d in zip(times, curve.df_many(times)):
+        assert abs(d - curve.df(t)) < 1e-15
+    assert curve.df_many([]) == []
+
+
+def test_zero_rates_many_t_negative_raises() -> None:
+    """zero_rates_many with any t < 0 raises."""
+    curve = ZeroRateCurve(name="C", pillars=[1.0], zero_rates_cc=[0.04])
+    with pytest.raises(ValueError, match="t must be >= 0"):
+        curve.zero_rates_many([0.5, -0.1])
+
+
+def test_discount_factors_scalar_fallback() -> None:
+    """discount_factors() falls back to df(t) for curves without df_many."""
+
+    class FlatCurve:
+        name = "FLAT"
+
+        def df(self, t: float) -> float:
+            return 1.0 / (1.0 + t)
+
+        def bumped(self, bump: float) -> "FlatCurve":
+            return self
+
+    assert discount_factors(FlatCurve(), [0.0, 1.0, 3.0]) == [1.0, 0.5, 0.25]
+    curve = ZeroRateCurve(name="C", pillars=[1.0], zero_rates_cc=[0.04])
+    assert discount_factors(curve, [1.0]) == curve.df_many([1.0])
+
+
+def test_zero_rate_dense_curve_interpolation() -> None:
+    """Binary-search lookup picks the right segment on a dense curve."""
+    pillars = [0.25 * (i + 1) for i in range(120)]
+    rates = [0.02 + 0.0001 * i * i for i in range(120)]
+    curve = ZeroRateCurve(name="C", pillars=pillars, zero_rates_cc=rates)
+    for i in range(119):
+        t = (pillars[i] + pillars[i + 1]) / 2.0
+        assert abs(curve.zero_rate_cc(t) - (rates[i] + rates[i + 1]) / 2.0) < 1e-12
+        assert abs(curve.zero_rate_cc(pillars[i]) - rates[i]) < 1e-15
+
+
+def test_hazard_rate_lookup() -> None:
+    """Piecewise-constant hazard: flat beyond endpoints, left segment at pillar hits."""
+    curve = HazardRateCurve(name="H", pillars=[1.0, 2.0, 3.0], hazard_rates=[0.01, 0.02, 0.03])
+    assert curve.hazard_rate(0.5) == 0.01
+    assert curve.hazard_rate(1.5) == 0.01
+    assert curve.hazard_rate(2.0) == 0.01
+    assert curve.hazard_rate(2.5) == 0.02
+    assert curve.hazard_rate(4.0) == 0.03
+
+
+def test_hazard_survival_piecewise_integral() -> None:
+    """S(t) = exp(-integral of piecewise-constant hazard), flat beyond the last pillar."""
+    curve = HazardRateCurve(name="H", pillars=[1.0, 2.0, 5.0], hazard_rates=[0.01, 0.02, 0.03])
+    assert curve.df(0.0) == 1.0
+    assert abs(curve.df(0.5) - math.exp(-0.005)) < 1e-15
+    assert abs(curve.df(2.0) - math.exp(-(0.01 + 0.02))) < 1e-15
+    assert abs(curve.df(3.0) - math.exp(-(0.01 + 0.02 + 0.03))) < 1e-15
+    assert abs(curve.df(7.0) - math.exp(-(0.01 + 0.02 + 0.09 + 0.06))) < 1e-15
+
+
+def test_hazard_survival_many_matches_scalar() -> None:
+    """Batch survival probabilities agree with df(t) for arbitrary times."""
+    curve = HazardRateCurve(name="H", pillars=[0.5, 1.0, 3.0], hazard_rates=[0.01, 0.015, 0.02], t0=0.1)
+    times = [0.0, 0.05, 0.5, 0.7, 1.0, 2.0, 3.0, 4.5]
+    batch = curve.survival_many(times)
+    assert batch == curve.df_many(times)
+    for t, s in zip(times, batch):
+        assert s == curve.df(t)
+    assert curve.df(0.05) == 1.0  # before t0: no hazard accrued
@@ -0,0 +1,44 @@
+"""Tests for the curve stream wire encoding."""
+
+from dataclasses import replace
+
+import pytest
+
+from pricing.curve_payload import CurveData, decode, encode_delta, encode_full, encode_json
+
+_PILLARS = (0.5, 1.0, 2.0, 5.0, 10.0)
+
+
+def _curve(rates: list[float], seq: int | None) -> CurveData:
+    return CurveData(name="USD_DISC", pillars=_PILLARS, zero_rates_cc=tuple(rates), seq=seq)
+
+
+def test_round_trip_and_size() -> None:
+    """Binary payloads round-trip exactly, are smaller than JSON, and reject what they cannot apply."""
+    base = _curve([0.0451234567891234, 0.043, 0.0401234567891234, 0.038, 0.037], seq=7)
+    moved = _curve([0.0451234567891234, 0.0431234567891234, 0.0401234567891234, 0.038, 0.037], seq=8)
+    full, delta, legacy = encode_full(moved), encode_delta(base, moved), encode_json(moved)
+    assert decode(full) == moved and decode(legacy) == replace(moved, seq=None)
+    assert decode(delta, base) == moved
+    assert len(delta) < len(full) < len(legacy)
+    assert decode(delta) is None
+    assert decode(full[:1] + bytes([1]) + full[2:]) is None  # unknown schema version
+    assert decode(full[:-4]) is None
+    assert encode_delta(base, CurveData(name="USD_DISC", pillars=(1.0,), zero_rates_cc=(0.04,), seq=8)) is None
+    assert encode_delta(replace(base, seq=None), moved) is None
+    with pytest.raises(ValueError, match="sequence number"):
+        encode_full(replace(moved, seq=None))
+
+
+def test_delta_applies_only_to_the_entry_it_follows() -> None:
+    """A delta after a missed entry, or against a base with other pillars or t0, is skipped."""
+    first = _curve([0.045, 0.043, 0.040, 0.038, 0.037], seq=1)
+    second = _curve([0.046, 0.043, 0.040, 0.038, 0.037], seq=2)
+    third = _curve([0.046, 0.044, 0.040, 0.038, 0.037], seq=3)
+    delta = encode_delta(second, third)
+    assert decode(delta, second) == third
+    assert decode(delta, first) is None  # entry 2 was missed
+    assert decode(delta, replace(second, t0=1.0)) is None
+    assert decode(delta, replace(second, pillars=(0.5, 1.0, 2.0, 5.0, 20.0))) is None
+    assert decode(delta, replace(second, name="EUR_DISC")) is None
+    assert decode(delta, decode(encode_json(second))) is None  # JSON entries carry no sequence number
@@ -6,9 +6,10 @@ import pytest
 
 from pricing.curves import HazardRateCurve, ZeroRateCurve
 from pricing.engine import PricingEngine, create_default_engine
+from pricing.hooks import CallCounter, HookCall, ProfilingHook, TimingHook
 from pricing.market import Market
 from pricing.pricers.base import BasePricer
-from pricing.pricing import price
+from pricing.pricing import add_hook, price, price_batch, remove_hook
 from pricing.risk import PV01Parallel, FXDelta, pv01_parallel, fx_delta
 
 
@@ -149,3 +150,218 @@ def test_risk_measure_classes_composable() -> None:
 
     assert abs(pv01_measure.compute(bond, market) - pv01_parallel(bond, market, "USD", bump_bp=1.0)) < 1e-10
     assert abs(fx_delta_measure.compute(fwd, market) - fx_delta(fwd, market, "EURUSD", bump_pct=0.01)) < 1e-10
+
+
+def test_npv_batch_matches_npv_in_input_order() -> None:
+    """npv_batch on a mixed book returns the same values as per-trade npv, in order."""
+    usd = ZeroRateCurve(name="USD", pillars=[0.5, 1.0, 2.0], zero_rates_cc=[0.045, 0.043, 0.04])
+    eur = ZeroRateCurve(name="EUR", pillars=[0.5, 1.0, 2.0], zero_rates_cc=[0.04, 0.038, 0.036])
+    hazard = HazardRateCurve(name="HAZ", pillars=[0.5, 1.0, 2.0], hazard_rates=[0.01, 0.01, 0.01])
+    market = Market(curves={"USD": usd, "EUR": eur, "HAZ": hazard}, fx_spot={"EURUSD": 1.08})
+
+    from pricing.products.bond import ZeroCouponBond
+    from pricing.products.cds import CDS
+    from pricing.products.fx import FXForward
+    from pricing.products.mortgage import LevelPayMortgage
+    from pricing.products.swap import FixedFloatSwap
+
+    book = [
+        ZeroCouponBond(curve="USD", maturity=1.5, notional=1_000_000),
+        FXForward(
+            pair="EURUSD", base_curve="EUR", quote_curve="USD",
+            maturity=1.0, notional_base=5_000_000, strike=1.085,
+        ),
+        ZeroCouponBond(curve="EUR", maturity=0.75, notional=250_000),
+        FixedFloatSwap(curve="USD", notional=10_000_000, fixed_rate=0.04, pay_times=[0.5, 1.0, 1.5, 2.0]),
+        LevelPayMortgage(curve="USD", notional=500_000, annual_rate=0.06, term_years=2.0, payments_per_year=12),
+        CDS(discount_curve="USD", survival_curve="HAZ", notional=10_000_000, premium_rate=0.005, pay_times=[0.5, 1.0, 2.0]),
+        ZeroCouponBond(curve="USD", maturity=2.0, notional=-300_000),
+    ]
+    engine = create_default_engine()
+    batch = engine.npv_batch(book, market)
+    assert len(batch) == len(book)
+    for trade, value in zip(book, batch):
+        assert abs(value - engine.npv(trade, market)) < 1e-8
+    assert price_batch(book, market) == batch
+    assert engine.npv_batch([], market) == []
+
+
+def test_npv_batch_custom_pricer_and_unknown_instrument() -> None:
+    """Custom pricers get the default npv_batch; unknown types still raise."""
+
+    @dataclass
+    class CustomInstrument:
+        value: float
+
+    @dataclass
+    class UnregisteredInstrument:
+        pass
+
+    class CustomPricer(BasePricer):
+        def can_price(self, instrument) -> bool:
+            return isinstance(instrument, CustomInstrument)
+
+        def npv(self, instrument, market: Market) -> float:
+            return instrument.value
+
+    market = Market(curves={"C": ZeroRateCurve(name="C", pillars=[1.0], zero_rates_cc=[0.04])})
+    engine = PricingEngine()
+    engine.register(CustomPricer())
+    assert engine.npv_batch([CustomInstrument(1.0), CustomInstrument(2.0)], market) == [1.0, 2.0]
+    with pytest.raises(ValueError, match="No pricer registered"):
+        engine.npv_batch([CustomInstrument(1.0), UnregisteredInstrument()], market)
+
+
+def test_dispatch_cache_hits_misses_and_invalidation() -> None:
+    """Pricer resolution is cached per type, cleared on register, first match still wins."""
+
+    @dataclass
+    class CustomInstrument:
+        value: float
+
+    class FirstPricer(BasePricer):
+        def can_price(self, instrument) -> bool:
+            return isinstance(instrument, CustomInstrument)
+
+        def npv(self, instrument, market: Market) -> float:
+            return 1.0
+
+    class SecondPricer(FirstPricer):
+        def npv(self, instrument, market: Market) -> float:
+            return 2.0
+
+    market = Market(curves={"C": ZeroRateCurve(name="C", pillars=[1.0], zero_rates_cc=[0.04])})
+    engine = PricingEngine()
+    engine.register(FirstPricer())
+    assert engine.npv(CustomInstrument(0.0), market) == 1.0
+    assert engine.npv(CustomInstrument(0.0), market) == 1.0
+    assert engine.npv_batch([CustomInstrument(0.0)] * 3, market) == [1.0] * 3
+    stats = engine.dispatch_stats
+    assert (stats.hits, stats.misses, stats.cached_types) == (2, 1, 1)
+
+    engine.register(SecondPricer())
+    assert engine.dispatch_stats.cached_types == 0
+    assert engine.npv(CustomInstrument(0.0), market) == 1.0  # first registered still wins
+    assert engine.dispatch_stats.misses == 2
+
+    engine.reset_dispatch_stats()
+    assert (engine.dispatch_stats.hits, engine.dispatch_stats.misses) == (0, 0)
+
+
+def test_hooks_count_and_time_per_pricer_and_type() -> None:
+    """Hooks see npv and npv_batch calls keyed by (pricer, instrument type), including errors."""
+    from pricing.products.bond import ZeroCouponBond
+
+    @dataclass
+    class Failing:
+        pass
+
+    class FailingPricer(BasePricer):
+        def can_price(self, instrument) -> bool:
+            return isinstance(instrument, Failing)
+
+        def npv(self, instrument, market: Market) -> float:
+            raise RuntimeError("boom")
+
+    market = Market(curves={"USD": ZeroRateCurve(name="USD", pillars=[1.0, 2.0], zero_rates_cc=[0.04, 0.04])})
+    bond = ZeroCouponBond(curve="USD", maturity=1.5, notional=1_000_000)
+    engine = create_default_engine()
+    engine.register(FailingPricer())
+    ticks = iter(range(100))
+    counter = engine.hooks.add(CallCounter())
+    timer = engine.hooks.add(TimingHook(clock=lambda: float(next(ticks))))
+
+    expected = engine.npv(bond, market)
+    assert engine.npv_batch([bond, bond, bond], market) == [expected] * 3
+    with pytest.raises(RuntimeError, match="boom"):
+        engine.npv(Failing(), market)
+
+    key = ("BondPricer", "ZeroCouponBond")
+    assert counter.calls[key] == 2 and counter.instruments[key] == 4
+    assert counter.errors == {("FailingPricer", "Failing"): 1}
+    assert timer.stats[key].calls == 2 and timer.stats[key].total_seconds == 2.0
+    assert timer.hottest(1)[0][0] == key
+
+    engine.hooks.remove(counter)
+    engine.npv(bond, market)
+    assert counter.calls[key] == 2 and len(engine.hooks) == 1
+    with pytest.raises(ValueError, match="not registered"):
+        engine.hooks.remove(counter)
+
+
+def test_hooks_finish_in_reverse_order_and_default_engine() -> None:
+    """start() runs in registration order, finish() in reverse; add_hook targets price()."""
+    from pricing.products.bond import ZeroCouponBond
+
+    events: list[str] = []
+
+    class Recorder:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def start(self, call: HookCall) -> str:
+            events.append(f"start {self.name} {call.operation}")
+            return self.name
+
+        def finish(self, call: HookCall, token: str, error) -> None:
+            events.append(f"finish {token}")
+
+    market = Market(curves={"USD": ZeroRateCurve(name="USD", pillars=[1.0], zero_rates_cc=[0.04])})
+    bond = ZeroCouponBond(curve="USD", maturity=1.0, notional=100.0)
+    a, b = Recorder("a"), Recorder("b")
+    add_hook(a)
+    add_hook(b)
+    try:
+        price(bond, market)
+    finally:
+        remove_hook(a)
+        remove_hook(b)
+    assert events == ["start a npv", "start b npv", "finish b", "finish a"]
+    price(bond, market)
+    assert len(events) == 4
+
+
+def test_failing_hook_start_finishes_only_started_hooks() -> None:
+    """A start() that raises skips the pricer; hooks already started still finish."""
+    from pricing.products.bond import ZeroCouponBond
+
+    finished: list[BaseException | None] = []
+
+    class Started:
+        def start(self, call: HookCall) -> None:
+            return None
+
+        def finish(self, call: HookCall, token: None, error) -> None:
+            finished.append(error)
+
+    class Broken(Started):
+        def start(self, call: HookCall) -> None:
+            raise RuntimeError("hook failed")
+
+    market = Market(curves={"USD": ZeroRateCurve(name="USD", pillars=[1.0], zero_rates_cc=[0.04])})
+    bond = ZeroCouponBond(curve="USD", maturity=1.0, notional=100.0)
+    engine = create_default_engine()
+    engine.hooks.add(Started())
+    engine.hooks.add(Broken())
+    with pytest.raises(RuntimeError, match="hook failed"):
+        engine.npv(bond, market)
+    assert len(finished) == 1 and isinstance(finished[0], RuntimeError)
+
+
+def test_profiling_hook_samples_every_nth_call() -> None:
+    """ProfilingHook profiles one call in sample_every and aggregates per key."""
+    from pricing.products.bond import ZeroCouponBond
+
+    with pytest.raises(ValueError, match="sample_every"):
+        ProfilingHook(sample_every=0)
+
+    market = Market(curves={"USD": ZeroRateCurve(name="USD", pillars=[1.0], zero_rates_cc=[0.04])})
+    bond = ZeroCouponBond(curve="USD", maturity=1.0, notional=100.0)
+    engine = create_default_engine()
+    profiler = engine.hooks.add(ProfilingHook(sample_every=3))
+    for _ in range(7):
+        engine.npv(bond, market)
+    key = ("BondPricer", "ZeroCouponBond")
+    assert profiler.samples == {key: 2}
+    stats = profiler.stats(key)
+    assert stats is not None and stats.total_calls > 0
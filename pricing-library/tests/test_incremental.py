@@ -0,0 +1,114 @@
+"""Tests for incremental repricing on curve ticks."""
+
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from pricing.curves import HazardRateCurve, ZeroRateCurve
+from pricing.engine import create_default_engine
+from pricing.incremental import IncrementalBook
+from pricing.market import Market
+from pricing.pricers.base import BasePricer
+from pricing.pricing import price_batch
+from pricing.products.bond import ZeroCouponBond
+from pricing.products.cds import CDS
+from pricing.products.fx import FXForward
+from pricing.products.mortgage import LevelPayMortgage, Prepayment
+from pricing.products.swap import FixedFloatSwap
+from pricing.risk.analytic import key_rate_sensitivities
+
+
+def _market() -> Market:
+    usd = ZeroRateCurve(name="USD", pillars=[0.5, 1.0, 2.0, 5.0, 10.0], zero_rates_cc=[0.045, 0.043, 0.04, 0.038, 0.037])
+    eur = ZeroRateCurve(name="EUR", pillars=[0.5, 1.0, 2.0, 5.0], zero_rates_cc=[0.04, 0.038, 0.036, 0.034])
+    haz = HazardRateCurve(name="HAZ", pillars=[1.0, 3.0, 5.0], hazard_rates=[0.008, 0.012, 0.015])
+    return Market(curves={"USD": usd, "EUR": eur, "HAZ": haz}, fx_spot={"EURUSD": 1.08})
+
+
+_BOOK = [
+    ZeroCouponBond(curve="USD", maturity=0.75, notional=1_000_000),
+    ZeroCouponBond(curve="USD", maturity=8.0, notional=-400_000),
+    FixedFloatSwap(curve="USD", notional=10_000_000, fixed_rate=0.04, pay_times=[0.5, 1.0, 1.5, 2.0, 3.0]),
+    FixedFloatSwap(curve="EUR", notional=5_000_000, fixed_rate=0.03, pay_times=[1.5, 2.0], t0=1.0),
+    LevelPayMortgage(curve="USD", notional=500_000, annual_rate=0.06, term_years=5.0, payments_per_year=12),
+    LevelPayMortgage(curve="USD", notional=500_000, annual_rate=0.06, term_years=10.0, payments_per_year=12,
+                     prepayment=Prepayment(psa=150)),
+    FXForward(pair="EURUSD", base_curve="EUR", quote_curve="USD", maturity=1.0, notional_base=5_000_000, strike=1.085),
+    CDS(discount_curve="USD", survival_curve="HAZ", notional=10_000_000, premium_rate=0.01,
+        pay_times=[0.5 * (i + 1) for i in range(10)]),
+]
+
+
+def _assert_matches_full(book: IncrementalBook) -> None:
+    full = price_batch(book.trades, book.market)
+    for value, expected in zip(book.npvs, full):
+        assert abs(value - expected) <= 1e-9 * max(1.0, abs(expected))
+
+
+def test_incremental_ticks_match_full_revaluation() -> None:
+    """Random partial ticks on rate and hazard curves are repriced exactly, without full revalues."""
+    rng = random.Random(7)
+    book = IncrementalBook(_BOOK, _market())
+    for _ in range(50):
+        name = rng.choice(["USD", "USD", "EUR", "HAZ"])
+        n = len(book.market.curve(name).pillars)
+        deltas = [rng.uniform(-5e-4, 5e-4) if rng.random() < 0.4 else None for _ in range(n)]
+        book.apply_pillar_deltas(name, deltas)
+        _assert_matches_full(book)
+    assert book.stats.ticks == 50
+    assert book.stats.full_revalues == 1  # construction only
+    for i, trade in enumerate(_BOOK):
+        for name in ("USD", "EUR", "HAZ"):
+            expected = key_rate_sensitivities(trade, book.market, name)
+            for got, want in zip(book.pillar_sensitivities(i, name), expected):
+                assert abs(got - want) <= 1e-6 * max(1.0, abs(want))
+
+
+def test_only_trades_in_moved_segments_are_updated() -> None:
+    """A short-end tick leaves long-dated trades and other curves untouched."""
+    book = IncrementalBook(_BOOK, _market())
+    updated = book.apply_pillar_deltas("USD", [None, None, None, None, 1e-4])  # 10Y pillar only
+    assert 0 not in updated  # 0.75Y bond
+    assert 1 in updated and 5 in updated  # 8Y bond, 10Y mortgage
+    assert 3 not in updated  # EUR swap
+    _assert_matches_full(book)
+    assert book.apply_pillar_deltas("USD", [None] * 5) == []
+
+
+def test_full_revalue_fallbacks() -> None:
+    """Large moves, new pillars and the periodic refresh trigger a full revaluation."""
+    book = IncrementalBook(_BOOK, _market(), max_move=0.001, full_revalue_every=3)
+    book.apply_pillar_deltas("USD", [0.002, None, None, None, None])
+    assert book.stats.full_revalues == 2
+    book.update_curve(ZeroRateCurve(name="USD", pillars=[1.0, 5.0], zero_rates_cc=[0.04, 0.04]))
+    assert book.stats.full_revalues == 3
+    for _ in range(4):
+        book.apply_pillar_deltas("EUR", [1e-4, None, None, None])
+    assert book.stats.full_revalues == 4 and book.stats.incremental_ticks == 3
+    _assert_matches_full(book)
+    with pytest.raises(ValueError):
+        IncrementalBook(_BOOK, _market(), max_move=0.0)
+
+
+def test_trades_without_exposures_are_repriced_in_full() -> None:
+    """Custom pricers with no exposures still track the market (priced through the given engine)."""
+
+    @dataclass
+    class RateLinked:
+        curve: str
+
+    class RateLinkedPricer(BasePricer):
+        def can_price(self, instrument) -> bool:
+            return isinstance(instrument, RateLinked)
+
+        def npv(self, instrument, market: Market) -> float:
+            return 1_000.0 * market.curve(instrument.curve).df(3.0)
+
+    engine = create_default_engine()
+    engine.register(RateLinkedPricer())
+    trades = [RateLinked("USD"), _BOOK[0]]
+    book = IncrementalBook(trades, _market(), engine=engine)
+    updated = book.apply_pillar_deltas("USD", [None, None, 1e-4, 1e-4, None])
+    assert updated == [0]
+    assert book.npvs == engine.npv_batch(trades, book.market)
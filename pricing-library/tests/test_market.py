@@ -0,0 +1,57 @@
+"""Tests for Market snapshots and scenario overlays."""
+
+from collections import ChainMap
+
+from pricing.curves import ZeroRateCurve
+from pricing.market import MAX_OVERLAY_DEPTH, Market
+
+
+def _curve(name: str, rate: float) -> ZeroRateCurve:
+    return ZeroRateCurve(name=name, pillars=[1.0, 5.0], zero_rates_cc=[rate, rate])
+
+
+def test_market_copies_caller_dicts() -> None:
+    """Mutating the dicts passed in does not change the snapshot."""
+    curves = {"USD": _curve("USD", 0.04)}
+    fx = {"EURUSD": 1.1}
+    market = Market(curves=curves, fx_spot=fx)
+    curves["EUR"] = _curve("EUR", 0.03)
+    fx["EURUSD"] = 2.0
+    assert "EUR" not in market.curves
+    assert market.fx("EURUSD") == 1.1
+
+
+def test_with_curve_overlays_without_copying_parent() -> None:
+    """Scenario shadows one curve, shares the parent's others, leaves the parent unchanged."""
+    usd, eur = _curve("USD", 0.04), _curve("EUR", 0.03)
+    base = Market(curves={"USD": usd, "EUR": eur}, fx_spot={"EURUSD": 1.1})
+    bumped_usd = usd.bumped(0.0001)
+    scenario = base.with_curve("USD", bumped_usd)
+    assert scenario.curve("USD") is bumped_usd
+    assert scenario.curve("EUR") is eur
+    assert base.curve("USD") is usd
+    assert isinstance(scenario.curves, ChainMap)
+    assert scenario.curves.maps[-1] is base.curves
+    assert scenario.fx_spot is base.fx_spot
+    assert sorted(scenario.curves) == ["EUR", "USD"]
+
+
+def test_with_fx_overlays_and_adds_pairs() -> None:
+    base = Market(curves={"USD": _curve("USD", 0.04)}, fx_spot={"EURUSD": 1.1})
+    scenario = base.with_fx("EURUSD", 1.2).with_fx("GBPUSD", 1.3)
+    assert scenario.fx("EURUSD") == 1.2
+    assert scenario.fx("GBPUSD") == 1.3
+    assert base.fx("EURUSD") == 1.1
+    assert "GBPUSD" not in base.fx_spot
+    assert scenario.curves is base.curves
+
+
+def test_overlay_depth_is_bounded() -> None:
+    """Long chains of derived scenarios are flattened so lookups stay cheap."""
+    market = Market(curves={"USD": _curve("USD", 0.04)})
+    for i in range(3 * MAX_OVERLAY_DEPTH):
+        market = market.with_curve(f"C{i}", _curve(f"C{i}", 0.01))
+        if isinstance(market.curves, ChainMap):
+            assert len(market.curves.maps) <= MAX_OVERLAY_DEPTH
+    assert len(market.curves) == 1 + 3 * MAX_OVERLAY_DEPTH
+    assert market.curve("C0").name == "C0"
@@ -2,6 +2,8 @@
 
 import math
 
+import pytest
+
 from pricing.curves import ZeroRateCurve
 from pricing.market import Market
 from pricing.products.mortgage import LevelPayMortgage
@@ -70,3 +72,172 @@ def test_mortgage_payment_times() -> None:
     df_10 = math.exp(-0.05 * 1.0)
     expected = payment * (df_05 + df_10)
     assert abs(pv - expected) < 0.01
+
+
+def test_prepayment_speeds() -> None:
+    """Constant CPR, the PSA ramp (6% CPR from month 30 at 100 PSA), and SMM conversion."""
+    from pricing.products.mortgage import Prepayment
+
+    assert Prepayment(cpr=0.08).cpr_at(1) == 0.08
+    psa = Prepayment(psa=100)
+    assert abs(psa.cpr_at(1) - 0.002) < 1e-12
+    assert abs(psa.cpr_at(15) - 0.03) < 1e-12
+    assert psa.cpr_at(30) == psa.cpr_at(240) == 0.06
+    assert abs(Prepayment(psa=200).cpr_at(60) - 0.12) < 1e-12
+    assert abs((1 - Prepayment(cpr=0.06).smm(1, 12)) ** 12 - 0.94) < 1e-12
+    for bad in ({"cpr": 1.0}, {"cpr": -0.1}, {"psa": -50.0}):
+        with pytest.raises(ValueError):
+            Prepayment(**bad)
+
+
+def test_prepaid_loan_cashflows_amortize_notional() -> None:
+    """With prepayment principal still sums to the notional; faster speeds pay down earlier."""
+    from pricing.amortization import loan_cashflows
+    from pricing.products.mortgage import Prepayment
+
+    loans = [
+        LevelPayMortgage(curve="C", notional=1_000_000, annual_rate=0.06, term_years=30.0,
+                         payments_per_year=12, prepayment=p)
+        for p in (None, Prepayment(cpr=0.06), Prepayment(psa=100), Prepayment(psa=300))
+    ]
+    flows = [loan_cashflows(m) for m in loans]
+    for cf in flows:
+        assert len(cf) == 360
+        assert abs(sum(cf.scheduled_principal) + sum(cf.prepaid_principal) - 1_000_000) < 1e-6
+        assert cf.balance[-1] == 0.0
+    assert sum(flows[0].prepaid_principal) == 0.0
+    # Balance after 5 years: no prepayment > 100 PSA > 300 PSA.
+    assert flows[0].balance[59] > flows[2].balance[59] > flows[3].balance[59]
+    # No prepayment reproduces the level payment.
+    level = flows[0].total
+    assert max(level) - min(level) < 1e-6
+
+    # A premium loan (rate above the curve) loses value when it prepays faster.
+    market = Market(curves={"C": ZeroRateCurve(name="C", pillars=[1.0, 30.0], zero_rates_cc=[0.04, 0.04])})
+    pvs = [price(m, market) for m in loans]
+    assert pvs[0] > pvs[2] > pvs[3] > 1_000_000
+
+
+def test_principal_sums_to_notional_including_the_final_payment() -> None:
+    """Scheduled plus prepaid principal repays the notional; the last payment clears the balance."""
+    from pricing.amortization import _annuity, loan_cashflows, pool_cashflows
+    from pricing.products.mortgage import MortgagePool, Prepayment
+
+    for prepayment in (None, Prepayment(cpr=0.1), Prepayment(psa=300)):
+        loans = [
+            LevelPayMortgage(curve="C", notional=250_000.0 * (i + 1), annual_rate=rate, term_years=term,
+                             payments_per_year=12, prepayment=prepayment)
+            for i, (rate, term) in enumerate(((0.0, 10.0), (1e-7, 15.0), (0.0425, 30.0), (0.0713, 30.0), (0.09, 0.25)))
+        ]
+        for m in loans:
+            cf = loan_cashflows(m)
+            assert sum(cf.scheduled_principal) + sum(cf.prepaid_principal) == pytest.approx(m.notional, rel=1e-14)
+            assert cf.balance[-1] == 0.0 and cf.prepaid_principal[-1] == 0.0
+            # Per-period recursion on the balance, paying off what is left at maturity.
+            r, n, bal = m.annual_rate / 12, m.periods, m.notional
+            for k in range(n):
+                interest, principal = bal * r, bal * (_annuity(r, n - k) - r) if k < n - 1 else bal
+                early = (bal - principal) * prepayment.smm(k + 1, 12) if prepayment and k < n - 1 else 0.0
+                bal -= principal + early
+                assert (cf.interest[k], cf.scheduled_principal[k], cf.prepaid_principal[k]) == pytest.approx(
+                    (interest, principal, early), rel=1e-10, abs=1e-9
+                )
+        pool = pool_cashflows(MortgagePool.from_loans(loans))
+        total = sum(m.notional for m in loans)
+        assert sum(pool.scheduled_principal) + sum(pool.prepaid_principal) == pytest.approx(total, rel=1e-14)
+        assert pool.balance[-1] == 0.0
+
+
+def test_mortgage_pool_matches_loan_by_loan() -> None:
+    """npv_pool / pool_cashflows agree with per-loan pricing and cashflows; npv_batch groups by prepayment."""
+    from pricing.amortization import loan_cashflows, pool_cashflows
+    from pricing.pricers import MortgagePricer
+    from pricing.pricing import price_batch
+    from pricing.products.mortgage import MortgagePool, Prepayment
+
+    market = Market(curves={"C": ZeroRateCurve(name="C", pillars=[1.0, 10.0, 30.0], zero_rates_cc=[0.045, 0.04, 0.042])})
+    psa = Prepayment(psa=150)
+    loans = [
+        LevelPayMortgage(curve="C", notional=100_000 * (i + 1), annual_rate=(0.05, 0.06, 0.07)[i % 3],
+                         term_years=(15.0, 30.0)[i % 2], payments_per_year=12, prepayment=psa)
+        for i in range(12)
+    ]
+    pool = MortgagePool.from_loans(loans)
+    assert pool.prepayment == psa and len(pool) == 12
+    for m, value in zip(loans, MortgagePricer.npv_pool(pool, market)):
+        assert abs(value - price(m, market)) < 1e-6
+
+    aggregate = pool_cashflows(pool)
+    assert len(aggregate) == 360
+    for column in ("interest", "scheduled_principal", "prepaid_principal", "balance"):
+        expected = [0.0] * 360
+        for m in loans:
+            for k, x in enumerate(getattr(loan_cashflows(m), column)):
+                expected[k] += x
+        assert max(abs(a - b) for a, b in zip(getattr(aggregate, column), expected)) < 1e-6
+
+    mixed = loans[:3] + [
+        LevelPayMortgage(curve="C", notional=250_000, annual_rate=0.05, term_years=20.0, payments_per_year=4)
+    ]
+    assert price_batch(mixed, market) == [price(m, market) for m in mixed]
+    with pytest.raises(ValueError, match="prepayment"):
+        MortgagePool.from_loans(mixed)
+
+
+def test_rep_lines_reconcile_exactly_with_per_loan_pricing() -> None:
+    """Rep-lines group proportional loans, are priced as lines, and match loan-by-loan NPVs to rounding."""
+    from pricing.products.mortgage import Prepayment
+    from pricing.replines import npv_rep_lines, reconcile_rep_lines, rep_lines
+
+    market = Market(curves={
+        "C": ZeroRateCurve(name="C", pillars=[1.0, 10.0, 30.0], zero_rates_cc=[0.045, 0.04, 0.042]),
+        "D": ZeroRateCurve(name="D", pillars=[1.0, 30.0], zero_rates_cc=[0.03, 0.035]),
+    })
+    psa = Prepayment(psa=150)
+    loans = [
+        LevelPayMortgage(curve=("C", "D")[i % 2], notional=50_000.0 * (i % 7 + 1), annual_rate=(0.05, 0.06)[i % 3 == 0],
+                         term_years=30.0, payments_per_year=12, prepayment=(None, psa)[i % 5 == 0])
+        for i in range(60)
+    ]
+    loans.append(LevelPayMortgage(curve="C", notional=-100_000.0, annual_rate=0.07, term_years=15.0, payments_per_year=12))
+    loans.append(LevelPayMortgage(curve="C", notional=100_000.0, annual_rate=0.07, term_years=15.0, payments_per_year=12))
+
+    lines = rep_lines(loans)
+    assert len(lines) < len(loans)
+    assert sorted(i for line in lines for i in line.members) == list(range(len(loans)))
+    for line in lines:
+        members = [loans[i] for i in line.members]
+        assert {(m.curve, m.annual_rate, m.term_years, m.payments_per_year, m.prepayment) for m in members} == {
+            (line.mortgage.curve, line.mortgage.annual_rate, line.mortgage.term_years,
+             line.mortgage.payments_per_year, line.mortgage.prepayment)
+        }
+        assert abs(line.notional - sum(m.notional for m in members)) < 1e-9
+
+    _, npvs = npv_rep_lines(loans, market)
+    for line in lines:
+        if line.notional:
+            assert sum(npvs[i] for i in line.members) == pytest.approx(price(line.mortgage, market), rel=1e-12)
+    assert npvs == pytest.approx([price(m, market) for m in loans], rel=1e-12)
+    assert reconcile_rep_lines(loans, market) < 1e-12 * 350_000
+    assert npvs[-2] == -npvs[-1] != 0.0  # the netting line still allocates to both loans
+
+
+def test_rep_lines_rate_bucket_merges_nearby_rates() -> None:
+    """Bucketing snaps rates to a grid: one line priced at the bucket rate, small pricing breaks."""
+    from pricing.replines import npv_rep_lines, reconcile_rep_lines, rep_lines
+
+    market = Market(curves={"C": ZeroRateCurve(name="C", pillars=[1.0, 30.0], zero_rates_cc=[0.04, 0.04])})
+    loans = [
+        LevelPayMortgage(curve="C", notional=200_000, annual_rate=0.06 + 0.0001 * i, term_years=30.0, payments_per_year=12)
+        for i in range(5)
+    ]
+    assert len(rep_lines(loans)) == 5
+    bucketed = rep_lines(loans, rate_bucket=0.00125)
+    assert len(bucketed) == 1 and abs(bucketed[0].mortgage.annual_rate - 0.06) < 1e-12
+    _, npvs = npv_rep_lines(loans, market, rate_bucket=0.00125)
+    assert npvs == pytest.approx([price(bucketed[0].mortgage, market) / 5] * 5, rel=1e-12)
+    assert 0.0 < reconcile_rep_lines(loans, market, rate_bucket=0.00125, rtol=0.01) < 0.01 * 200_000
+    with pytest.raises(ValueError, match="differs from its own NPV"):
+        reconcile_rep_lines(loans, market, rate_bucket=0.00125)
+    with pytest.raises(ValueError, match="rate_bucket"):
+        rep_lines(loans, rate_bucket=0.0)
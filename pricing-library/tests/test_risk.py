@@ -1,13 +1,28 @@
-"""Tests for PV01 and FX delta."""
+"""Tests for PV01, CS01, FX delta (analytic and bump-and-reprice) and the risk runner."""
 
 import math
 
-from pricing.curves import ZeroRateCurve
+import pytest
+
+from pricing.curves import HazardRateCurve, ZeroRateCurve
 from pricing.market import Market
 from pricing.products.bond import ZeroCouponBond
+from pricing.products.cds import CDS
 from pricing.products.fx import FXForward
+from pricing.products.mortgage import LevelPayMortgage, Prepayment
+from pricing.products.swap import FixedFloatSwap
 from pricing.pricing import price
-from pricing.risk import pv01_parallel, fx_delta
+from pricing.risk import (
+    BaseRiskMeasure,
+    CS01Parallel,
+    FXDelta,
+    KeyRatePV01,
+    PV01Parallel,
+    compute_risks,
+    fx_delta,
+    pv01_parallel,
+)
+from pricing.risk import runner
 
 
 def test_pv01_zcb_negative() -> None:
@@ -50,3 +65,145 @@ def test_fx_delta_close_to_df_base_times_notional() -> None:
     expected = notional_base * df_base
     # Allow small numerical difference
     assert abs(delta - expected) < expected * 0.01
+
+
+def test_compute_risks_prices_base_once(monkeypatch) -> None:
+    """compute_risks matches individual measures and prices the base only once."""
+    eur = ZeroRateCurve(name="EUR", pillars=[1.0, 2.0], zero_rates_cc=[0.03, 0.032])
+    usd = ZeroRateCurve(name="USD", pillars=[1.0, 2.0], zero_rates_cc=[0.05, 0.048])
+    market = Market(curves={"EUR": eur, "USD": usd}, fx_spot={"EURUSD": 1.08})
+    fwd = FXForward(
+        pair="EURUSD",
+        base_curve="EUR",
+        quote_curve="USD",
+        maturity=1.5,
+        notional_base=5_000_000,
+        strike=1.085,
+    )
+    measures = [
+        PV01Parallel("USD", use_analytic=False),
+        PV01Parallel("EUR", use_analytic=False),
+        FXDelta("EURUSD"),
+    ]
+
+    calls: list[Market] = []
+
+    def counting_price(trade, m):
+        calls.append(m)
+        return price(trade, m)
+
+    monkeypatch.setattr(runner, "price", counting_price)
+    results = compute_risks(fwd, market, measures)
+    assert list(results) == ["PV01_USD", "PV01_EUR", "FXDelta_EURUSD"]
+    assert sum(1 for m in calls if m is market) == 1
+    assert len(calls) == 1 + len(measures)
+    for measure in measures:
+        assert abs(results[measure.name] - measure.compute(fwd, market)) < 1e-9
+
+    calls.clear()
+    compute_risks(fwd, market, measures, base_pv=price(fwd, market))
+    assert all(m is not market for m in calls)
+
+
+def test_compute_risks_falls_back_to_compute() -> None:
+    """Measures that only implement compute() are still supported."""
+
+    class ConstantMeasure(BaseRiskMeasure):
+        @property
+        def name(self) -> str:
+            return "CONST"
+
+        def compute(self, instrument, market) -> float:
+            return 42.0
+
+    curve = ZeroRateCurve(name="C", pillars=[1.0], zero_rates_cc=[0.04])
+    market = Market(curves={"C": curve})
+    bond = ZeroCouponBond(curve="C", maturity=1.0, notional=100.0)
+    assert compute_risks(bond, market, [ConstantMeasure()]) == {"CONST": 42.0}
+
+
+def _credit_market() -> Market:
+    usd = ZeroRateCurve(name="USD", pillars=[0.5, 1.0, 2.0, 5.0], zero_rates_cc=[0.045, 0.043, 0.04, 0.038])
+    eur = ZeroRateCurve(name="EUR", pillars=[0.5, 1.0, 2.0, 5.0], zero_rates_cc=[0.04, 0.038, 0.036, 0.034])
+    haz = HazardRateCurve(name="HAZ", pillars=[1.0, 3.0, 5.0], hazard_rates=[0.008, 0.012, 0.015])
+    return Market(curves={"USD": usd, "EUR": eur, "HAZ": haz}, fx_spot={"EURUSD": 1.08})
+
+
+_TRADES = [
+    ZeroCouponBond(curve="USD", maturity=1.5, notional=1_000_000),
+    FixedFloatSwap(curve="USD", notional=10_000_000, fixed_rate=0.04, pay_times=[0.5, 1.0, 1.5, 2.0, 3.0]),
+    FixedFloatSwap(curve="USD", notional=5_000_000, fixed_rate=0.03, pay_times=[1.5, 2.0], t0=1.0),
+    LevelPayMortgage(curve="USD", notional=500_000, annual_rate=0.06, term_years=5.0, payments_per_year=12),
+    LevelPayMortgage(curve="USD", notional=500_000, annual_rate=0.06, term_years=5.0, payments_per_year=12,
+                     prepayment=Prepayment(psa=150)),
+    FXForward(pair="EURUSD", base_curve="EUR", quote_curve="USD", maturity=1.0, notional_base=5_000_000, strike=1.085),
+    CDS(discount_curve="USD", survival_curve="HAZ", notional=10_000_000, premium_rate=0.01,
+        pay_times=[0.5 * (i + 1) for i in range(10)]),
+    CDS(discount_curve="USD", survival_curve="HAZ", notional=10_000_000, premium_rate=0.01,
+        pay_times=[1.0, 2.0, 3.0], protection_buyer=False),
+]
+
+
+@pytest.mark.parametrize("trade", _TRADES, ids=lambda t: type(t).__name__)
+def test_analytic_pv01_and_cs01_match_bump_and_reprice(trade) -> None:
+    """Analytic PV01/CS01 agree with bump-and-reprice up to second-order terms."""
+    market = _credit_market()
+    measures = [PV01Parallel("USD"), PV01Parallel("EUR"), CS01Parallel("HAZ")]
+    for measure in measures:
+        analytic = measure.analytic_value(trade, market)
+        assert analytic is not None
+        measure.use_analytic = False
+        bumped = measure.compute(trade, market)
+        assert abs(analytic - bumped) <= 1e-3 * abs(bumped) + 1e-6
+
+
+def test_analytic_pv01_falls_back_for_custom_curve() -> None:
+    """Curves without log_df_derivative use bump-and-reprice."""
+
+    class ScaledCurve:
+        name = "S"
+
+        def __init__(self, shift: float = 0.0) -> None:
+            self.shift = shift
+
+        def df(self, t: float) -> float:
+            return 0.95 - self.shift * t
+
+        def bumped(self, bump: float) -> "ScaledCurve":
+            return ScaledCurve(self.shift + bump)
+
+    market = Market(curves={"S": ScaledCurve()})
+    bond = ZeroCouponBond(curve="S", maturity=2.0, notional=100.0)
+    measure = PV01Parallel("S")
+    assert measure.analytic_value(bond, market) is None
+    assert abs(measure.compute(bond, market) - (-100.0 * 2.0 * 1e-4)) < 1e-12
+
+
+@pytest.mark.parametrize("trade", _TRADES, ids=lambda t: type(t).__name__)
+def test_key_rate_ladder_matches_per_pillar_bumps(trade) -> None:
+    """Single-pass key-rate ladder matches N bump-and-reprice valuations and sums to PV01."""
+    market = _credit_market()
+    for curve_name in ("USD", "EUR", "HAZ"):
+        analytic = KeyRatePV01(curve_name).ladder(trade, market)
+        bumped = KeyRatePV01(curve_name, use_analytic=False).ladder(trade, market)
+        assert KeyRatePV01(curve_name, use_analytic=False).ladder(
+            trade, market, base_pv=price(trade, market)
+        ) == bumped
+        assert [p for p, _ in analytic] == list(market.curve(curve_name).pillars)
+        for (_, a), (_, b) in zip(analytic, bumped):
+            assert abs(a - b) <= 1e-3 * abs(b) + 1e-6
+        parallel = PV01Parallel(curve_name).analytic_value(trade, market)
+        assert abs(sum(a for _, a in analytic) - parallel) < 1e-9
+
+
+def test_key_rate_ladder_interpolation_weights() -> None:
+    """A ZCB between two pillars loads only on those pillars, split linearly."""
+    curve = ZeroRateCurve(name="C", pillars=[1.0, 2.0, 5.0], zero_rates_cc=[0.04, 0.04, 0.04])
+    market = Market(curves={"C": curve})
+    bond = ZeroCouponBond(curve="C", maturity=1.25, notional=1_000_000)
+    ladder = KeyRatePV01("C").ladder(bond, market)
+    pv = price(bond, market)
+    assert abs(ladder[0][1] - (-pv * 1.25 * 0.75 * 1e-4)) < 1e-9
+    assert abs(ladder[1][1] - (-pv * 1.25 * 0.25 * 1e-4)) < 1e-9
+    assert ladder[2][1] == 0.0
+    assert KeyRatePV01("C").compute(bond, market) == sum(v for _, v in ladder)
@@ -1,8 +1,11 @@
-"""Tests for FixedFloatSwap."""
+"""Tests for FixedFloatSwap and SwapBlock."""
+
+import pytest
 
 from pricing.curves import ZeroRateCurve
 from pricing.market import Market
-from pricing.products.swap import FixedFloatSwap
+from pricing.pricers.swap_pricer import SwapPricer
+from pricing.products.swap import FixedFloatSwap, SwapBlock
 from pricing.pricing import price
 
 
@@ -61,3 +64,29 @@ def test_swap_low_fixed_positive_pv() -> None:
     )
     pv = price(swap, market)
     assert pv > 0
+
+
+def test_swap_block_matches_per_trade_npv() -> None:
+    """SwapPricer.npv_block values a ragged block exactly like per-trade npv()."""
+    curve = ZeroRateCurve(name="C", pillars=[0.5, 1.0, 2.0, 5.0], zero_rates_cc=[0.045, 0.043, 0.04, 0.038])
+    market = Market(curves={"C": curve})
+    swaps = [
+        FixedFloatSwap(curve="C", notional=10_000_000, fixed_rate=0.04, pay_times=[0.5, 1.0, 1.5, 2.0]),
+        FixedFloatSwap(curve="C", notional=5_000_000, fixed_rate=0.03, pay_times=[1.0, 2.0, 3.0, 4.0, 5.0]),
+        FixedFloatSwap(curve="C", notional=-2_000_000, fixed_rate=0.05, pay_times=[1.25, 1.5], t0=1.0),
+    ]
+    block = SwapBlock.from_trades(swaps)
+    assert len(block) == 3
+    assert list(block.schedule(1)) == [1.0, 2.0, 3.0, 4.0, 5.0]
+    for swap, value in zip(swaps, SwapPricer.npv_block(block, market)):
+        assert abs(value - price(swap, market)) < 1e-6
+
+
+def test_swap_block_rejects_mixed_curves() -> None:
+    """A block holds swaps on a single curve."""
+    swaps = [
+        FixedFloatSwap(curve="A", notional=1.0, fixed_rate=0.04, pay_times=[1.0]),
+        FixedFloatSwap(curve="B", notional=1.0, fixed_rate=0.04, pay_times=[1.0]),
+    ]
+    with pytest.raises(ValueError, match="same curve"):
+        SwapBlock.from_trades(swaps)